@@ -0,0 +1,114 @@
+"""
+Cisco HyperFlex API Token Manager - Import Time Benchmark
+Summary: Measures the cold start cost of the HyperFlex API Token Manager in
+         fresh Python interpreters: the time to import the module, the time
+         to import the module and load an XML or JSON token file (the work a
+         short-lived script performs), and which heavy standard library and
+         third-party modules each of those steps loads.
+Usage: python benchmarks/benchmark_import_time.py [runs]
+"""
+
+# Import needed modules
+import os
+import sys
+import statistics
+import subprocess
+import tempfile
+import py_compile
+
+REPOSITORY_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPOSITORY_DIRECTORY)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import hx_api_token_manager
+from mock_hx_aaa_server import MockHXAAAServer, DEFAULT_USERNAME, DEFAULT_PASSWORD
+
+# Establish benchmark settings
+DEFAULT_RUNS = 15
+FILE_FORMATS = ("xml", "json")
+HEAVY_MODULES = ("requests", "urllib3", "asyncio", "ssl", "json",
+                 "xml.etree.ElementTree", "sqlite3", "http.server",
+                 "concurrent.futures", "email.utils")
+IMPORT_SCRIPT = "import hx_api_token_manager"
+LOAD_SCRIPT = ("import time; start_time = time.perf_counter(); "
+               "import hx_api_token_manager; "
+               "hx_api_token_manager.load_token_file({file_path!r}); "
+               "print(time.perf_counter() - start_time)")
+LOADED_MODULES_SCRIPT = ("import sys; {script}; "
+                         "print(' '.join(module_name for module_name in "
+                         "{heavy_modules!r} if module_name in sys.modules))")
+
+
+def run_python(*arguments):
+    """Returns the output of a fresh Python interpreter run."""
+    completed_process = subprocess.run(
+        [sys.executable, *arguments],
+        cwd=REPOSITORY_DIRECTORY,
+        capture_output=True,
+        text=True,
+        check=True
+        )
+    return completed_process
+
+
+def measure_import_time(runs):
+    """Returns the median cumulative import time of the module in seconds,
+    as reported by the -X importtime option of the interpreter.
+    """
+    import_times = []
+    for run in range(runs):
+        completed_process = run_python("-X", "importtime", "-c", IMPORT_SCRIPT)
+        for line in completed_process.stderr.splitlines():
+            fields = [field.strip() for field in line.split("|")]
+            if len(fields) == 3 and fields[2] == "hx_api_token_manager":
+                import_times.append(int(fields[1]) / 1000000)
+    return statistics.median(import_times)
+
+
+def measure_load_time(file_path,runs):
+    """Returns the median time to import the module and load a token file
+    in a fresh interpreter, in seconds.
+    """
+    script = LOAD_SCRIPT.format(file_path=file_path)
+    return statistics.median(float(run_python("-c", script).stdout)
+                             for run in range(runs))
+
+
+def loaded_heavy_modules(script):
+    """Returns the heavy modules loaded after running a script."""
+    script = LOADED_MODULES_SCRIPT.format(script=script,
+                                          heavy_modules=HEAVY_MODULES)
+    return run_python("-c", script).stdout.split() or ["none"]
+
+
+def main(runs=DEFAULT_RUNS):
+    # Compile the module up front so the runs measure imports from the
+    # bytecode cache rather than a one-time compilation
+    py_compile.compile(hx_api_token_manager.__file__)
+    results = {"import": (measure_import_time(runs),
+                          loaded_heavy_modules(IMPORT_SCRIPT))}
+    with tempfile.TemporaryDirectory() as benchmark_directory, \
+            MockHXAAAServer() as mock_hx_aaa_server:
+        for file_format in FILE_FORMATS:
+            file_path = os.path.join(benchmark_directory,
+                                     "hx_api_token." + file_format)
+            hx_api_token_manager.create_token_file(mock_hx_aaa_server.address,
+                                                   DEFAULT_USERNAME,
+                                                   DEFAULT_PASSWORD,
+                                                   file_path,
+                                                   file_format=file_format)
+            load_script = ("import hx_api_token_manager; "
+                           "hx_api_token_manager.load_token_file({!r})"
+                           ).format(file_path)
+            results["import + load " + file_format.upper()] = (
+                measure_load_time(file_path,runs),
+                loaded_heavy_modules(load_script))
+    print("Cold start benchmark with {} runs:".format(runs))
+    print("  {:<18} {:>12}   {}".format("Step", "Median time",
+                                        "Heavy modules loaded"))
+    for step, (median_time, heavy_modules) in results.items():
+        print("  {:<18} {:>9.1f} ms   {}".format(step, median_time * 1000,
+                                                ", ".join(heavy_modules)))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_RUNS)
@@ -0,0 +1,83 @@
+"""
+Cisco HyperFlex API Token Manager - load_token_file() Benchmark
+Summary: Measures how many HyperFlex API token file loads per second the
+         load_token_file() function completes for XML and JSON token files,
+         both when every load parses the token file (uncached) and when the
+         parsed data is reused while the token file is unchanged (cached).
+Usage: python benchmarks/benchmark_load_token_file.py [iterations]
+"""
+
+# Import needed modules
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import hx_api_token_manager
+from mock_hx_aaa_server import MockHXAAAServer, DEFAULT_USERNAME, DEFAULT_PASSWORD
+
+# Establish benchmark settings
+DEFAULT_ITERATIONS = 20000
+FILE_FORMATS = ("xml", "json")
+
+
+def measure_loads_per_second(file_path,iterations,cached):
+    """Returns the number of load_token_file() calls completed per second."""
+    start_time = time.perf_counter()
+    for iteration in range(iterations):
+        if not cached:
+            hx_api_token_manager.clear_token_file_cache()
+        hx_api_token_manager.load_token_file(file_path)
+    elapsed_time = time.perf_counter() - start_time
+    return iterations / elapsed_time
+
+
+def create_token_files(benchmark_directory):
+    """Creates an XML token file with create_token_file() against a local
+    mock HyperFlex AAA server and converts it to a JSON token file with
+    convert_token_file(). Both files hold the same token.
+
+    Returns:
+        A dictionary of the token file paths by file format.
+    """
+    xml_file_path = os.path.join(benchmark_directory, "hx_api_token.xml")
+    with MockHXAAAServer() as mock_hx_aaa_server:
+        hx_api_token_manager.create_token_file(mock_hx_aaa_server.address,
+                                               DEFAULT_USERNAME,
+                                               DEFAULT_PASSWORD,
+                                               xml_file_path,
+                                               file_format="xml")
+    hx_api_token_manager.close_hx_api_sessions()
+    json_file_path = hx_api_token_manager.convert_token_file(
+        xml_file_path,"json",
+        os.path.join(benchmark_directory, "hx_api_token.json"))
+    return {"xml": xml_file_path, "json": json_file_path}
+
+
+def main(iterations=DEFAULT_ITERATIONS):
+    results = {}
+    with tempfile.TemporaryDirectory() as benchmark_directory:
+        file_paths = create_token_files(benchmark_directory)
+        for file_format in FILE_FORMATS:
+            file_path = file_paths[file_format]
+            results[file_format] = (
+                os.path.getsize(file_path),
+                measure_loads_per_second(file_path,iterations,False),
+                measure_loads_per_second(file_path,iterations,True)
+                )
+    print("load_token_file() benchmark with {} iterations:".format(iterations))
+    print("  {:<6} {:>10} {:>22} {:>22}".format(
+        "Format", "File size", "Uncached (parse)", "Cached (stat)"))
+    for file_format, (file_size, uncached_loads, cached_loads) in results.items():
+        print("  {:<6} {:>8} B {:>14,.0f} loads/s {:>14,.0f} loads/s".format(
+            file_format.upper(), file_size, uncached_loads, cached_loads))
+    print("  JSON uncached speedup over XML uncached: {:.1f}x".format(
+        results["json"][1] / results["xml"][1]))
+    print("  Cached speedup over uncached (XML):      {:.1f}x".format(
+        results["xml"][2] / results["xml"][1]))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ITERATIONS)
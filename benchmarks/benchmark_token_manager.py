@@ -0,0 +1,164 @@
+"""
+Cisco HyperFlex API Token Manager - Function Benchmark Suite
+Summary: Measures the throughput and the p50 and p99 latency of the
+         obtain_token(), validate_token(), load_token_file(),
+         create_token_file() and manage_token_file() functions against a
+         local mock HyperFlex AAA server, along with the number of new TLS
+         connections each benchmark opened.
+Usage: python benchmarks/benchmark_token_manager.py [--iterations 200]
+           [--latency 0.005] [--concurrency 1]
+"""
+
+# Import needed modules
+import os
+import sys
+import math
+import time
+import argparse
+import tempfile
+import concurrent.futures
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import hx_api_token_manager
+from mock_hx_aaa_server import MockHXAAAServer, DEFAULT_USERNAME, DEFAULT_PASSWORD
+
+# Establish benchmark settings
+DEFAULT_ITERATIONS = 200
+DEFAULT_LATENCY = 0.005
+DEFAULT_CONCURRENCY = 1
+
+
+def percentile(sorted_latencies,percent):
+    """Returns the nearest-rank percentile of a sorted list of latencies."""
+    rank = max(1, math.ceil(percent / 100 * len(sorted_latencies)))
+    return sorted_latencies[rank - 1]
+
+
+def run_benchmark(benchmark_function,iterations,concurrency):
+    """Calls the benchmark function the given number of times and returns the
+    elapsed time and the sorted latency of each call in seconds.
+    """
+    def timed_call(iteration):
+        start_time = time.perf_counter()
+        result = benchmark_function()
+        if result is None:
+            raise RuntimeError("The benchmarked function call failed.")
+        return time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    if concurrency == 1:
+        latencies = [timed_call(iteration) for iteration in range(iterations)]
+    else:
+        with concurrent.futures.ThreadPoolExecutor(concurrency) as executor:
+            latencies = list(executor.map(timed_call, range(iterations)))
+    return time.perf_counter() - start_time, sorted(latencies)
+
+
+def build_benchmarks(ip,benchmark_directory):
+    """Returns the benchmarks to run as (name, function) pairs."""
+    hx_api_token = hx_api_token_manager.obtain_token(ip,DEFAULT_USERNAME,
+                                                     DEFAULT_PASSWORD)
+    token_file_path = os.path.join(benchmark_directory, "hx_api_token.xml")
+    hx_api_token_manager.create_token_file(ip,DEFAULT_USERNAME,
+                                           DEFAULT_PASSWORD,token_file_path)
+    created_file_path = os.path.join(benchmark_directory, "created.xml")
+
+    def obtain_token_on_new_connection():
+        # Drop the pooled connections, so each call opens a new connection
+        # that resumes the cached TLS session
+        hx_api_token_manager.get_hx_api_session(ip).close()
+        return hx_api_token_manager.obtain_token(ip,DEFAULT_USERNAME,
+                                                 DEFAULT_PASSWORD)
+
+    def obtain_token_without_shared_session():
+        with requests.Session() as session:
+            return hx_api_token_manager.obtain_token(ip,DEFAULT_USERNAME,
+                                                     DEFAULT_PASSWORD,
+                                                     session=session)
+
+    return [
+        ("obtain_token",
+         lambda: hx_api_token_manager.obtain_token(ip,DEFAULT_USERNAME,
+                                                   DEFAULT_PASSWORD)),
+        ("obtain_token (new session per call)",
+         obtain_token_without_shared_session),
+        ("obtain_token (new TLS-resumed connection)",
+         obtain_token_on_new_connection),
+        ("validate_token",
+         lambda: hx_api_token_manager.validate_token(ip,hx_api_token) or None),
+        ("load_token_file",
+         lambda: hx_api_token_manager.load_token_file(token_file_path)),
+        ("create_token_file",
+         lambda: hx_api_token_manager.create_token_file(ip,DEFAULT_USERNAME,
+                                                        DEFAULT_PASSWORD,
+                                                        created_file_path)),
+        ("manage_token_file",
+         lambda: hx_api_token_manager.manage_token_file(ip,DEFAULT_USERNAME,
+                                                        DEFAULT_PASSWORD,
+                                                        token_file_path)),
+        ("manage_token_file (validation_ttl=300)",
+         lambda: hx_api_token_manager.manage_token_file(ip,DEFAULT_USERNAME,
+                                                        DEFAULT_PASSWORD,
+                                                        token_file_path,
+                                                        validation_ttl=300)),
+        ]
+
+
+def main(arguments=None):
+    argument_parser = argparse.ArgumentParser(
+        description="Benchmark the HyperFlex API Token Manager functions "
+                    "against a local mock HyperFlex AAA server.")
+    argument_parser.add_argument("--iterations", type=int,
+                                 default=DEFAULT_ITERATIONS)
+    argument_parser.add_argument("--latency", type=float,
+                                 default=DEFAULT_LATENCY,
+                                 help="Seconds the mock server delays each "
+                                      "response. The default value is "
+                                      "%(default)s.")
+    argument_parser.add_argument("--concurrency", type=int,
+                                 default=DEFAULT_CONCURRENCY,
+                                 help="Number of threads calling each "
+                                      "function. The default value is "
+                                      "%(default)s.")
+    parsed_arguments = argument_parser.parse_args(arguments)
+
+    results = []
+    with MockHXAAAServer(latency=parsed_arguments.latency) as mock_hx_aaa_server, \
+            tempfile.TemporaryDirectory() as benchmark_directory:
+        benchmarks = build_benchmarks(mock_hx_aaa_server.address,
+                                      benchmark_directory)
+        for benchmark_name, benchmark_function in benchmarks:
+            # Start each benchmark without pooled connections
+            hx_api_token_manager.close_hx_api_sessions()
+            hx_api_token_manager.clear_validation_cache()
+            mock_hx_aaa_server.reset_counters()
+            elapsed_time, latencies = run_benchmark(
+                benchmark_function,
+                parsed_arguments.iterations,
+                parsed_arguments.concurrency)
+            results.append((benchmark_name,
+                            parsed_arguments.iterations / elapsed_time,
+                            percentile(latencies,50),
+                            percentile(latencies,99),
+                            mock_hx_aaa_server.counters.get("connections",
+                                                            0)))
+        hx_api_token_manager.close_hx_api_sessions()
+
+    print("HyperFlex API Token Manager benchmark: {} iterations, {} ms mock "
+          "AAA latency, concurrency {}".format(
+              parsed_arguments.iterations,
+              parsed_arguments.latency * 1000,
+              parsed_arguments.concurrency))
+    print("  {:<40} {:>12} {:>10} {:>10} {:>12}".format(
+        "Function", "Calls/s", "p50 (ms)", "p99 (ms)", "TLS conns"))
+    for benchmark_name, calls_per_second, p50, p99, connections in results:
+        print("  {:<40} {:>12,.1f} {:>10.3f} {:>10.3f} {:>12}".format(
+            benchmark_name, calls_per_second, p50 * 1000, p99 * 1000,
+            connections))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+"""
+Cisco HyperFlex API Token Manager - Mock HyperFlex AAA Server
+Summary: A local HTTPS stand-in for the HyperFlex AAA service that implements
+         the /aaa/v1/auth, /aaa/v1/token, /aaa/v1/validate and /aaa/v1/revoke
+         endpoints used by the HyperFlex API Token Manager, with configurable
+         response latency and counters for connections and requests. A
+         self-signed certificate is generated with the openssl command line
+         tool unless a certificate and key are provided.
+Usage: python benchmarks/mock_hx_aaa_server.py [--port 8443] [--latency 0.02]
+"""
+
+# Import needed modules
+import os
+import ssl
+import sys
+import json
+import time
+import uuid
+import argparse
+import tempfile
+import threading
+import subprocess
+import http.server
+import socketserver
+
+# Establish mock HyperFlex AAA server settings
+DEFAULT_USERNAME = "admin"
+DEFAULT_PASSWORD = "password"
+
+
+class _MockHXAAARequestHandler(http.server.BaseHTTPRequestHandler):
+    """Answers HyperFlex AAA requests on a keep-alive connection."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.server.mock_hx_aaa_server._count("connections")
+
+    def log_message(self,format,*args):
+        pass
+
+    def _send_json(self,status_code,response_body):
+        response_data = json.dumps(response_body).encode("utf-8")
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(response_data)))
+        self.end_headers()
+        self.wfile.write(response_data)
+
+    def do_POST(self):
+        mock_hx_aaa_server = self.server.mock_hx_aaa_server
+        request_data = self.rfile.read(int(self.headers.get("Content-Length",
+                                                            0)))
+        try:
+            request_body = json.loads(request_data or b"{}")
+        except ValueError:
+            request_body = {}
+        request_path = self.path.split("?")[0]
+        mock_hx_aaa_server._count(request_path)
+        if mock_hx_aaa_server.latency:
+            time.sleep(mock_hx_aaa_server.latency)
+        self._send_json(*mock_hx_aaa_server._handle_request(request_path,
+                                                            request_body))
+
+
+class _MockHXAAAHTTPServer(socketserver.ThreadingMixIn,
+                           http.server.HTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class MockHXAAAServer:
+    """A local HTTPS server that behaves like the HyperFlex AAA service.
+
+    Args:
+        latency: The number of seconds each request is delayed before it is
+            answered, to simulate the round trip to a HyperFlex cluster. The
+            default value is 0.
+        port: The TCP port to listen on. The default value of 0 selects a
+            free port.
+        username: The accepted HyperFlex username. The default value is
+            "admin".
+        password: The accepted HyperFlex password. The default value is
+            "password".
+        certificate_file: The path of a PEM certificate. A self-signed
+            certificate is generated if no certificate is provided.
+        key_file: The path of the PEM private key of the certificate.
+
+    Example:
+        with MockHXAAAServer(latency=0.01) as mock_hx_aaa_server:
+            obtain_token(mock_hx_aaa_server.address,"admin","password")
+    """
+
+    def __init__(self,latency=0.0,port=0,username=DEFAULT_USERNAME,
+                 password=DEFAULT_PASSWORD,certificate_file=None,
+                 key_file=None):
+        self.latency = latency
+        self.port = port
+        self.username = username
+        self.password = password
+        self.certificate_file = certificate_file
+        self.key_file = key_file
+        self.counters = {}
+        self._access_tokens = set()
+        self._refresh_tokens = set()
+        self._lock = threading.Lock()
+        self._http_server = None
+        self._certificate_directory = None
+
+    @property
+    def address(self):
+        """The address of the server in the "host:port" format used as the
+        'ip' argument of the HyperFlex API Token Manager functions.
+        """
+        return "127.0.0.1:{}".format(self._http_server.server_address[1])
+
+    def _count(self,counter_name):
+        with self._lock:
+            self.counters[counter_name] = self.counters.get(counter_name, 0) + 1
+
+    def reset_counters(self):
+        """Resets the connection and request counters."""
+        with self._lock:
+            self.counters = {}
+
+    def _issue_token(self,refresh_token=None):
+        hx_api_token = {"access_token": uuid.uuid4().hex,
+                        "refresh_token": refresh_token or uuid.uuid4().hex,
+                        "token_type": "Bearer"
+                        }
+        with self._lock:
+            self._access_tokens.add(hx_api_token["access_token"])
+            self._refresh_tokens.add(hx_api_token["refresh_token"])
+        return hx_api_token
+
+    def _handle_request(self,request_path,request_body):
+        """Returns the status code and JSON body answering a request."""
+        if request_path == "/aaa/v1/auth":
+            if (request_body.get("username") != self.username
+                    or request_body.get("password") != self.password):
+                return 401, {"error": "invalid_grant",
+                             "error_description": "Invalid credentials"}
+            return 201, self._issue_token()
+        if request_path == "/aaa/v1/token":
+            with self._lock:
+                known_refresh_token = (request_body.get("refresh_token")
+                                       in self._refresh_tokens)
+            if not known_refresh_token:
+                return 401, {"error": "invalid_grant",
+                             "error_description": "Invalid refresh token"}
+            return 201, self._issue_token(request_body["refresh_token"])
+        if request_path == "/aaa/v1/validate":
+            with self._lock:
+                valid_access_token = (request_body.get("access_token")
+                                      in self._access_tokens)
+            if not valid_access_token:
+                return 401, {"error": "invalid_token"}
+            return 200, {}
+        if request_path == "/aaa/v1/revoke":
+            with self._lock:
+                self._access_tokens.discard(request_body.get("access_token"))
+                self._refresh_tokens.discard(request_body.get("refresh_token"))
+            return 200, {}
+        return 404, {"error": "not_found"}
+
+    def _generate_certificate(self):
+        """Generates a self-signed certificate with the openssl command."""
+        self._certificate_directory = tempfile.TemporaryDirectory()
+        self.certificate_file = os.path.join(self._certificate_directory.name,
+                                             "certificate.pem")
+        self.key_file = os.path.join(self._certificate_directory.name,
+                                     "key.pem")
+        try:
+            subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048",
+                            "-nodes", "-days", "1", "-subj", "/CN=127.0.0.1",
+                            "-keyout", self.key_file,
+                            "-out", self.certificate_file],
+                           check=True,
+                           stdout=subprocess.DEVNULL,
+                           stderr=subprocess.DEVNULL)
+        except (OSError, subprocess.CalledProcessError) as exception_message:
+            raise RuntimeError("A self-signed certificate could not be "
+                               "generated with openssl. Please provide the "
+                               "'certificate_file' and 'key_file' arguments: "
+                               "{}".format(exception_message))
+
+    def start(self):
+        """Starts answering requests in a background thread."""
+        if self._http_server is not None:
+            return
+        if self.certificate_file is None:
+            self._generate_certificate()
+        ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        ssl_context.load_cert_chain(self.certificate_file,self.key_file)
+        self._http_server = _MockHXAAAHTTPServer(("127.0.0.1", self.port),
+                                                 _MockHXAAARequestHandler)
+        self._http_server.socket = ssl_context.wrap_socket(
+            self._http_server.socket,server_side=True)
+        self._http_server.mock_hx_aaa_server = self
+        threading.Thread(target=self._http_server.serve_forever,
+                         name="mock-hx-aaa-server",
+                         daemon=True).start()
+
+    def stop(self):
+        """Stops the server and removes a generated certificate."""
+        if self._http_server is not None:
+            self._http_server.shutdown()
+            self._http_server.server_close()
+            self._http_server = None
+        if self._certificate_directory is not None:
+            self._certificate_directory.cleanup()
+            self._certificate_directory = None
+            self.certificate_file = None
+            self.key_file = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self,exc_type,exc_value,traceback):
+        self.stop()
+
+
+def main(arguments=None):
+    argument_parser = argparse.ArgumentParser(
+        description="Run a local mock HyperFlex AAA service over HTTPS.")
+    argument_parser.add_argument("--port", type=int, default=8443)
+    argument_parser.add_argument("--latency", type=float, default=0.0,
+                                 help="Seconds to delay each response.")
+    argument_parser.add_argument("--username", default=DEFAULT_USERNAME)
+    argument_parser.add_argument("--password", default=DEFAULT_PASSWORD)
+    argument_parser.add_argument("--certificate-file")
+    argument_parser.add_argument("--key-file")
+    parsed_arguments = argument_parser.parse_args(arguments)
+    mock_hx_aaa_server = MockHXAAAServer(parsed_arguments.latency,
+                                         parsed_arguments.port,
+                                         parsed_arguments.username,
+                                         parsed_arguments.password,
+                                         parsed_arguments.certificate_file,
+                                         parsed_arguments.key_file)
+    with mock_hx_aaa_server:
+        print("The mock HyperFlex AAA server is listening at {}. Press "
+              "Ctrl+C to stop.".format(mock_hx_aaa_server.address))
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        print("Request counters: {}".format(mock_hx_aaa_server.counters))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,534 @@
+"""
+Cisco HyperFlex API Token Broker, v1
+Author: Ugo Emekauwa
+Contact: uemekauw@cisco.com, uemekauwa@gmail.com
+Summary: Cisco HyperFlex API Token Broker is a long-running process built on
+         the Cisco HyperFlex API Token Manager that owns the HyperFlex API
+         tokens of a set of HyperFlex clusters and hands out current access
+         tokens to local scripts over a Unix domain socket. Scripts share one
+         validated token and one AAA session per cluster instead of each
+         loading, validating and renewing token files on their own.
+Usage: python hx_api_token_broker.py inventory.json [--socket-path PATH]
+"""
+
+# Import needed modules
+import os
+import sys
+import stat
+import json
+import socket
+import socketserver
+import threading
+import tempfile
+import getpass
+import argparse
+import logging
+import hx_api_token_manager
+
+
+def _default_broker_socket_directory():
+    """Returns the directory of the default broker socket. The directory is
+    private to the current user: the user runtime directory if one is set,
+    otherwise a directory named after the user in the temporary directory of
+    the system.
+    """
+    runtime_directory = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_directory:
+        return os.path.join(runtime_directory, "hx_api_token_broker")
+    if hasattr(os, "getuid"):
+        user_id = os.getuid()
+    else:
+        user_id = getpass.getuser()
+    return os.path.join(tempfile.gettempdir(),
+                        "hx_api_token_broker-{}".format(user_id))
+
+
+# Establish the HyperFlex API token broker settings
+DEFAULT_BROKER_SOCKET_DIRECTORY = _default_broker_socket_directory()
+DEFAULT_BROKER_SOCKET_PATH = os.path.join(DEFAULT_BROKER_SOCKET_DIRECTORY,
+                                          "hx_api_token_broker.sock")
+DEFAULT_BROKER_VALIDATION_TTL = 300
+DEFAULT_BROKER_TIMEOUT = 30
+_BROKER_DATA_OPTIONS = ("access_token", "token")
+
+# Establish the HyperFlex API token broker logger
+logger = logging.getLogger("hx_api_token_broker")
+logger.addHandler(logging.NullHandler())
+
+# Establish HyperFlex API Token Broker Functions
+
+
+class _TokenBrokerRequestHandler(socketserver.StreamRequestHandler):
+    """Answers the newline-delimited JSON requests of one broker client
+    connection until the client disconnects.
+    """
+
+    def handle(self):
+        for request_line in self.rfile:
+            try:
+                broker_request = json.loads(request_line)
+                broker_response = {"status": "success",
+                                   "result": self.server.token_broker._handle_request(
+                                       broker_request)
+                                   }
+            except Exception as exception_message:
+                broker_response = {"status": "failed",
+                                   "error": str(exception_message)
+                                   }
+            try:
+                self.wfile.write(json.dumps(broker_response).encode("utf-8")
+                                 + b"\n")
+                self.wfile.flush()
+            except OSError:
+                # The client gave up waiting and closed the connection
+                return
+
+
+def _verify_unix_socket_support():
+    """Raises an OSError if Unix domain sockets are not available, as on
+    Windows. The HyperFlex API token broker is only supported on POSIX
+    systems.
+    """
+    if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+        raise OSError("The HyperFlex API token broker requires Unix domain "
+                      "sockets, which are not available on this operating "
+                      "system.")
+
+
+def _prepare_socket_directory(socket_path):
+    """Creates the directory of a broker socket, accessible only to the
+    current user, if it does not exist. The default socket directory must
+    also be owned by and only accessible to the current user, so no other
+    local user can create or replace the socket in it first.
+    """
+    socket_directory = os.path.dirname(os.path.abspath(socket_path))
+    try:
+        os.makedirs(socket_directory, mode=0o700)
+    except FileExistsError:
+        pass
+    if socket_directory != os.path.abspath(DEFAULT_BROKER_SOCKET_DIRECTORY):
+        return
+    directory_status = os.lstat(socket_directory)
+    if (not stat.S_ISDIR(directory_status.st_mode)
+            or directory_status.st_uid != os.getuid()
+            or stat.S_IMODE(directory_status.st_mode) & 0o077):
+        raise ValueError("The socket directory {} is not a directory owned by "
+                         "and only accessible to the current user. Please "
+                         "remove it or provide another value for the "
+                         "'socket_path' argument.".format(socket_directory))
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+    class _TokenBrokerServer(socketserver.ThreadingUnixStreamServer):
+        """A Unix domain socket server that answers each client connection in
+        a daemon thread and queues bursts of new connections. The socket is
+        made accessible only to the current user before it starts listening.
+        """
+
+        daemon_threads = True
+        request_queue_size = 128
+
+        def server_bind(self):
+            super().server_bind()
+            os.chmod(self.server_address, stat.S_IRUSR | stat.S_IWUSR)
+
+
+class TokenBroker:
+    r"""This is a class that serves the current HyperFlex API access tokens
+    of a set of HyperFlex clusters to local clients over a Unix domain
+    socket. The broker keeps each token file fresh with a
+    TokenRenewalScheduler, answers lookups of a token that was validated
+    within the validation TTL from memory, and otherwise runs the
+    manage_token_file() function once for all waiting clients.
+
+    Args:
+        inventory: A list of dictionaries, one for each HyperFlex cluster, in
+            the same format as the 'inventory' argument of the
+            manage_token_fleet() function. Clients request tokens by the
+            "name" key of an entry, which defaults to the IP address.
+        socket_path: (Optional) The file path of the Unix domain socket.
+            Providing this argument is optional. The value must be a string.
+            The default value is "hx_api_token_broker.sock" in a directory
+            private to the current user, DEFAULT_BROKER_SOCKET_DIRECTORY. A
+            missing directory is created accessible only to the current user.
+        validation_ttl: (Optional) The number of seconds a validated
+            HyperFlex API token is handed out before it is validated again.
+            Providing this argument is optional. The value must be a
+            non-negative integer. The default value is 300.
+        lead_time: (Optional) The number of seconds before the end of the
+            HyperFlex API token lifetime at which a token is renewed.
+            Providing this argument is optional. The default value is 86400
+            (1 day).
+
+    Raises:
+        OSError: Unix domain sockets are not available on this operating
+            system. The broker is only supported on POSIX systems.
+        ValueError: There was an invalid argument provided for the inventory
+            or validation TTL settings. A recommendation on how to resolve the
+            error will be displayed.
+
+    Example:
+        with TokenBroker(inventory) as broker:
+            broker.serve_forever()
+    """
+
+    def __init__(self,inventory,socket_path=DEFAULT_BROKER_SOCKET_PATH,
+                 validation_ttl=DEFAULT_BROKER_VALIDATION_TTL,
+                 lead_time=hx_api_token_manager.DEFAULT_RENEWAL_LEAD_TIME):
+        _verify_unix_socket_support()
+
+        # Verify the validation_ttl argument
+        if (not isinstance(validation_ttl, int)
+                or isinstance(validation_ttl, bool) or validation_ttl < 0):
+            raise ValueError("The validation TTL setting is not valid. Please "
+                             "provide a non-negative integer for the "
+                             "'validation_ttl' argument.")
+
+        self.socket_path = socket_path
+        self.validation_ttl = validation_ttl
+        self._clusters = {}
+        self._scheduler = hx_api_token_manager.TokenRenewalScheduler(
+            lead_time=lead_time)
+        for cluster_name, inventory_entry in (
+                hx_api_token_manager.verify_fleet_inventory(inventory)):
+            self._clusters[cluster_name] = (
+                inventory_entry,
+                hx_api_token_manager.get_fleet_entry_options(inventory_entry),
+                threading.Lock()
+                )
+            self._scheduler.add_token_file(inventory_entry["ip"],
+                                           inventory_entry["username"],
+                                           inventory_entry["password"],
+                                           inventory_entry["file_path"])
+        self._server = None
+        self._stopped_event = threading.Event()
+
+    def _trusted_token(self,cluster_name):
+        """Returns the HyperFlex API token of a HyperFlex cluster if it can be
+        handed out without contacting the HyperFlex AAA service, otherwise
+        None.
+        """
+        inventory_entry = self._clusters[cluster_name][0]
+        return hx_api_token_manager.load_trusted_token(
+            inventory_entry["ip"],
+            inventory_entry["username"],
+            inventory_entry["file_path"],
+            self.validation_ttl)
+
+    def get_token(self,cluster_name,stale_access_token=None):
+        """Returns the current HyperFlex API token of a HyperFlex cluster.
+
+        Args:
+            cluster_name: The name of the HyperFlex cluster in the inventory.
+            stale_access_token: (Optional) An access token that a client found
+                to be rejected by the HyperFlex cluster. If it is still the
+                current token, it is validated with the HyperFlex AAA service
+                and renewed if needed.
+
+        Returns:
+            A dictionary with the access token, refresh token, and token type.
+            The value None is returned if no valid token could be obtained.
+        """
+        if cluster_name not in self._clusters:
+            raise ValueError("The HyperFlex cluster {} is not managed by the "
+                             "HyperFlex API token broker.".format(cluster_name))
+        inventory_entry, manage_token_file_options, cluster_lock = (
+            self._clusters[cluster_name])
+        hx_api_token = self._trusted_token(cluster_name)
+        if (hx_api_token is not None
+                and hx_api_token["access_token"] != stale_access_token):
+            return hx_api_token
+        # Validate or renew the token once for all waiting clients
+        with cluster_lock:
+            hx_api_token = self._trusted_token(cluster_name)
+            if (hx_api_token is not None
+                    and hx_api_token["access_token"] != stale_access_token):
+                return hx_api_token
+            manage_token_file_options = dict(manage_token_file_options)
+            manage_token_file_options.setdefault("validation_ttl",
+                                                 self.validation_ttl)
+            manage_token_file_options["force_validate"] = (
+                stale_access_token is not None)
+            return hx_api_token_manager.manage_token_file(
+                inventory_entry["ip"],
+                inventory_entry["username"],
+                inventory_entry["password"],
+                inventory_entry["file_path"],
+                **manage_token_file_options)
+
+    def _handle_request(self,broker_request):
+        """Returns the result of a broker client request."""
+        data = broker_request.get("data", "access_token")
+        if data not in _BROKER_DATA_OPTIONS:
+            raise ValueError("The requested data type is not valid. Please "
+                             "provide either 'access_token' or 'token'.")
+        hx_api_token = self.get_token(broker_request.get("cluster"),
+                                      broker_request.get("stale_access_token"))
+        if not hx_api_token:
+            raise ValueError("A valid HyperFlex API token could not be "
+                             "obtained for the HyperFlex cluster {}.".format(
+                                 broker_request.get("cluster")))
+        if data == "access_token":
+            return hx_api_token["access_token"]
+        return hx_api_token
+
+    def start(self):
+        """Starts the renewal scheduler and answers client requests on the
+        Unix domain socket in a background thread. The socket is only
+        accessible to the user running the broker.
+        """
+        if self._server is not None:
+            return
+        _prepare_socket_directory(self.socket_path)
+        # Remove a socket file left behind by a broker that is not running
+        if os.path.exists(self.socket_path):
+            if not stat.S_ISSOCK(os.stat(self.socket_path).st_mode):
+                raise ValueError("The socket path {} is already in use by a "
+                                 "file that is not a socket.".format(
+                                     self.socket_path))
+            try:
+                with socket.socket(socket.AF_UNIX,
+                                   socket.SOCK_STREAM) as broker_socket:
+                    broker_socket.connect(self.socket_path)
+            except OSError:
+                os.unlink(self.socket_path)
+            else:
+                raise ValueError("A HyperFlex API token broker is already "
+                                 "listening at {}.".format(self.socket_path))
+        self._server = _TokenBrokerServer(self.socket_path,
+                                          _TokenBrokerRequestHandler)
+        self._server.token_broker = self
+        self._stopped_event.clear()
+        threading.Thread(target=self._server.serve_forever,
+                         name="hx-api-token-broker",
+                         daemon=True).start()
+        self._scheduler.start()
+        logger.info("The HyperFlex API token broker is listening at %s.",
+                    self.socket_path)
+
+    def serve_forever(self):
+        """Starts the broker if needed and blocks until shutdown() is called
+        from another thread.
+        """
+        self.start()
+        self._stopped_event.wait()
+
+    def shutdown(self):
+        """Stops answering client requests, stops the renewal scheduler and
+        removes the Unix domain socket.
+        """
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        self._scheduler.stop()
+        try:
+            os.unlink(self.socket_path)
+        except OSError:
+            pass
+        self._stopped_event.set()
+        logger.info("The HyperFlex API token broker has stopped.")
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self,exc_type,exc_value,traceback):
+        self.shutdown()
+
+
+class TokenBrokerClient:
+    r"""This is a class that requests HyperFlex API tokens from a running
+    HyperFlex API token broker. The client keeps its connection to the broker
+    open, so repeated lookups of a validated token take well under a
+    millisecond. A client is safe to share between threads.
+
+    Args:
+        socket_path: (Optional) The file path of the Unix domain socket of
+            the broker. Providing this argument is optional. The value must be
+            a string. The default value is "hx_api_token_broker.sock" in a
+            directory private to the current user,
+            DEFAULT_BROKER_SOCKET_DIRECTORY.
+        timeout: (Optional) The number of seconds to wait for an answer from
+            the broker. Providing this argument is optional. The default value
+            is 30.
+
+    Raises:
+        OSError: Unix domain sockets are not available on this operating
+            system. The broker is only supported on POSIX systems.
+
+    Example:
+        with TokenBrokerClient() as client:
+            access_token = client.get_token("hx-cluster-1")
+    """
+
+    def __init__(self,socket_path=DEFAULT_BROKER_SOCKET_PATH,
+                 timeout=DEFAULT_BROKER_TIMEOUT):
+        _verify_unix_socket_support()
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._socket = None
+        self._socket_file = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        """Opens the connection to the broker."""
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.settimeout(self.timeout)
+        self._socket.connect(self.socket_path)
+        self._socket_file = self._socket.makefile("rwb")
+
+    def _send_request(self,broker_request):
+        """Sends a request to the broker and returns the decoded answer. A
+        connection closed by a restarted broker is reopened once. A request
+        that timed out is not sent again, as the broker may still be
+        working on it.
+        """
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._socket is None:
+                        self._connect()
+                    self._socket_file.write(
+                        json.dumps(broker_request).encode("utf-8") + b"\n")
+                    self._socket_file.flush()
+                    broker_response = self._socket_file.readline()
+                    if not broker_response:
+                        raise ConnectionError("The HyperFlex API token broker "
+                                              "closed the connection.")
+                    return json.loads(broker_response)
+                except ConnectionError:
+                    self.close()
+                    if attempt:
+                        raise
+                except OSError:
+                    # The connection is out of step after a timeout, so a
+                    # late answer is not read as the answer to a new request
+                    self.close()
+                    raise
+
+    def get_token(self,cluster_name,data="access_token",stale_access_token=None):
+        """Returns the current HyperFlex API token of a HyperFlex cluster from
+        the broker.
+
+        Args:
+            cluster_name: The name of the HyperFlex cluster in the inventory of
+                the broker, which defaults to the IP address.
+            data: (Optional) The value "access_token" returns the access token
+                as a string. The value "token" returns a dictionary with the
+                access token, refresh token, and token type. The default value
+                is "access_token".
+            stale_access_token: (Optional) An access token that was rejected
+                by the HyperFlex cluster. The broker validates it with the
+                HyperFlex AAA service and renews it if needed before answering.
+
+        Returns:
+            The requested HyperFlex API token data. The value None is returned
+            if the broker could not provide a valid token.
+        """
+        try:
+            broker_response = self._send_request(
+                {"cluster": cluster_name,
+                 "data": data,
+                 "stale_access_token": stale_access_token
+                 })
+        except Exception as exception_message:
+            logger.error("There was an error contacting the HyperFlex API "
+                         "token broker at %s: %s",
+                         self.socket_path, exception_message)
+            return
+        if broker_response.get("status") != "success":
+            logger.error("The HyperFlex API token broker could not provide "
+                         "a HyperFlex API token: %s",
+                         broker_response.get("error"))
+            return
+        return broker_response.get("result")
+
+    def close(self):
+        """Closes the connection to the broker."""
+        if self._socket_file is not None:
+            try:
+                self._socket_file.close()
+            except OSError:
+                pass
+        if self._socket is not None:
+            self._socket.close()
+        self._socket = None
+        self._socket_file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self,exc_type,exc_value,traceback):
+        self.close()
+
+
+def get_broker_token(cluster_name,data="access_token",
+                     socket_path=DEFAULT_BROKER_SOCKET_PATH):
+    """This is a function that requests the current HyperFlex API token of a
+    HyperFlex cluster from a running HyperFlex API token broker with a
+    one-time connection. Use a TokenBrokerClient object for repeated
+    lookups.
+
+    Args:
+        cluster_name: The name of the HyperFlex cluster in the inventory of
+            the broker, which defaults to the IP address.
+        data: (Optional) The value "access_token" returns the access token as
+            a string. The value "token" returns a dictionary with the access
+            token, refresh token, and token type. The default value is
+            "access_token".
+        socket_path: (Optional) The file path of the Unix domain socket of the
+            broker. The default value is "hx_api_token_broker.sock" in a
+            directory private to the current user,
+            DEFAULT_BROKER_SOCKET_DIRECTORY.
+
+    Returns:
+        The requested HyperFlex API token data. The value None is returned if
+        the broker could not provide a valid token.
+    """
+
+    with TokenBrokerClient(socket_path) as token_broker_client:
+        return token_broker_client.get_token(cluster_name,data)
+
+
+def main(arguments=None):
+    argument_parser = argparse.ArgumentParser(
+        description="Serve HyperFlex API tokens to local scripts over a Unix "
+                    "domain socket.")
+    argument_parser.add_argument(
+        "inventory",
+        help="The path of a JSON file containing a list of HyperFlex "
+             "clusters with the 'ip', 'username', 'password' and 'file_path' "
+             "keys, and optionally a 'name' key.")
+    argument_parser.add_argument(
+        "--socket-path", default=DEFAULT_BROKER_SOCKET_PATH,
+        help="The path of the Unix domain socket. The default value is "
+             "%(default)s.")
+    argument_parser.add_argument(
+        "--validation-ttl", type=int, default=DEFAULT_BROKER_VALIDATION_TTL,
+        help="The number of seconds a validated token is handed out before "
+             "it is validated again. The default value is %(default)s.")
+    argument_parser.add_argument(
+        "--log-level", default="INFO",
+        choices=("DEBUG", "INFO", "WARNING", "ERROR"),
+        help="The logging level. The default value is %(default)s.")
+    parsed_arguments = argument_parser.parse_args(arguments)
+    logging.basicConfig(level=parsed_arguments.log_level,
+                        format="%(asctime)s %(levelname)s %(name)s: "
+                               "%(message)s")
+    with open(parsed_arguments.inventory) as inventory_file:
+        inventory = json.load(inventory_file)
+    token_broker = TokenBroker(inventory,
+                               parsed_arguments.socket_path,
+                               parsed_arguments.validation_ttl)
+    try:
+        token_broker.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        token_broker.shutdown()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
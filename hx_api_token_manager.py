@@ -12,584 +12,6338 @@ Notes: Tested on HyperFlex 4.0(1b), 4.0(2a), and 4.0(2b).
 
 # Import needed modules
 import os
-import requests
-import json
-import urllib3
-import datetime
-import xml.etree.ElementTree as et
+import stat
 import collections
+import logging
+import functools
+import threading
+import time
+import contextlib
+import atexit
+import importlib
 
-# Suppress InsecureRequestWarning
-urllib3.disable_warnings()
+
+class _LazyModule:
+    """A placeholder for a module that is only imported when one of its
+    attributes is first used, so importing the HyperFlex API Token Manager
+    does not load the network stack or parsers that a caller never uses. On
+    first use, the placeholder replaces itself in the module globals with
+    the imported module, so later uses cost nothing extra.
+
+    Args:
+        module_name: The name of the module to import.
+        global_name: (Optional) The global name bound to the module, as with
+            "import module_name as global_name". The default value of None
+            binds the top-level package, as with "import module_name".
+        on_import: (Optional) A function called once the module is imported.
+    """
+
+    def __init__(self,module_name,global_name=None,on_import=None):
+        self._module_name = module_name
+        self._global_name = global_name
+        self._on_import = on_import
+
+    def __getattr__(self,attribute_name):
+        imported_module = importlib.import_module(self._module_name)
+        if self._global_name is None:
+            global_name = self._module_name.partition(".")[0]
+            imported_module = importlib.import_module(global_name)
+        else:
+            global_name = self._global_name
+        if globals().get(global_name) is self:
+            if self._on_import is not None:
+                self._on_import()
+            globals()[global_name] = imported_module
+        return getattr(imported_module, attribute_name)
+
+
+def _disable_insecure_request_warnings():
+    """Suppresses the InsecureRequestWarning of requests sent without
+    certificate verification to the HyperFlex AAA service.
+    """
+    import urllib3
+    urllib3.disable_warnings()
+
+
+# Defer importing the modules that are only needed for requests to the
+# HyperFlex AAA service, token file parsing and optional features
+requests = _LazyModule("requests",on_import=_disable_insecure_request_warnings)
+asyncio = _LazyModule("asyncio")
+ssl = _LazyModule("ssl")
+json = _LazyModule("json")
+datetime = _LazyModule("datetime")
+et = _LazyModule("xml.etree.ElementTree","et")
+random = _LazyModule("random")
+email = _LazyModule("email.utils")
+base64 = _LazyModule("base64")
+concurrent = _LazyModule("concurrent.futures")
+tempfile = _LazyModule("tempfile")
+sqlite3 = _LazyModule("sqlite3")
+uuid = _LazyModule("uuid")
+http = _LazyModule("http.server")
+
+# Establish the HyperFlex API Token Manager logger. No output is produced
+# unless the application configures logging, e.g. logging.basicConfig().
+logger = logging.getLogger("hx_api_token_manager")
+logger.addHandler(logging.NullHandler())
+
+# Establish the HyperFlex API connection pool settings
+DEFAULT_POOL_SIZE = 10
+_hx_api_sessions = {}
+_hx_api_sessions_lock = threading.Lock()
+_hx_api_async_sessions = {}
+_hx_api_async_session_finalizers = {}
+_hx_api_tls_context = None
+
+# Establish the HyperFlex API request timeout settings
+DEFAULT_CONNECT_TIMEOUT = 5
+DEFAULT_READ_TIMEOUT = 30
+
+# Establish the HyperFlex API cluster endpoint settings
+DEFAULT_ENDPOINT_PROBE_INTERVAL = 30
+DEFAULT_ENDPOINT_PROBE_TIMEOUT = 2
+_hx_api_cluster_endpoints = {}
+_hx_api_cluster_endpoints_lock = threading.Lock()
+
+# Establish the HyperFlex API retry and circuit breaker settings
+DEFAULT_RETRY_ATTEMPTS = 2
+DEFAULT_RETRY_BACKOFF = 0.5
+DEFAULT_RETRY_MAX_BACKOFF = 10
+DEFAULT_RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+DEFAULT_CIRCUIT_BREAKER_FAILURE_THRESHOLD = 5
+DEFAULT_CIRCUIT_BREAKER_RESET_TIMEOUT = 30
+_hx_api_retry_policy = None
+_hx_api_circuit_breakers = {}
+_hx_api_circuit_breakers_lock = threading.Lock()
+
+# Establish the HyperFlex API token validation cache settings
+HX_API_TOKEN_LIFETIME = 18 * 24 * 60 * 60
+DEFAULT_VALIDATION_TTL = 0
+DEFAULT_TOKEN_EXPIRY_MARGIN = 300
+_validated_hx_api_tokens = {}
+_validated_hx_api_tokens_lock = threading.Lock()
+
+# Establish the HyperFlex API token file settings
+_umask = None
+_hx_api_token_file_records = {}
+_hx_api_token_file_records_lock = threading.Lock()
+
+# Establish the HyperFlex API token store settings
+DEFAULT_STORE_LOCK_TIMEOUT = 300
+
+# Establish the HyperFlex API token renewal coalescing settings
+_hx_api_token_renewals = {}
+_hx_api_token_renewals_lock = threading.Lock()
+_hx_api_token_async_renewals = {}
+
+# Establish the HyperFlex API token fleet management settings
+DEFAULT_FLEET_WORKERS = 16
+
+# Establish the HyperFlex API token exit revocation settings
+DEFAULT_EXIT_REVOCATION_DEADLINE = 10
+_issued_hx_api_tokens = None
+_issued_hx_api_tokens_lock = threading.Lock()
+_exit_revocation_registered = False
+
+# Establish the HyperFlex API token renewal scheduler settings
+DEFAULT_RENEWAL_LEAD_TIME = 24 * 60 * 60
+DEFAULT_RENEWAL_CHECK_INTERVAL = 60
+
+# Establish the HyperFlex API token pool settings
+DEFAULT_TOKEN_POOL_SIZE = 4
+
+# Establish the HyperFlex API Token Manager metrics settings
+DEFAULT_METRICS_PORT = 9464
+DEFAULT_METRICS_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                                   1.0, 2.5, 5.0, 10.0)
+_HX_API_METRICS = {
+    "hx_api_aaa_request_duration_seconds": (
+        "histogram", "Latency of requests to the HyperFlex AAA service."),
+    "hx_api_aaa_requests_total": (
+        "counter", "Requests to the HyperFlex AAA service by HTTP status."),
+    "hx_api_token_manage_phase_duration_seconds": (
+        "histogram", "Duration of the phases of manage_token_file()."),
+    "hx_api_token_manage_results_total": (
+        "counter", "Results of manage_token_file() calls."),
+    "hx_api_token_renewals_total": (
+        "counter", "HyperFlex API token renewals by renewal method."),
+    "hx_api_token_file_cache_total": (
+        "counter", "Token file loads answered from the parsed file cache "
+                   "(hit) or by parsing the token file (miss)."),
+    "hx_api_token_offline_validations_total": (
+        "counter", "Token validations answered from the token expiry claims "
+                   "(valid) or passed on to the HyperFlex AAA service "
+                   "(fallback)."),
+    "hx_api_endpoint_failovers_total": (
+        "counter", "Requests to the HyperFlex AAA service passed on to the "
+                   "next endpoint of a cluster after an endpoint failed."),
+    "hx_api_tls_handshakes_total": (
+        "counter", "TLS handshakes of the shared HTTP sessions that resumed "
+                   "a cached TLS session (resumed) or negotiated a new one "
+                   "(full)."),
+    "hx_api_aaa_retries_total": (
+        "counter", "Retried requests to the HyperFlex AAA service."),
+    "hx_api_circuit_breaker_rejections_total": (
+        "counter", "Requests to the HyperFlex AAA service rejected by an "
+                   "open circuit breaker."),
+    }
+_hx_api_metrics = {}
+_hx_api_metrics_lock = threading.Lock()
 
 # Establish HyperFlex API Token Manager Functions
 
-def obtain_token(ip,username,password):
-    """This is a function that obtains a HyperFlex API access token.
-    A HyperFlex API access token authorizes API operations on a HyperFlex
-    cluster.
+class _ResumingSSLSocketMixin:
+    """Makes an SSL socket store its TLS session in the session cache of its
+    context once the first data has been received. TLS 1.3 servers send
+    their session tickets after the handshake, so the session is only
+    resumable from that point on.
+    """
 
-    Args:
-        ip: The targeted HyperFlex Connect or Cluster Management IP address.
-            The value must be a string.
-        username: The username credentials that will be used to log into
-            HyperFlex. The value must be a string.
-        password: The password credentials that will be used to log into
-            HyperFlex. The value must be a string.
+    _hx_api_session_key = None
 
-    Returns:
-        A HyperFlex API access token, refresh token and token type that have
-        been granted as key-value pairs in a dictionary.
+    def recv_into(self,buffer,nbytes=None,flags=0):
+        received_bytes = super().recv_into(buffer,nbytes,flags)
+        if self._hx_api_session_key is not None:
+            self.context._store_session(self)
+        return received_bytes
 
-    Raises:
-        Exception: There was an error obtaining a HyperFlex API access token.
-            The status code or error message will be specified.
+
+class _ResumingSSLContextMixin:
+    """Makes an SSL context for the HyperFlex AAA service cache the TLS
+    session of each server address and offer it on the next connection, so
+    a new connection resumes the session with an abbreviated handshake.
+    Certificates are not verified, matching the requests sent by the
+    HyperFlex API Token Manager.
     """
 
-    # Set the Request headers
-    request_headers = {"Content-Type": "application/json"}
-    # Set the Request URL
-    request_url = "https://{}/aaa/v1/auth?grant_type=password".format(ip)
-    # Set the POST body
-    post_body = {
-        "username": username,
-        "password": password,
-        "client_id": "HxGuiClient",
-        "client_secret": "Sunnyvale",
-        "redirect_uri": "http://localhost:8080/aaa/redirect"
-        }
+    def __init__(self,*args,**kwargs):
+        # The protocol is applied by ssl.SSLContext.__new__()
+        super().__init__()
+        self.check_hostname = False
+        self.verify_mode = ssl.CERT_NONE
+        self._hx_api_sessions = {}
 
-    try:
-        print("Attempting to obtain a HyperFlex API access token...")
-        # Send the POST request
-        obtain_hx_api_token = requests.post(request_url,
-                                            headers=request_headers,
-                                            data=json.dumps(post_body),
-                                            verify=False
-                                            )
-        # Handle POST request response
-        if obtain_hx_api_token.status_code == 201:
-            hx_api_token = obtain_hx_api_token.json()
-            print("A HyperFlex API access token was successfully obtained.")
-            return hx_api_token
-        else:
-            print("There was an error obtaining a HyperFlex API access token: ")
-            print("Status Code: {}".format(str(obtain_hx_api_token.status_code)))
-            print("{}".format(str(obtain_hx_api_token.json())))
-            return
-    except Exception as exception_message:
-        print("There was an error obtaining a HyperFlex API access token: ")
-        print("{}".format(str(exception_message)))
-        return
+    def _store_session(self,ssl_socket):
+        ssl_session_key = ssl_socket._hx_api_session_key
+        ssl_socket._hx_api_session_key = None
+        with contextlib.suppress(AttributeError, ValueError, OSError):
+            ssl_session = ssl_socket.session
+            if ssl_session is not None:
+                self._hx_api_sessions[ssl_session_key] = ssl_session
 
+    def wrap_socket(self,sock,server_side=False,do_handshake_on_connect=True,
+                    suppress_ragged_eofs=True,server_hostname=None,
+                    session=None):
+        try:
+            ssl_session_key = sock.getpeername()[:2]
+        except OSError:
+            ssl_session_key = None
+        if session is None and ssl_session_key is not None:
+            session = self._hx_api_sessions.get(ssl_session_key)
+        ssl_socket = super().wrap_socket(
+            sock,server_side=server_side,
+            do_handshake_on_connect=do_handshake_on_connect,
+            suppress_ragged_eofs=suppress_ragged_eofs,
+            server_hostname=server_hostname,session=session)
+        if ssl_session_key is not None:
+            if do_handshake_on_connect:
+                _record_metric("hx_api_tls_handshakes_total",
+                               {"ip": "{}:{}".format(*ssl_session_key),
+                                "result": "resumed"
+                                if ssl_socket.session_reused else "full"})
+            ssl_socket._hx_api_session_key = ssl_session_key
+        return ssl_socket
 
-def refresh_token(ip,hx_api_token):
-    """This is a function that refreshes or renews a HyperFlex API access
-    token. A new HyperFlex API access token is obtained without the need to
-    provide username and password credentials.
+
+def _get_hx_api_tls_context():
+    """Returns the SSL context shared by the HTTP sessions of the HyperFlex
+    API Token Manager. A single context is used, as a cached TLS session can
+    only be resumed by the context that negotiated it. The caller must hold
+    the session lock. The SSL classes are built on first use, so the ssl
+    module is only imported once a session is needed.
+    """
+    global _hx_api_tls_context
+    if _hx_api_tls_context is None:
+        class _ResumingSSLSocket(_ResumingSSLSocketMixin,ssl.SSLSocket):
+            pass
+
+        class _ResumingSSLContext(_ResumingSSLContextMixin,ssl.SSLContext):
+            sslsocket_class = _ResumingSSLSocket
+
+        _hx_api_tls_context = _ResumingSSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    return _hx_api_tls_context
+
+
+def clear_tls_session_cache():
+    """This is a function that discards the TLS sessions cached for
+    resumption by the shared HTTP sessions. Later connections perform a full
+    TLS handshake and cache new sessions.
+
+    Returns:
+        The number of cached TLS sessions that were discarded as an integer.
+    """
+
+    hx_api_tls_context = _hx_api_tls_context
+    if hx_api_tls_context is None:
+        return 0
+    cleared_sessions = len(hx_api_tls_context._hx_api_sessions)
+    hx_api_tls_context._hx_api_sessions.clear()
+    return cleared_sessions
+
+def get_hx_api_session(ip,pool_size=DEFAULT_POOL_SIZE,
+                       tls_session_resumption=True):
+    """This is a function that returns a shared HTTP session for a HyperFlex
+    cluster. The session keeps connections to the HyperFlex AAA service alive,
+    so repeated API token operations on the same cluster reuse an established
+    TCP and TLS connection instead of performing a new handshake each time.
+    When a new connection is needed, for example after the HyperFlex cluster
+    closed an idle connection, the TLS session of an earlier connection is
+    resumed, which saves a round trip and the key exchange of a full TLS
+    handshake.
 
     Args:
         ip: The targeted HyperFlex Connect or Cluster Management IP address.
             The value must be a string.
-        hx_api_token: A dictionary value for a granted HyperFlex AAA token
-            containing the following keys:
-            1. "access_token": An access token obtained from the HyperFlex API
-                AAA (Authorization, Accounting and Authentication). The
-                access token is used to authorize API operations by properly
-                authenticated users.
-            2. "refresh_token": A refresh token obtained from the HyperFlex API
-                AAA (Authorization, Accounting and Authentication). The
-                refresh token can be used to obtain a new access token without
-                the need to re-provide HyperFlex username and password
-                credentials.
-            3. "token_type": A token type obtained from the HyperFlex API
-                AAA (Authorization, Accounting and Authentication). The
-                token type value is "Bearer".
+        pool_size: (Optional) The maximum number of keep-alive connections
+            held open to the HyperFlex cluster. Providing this argument is
+            optional. The value must be an integer. The setting only applies
+            when the session for the cluster is first created. The default
+            value is 10.
+        tls_session_resumption: (Optional) The option to cache TLS sessions
+            and resume them on new connections. Providing this argument is
+            optional. The setting only applies when the session for the
+            cluster is first created. The default value is True.
 
     Returns:
-        A HyperFlex API access token, refresh token and token type that have
-        been granted as key-value pairs in a dictionary.
+        A requests.Session object for the HyperFlex cluster. The same session
+        object is returned on every call with the same IP address.
 
     Raises:
-        Exception: There was an error refreshing the HyperFlex API access
-            token. The status code or error message will be specified.
-        ValueError: There was an invalid argument provided for the HyperFlex
-            API token. A recommendation on how to resolve the error will be
+        ValueError: There was an invalid argument provided for the pool size
+            setting. A recommendation on how to resolve the error will be
             displayed.
     """
 
-    # Verify the hx_api_token argument
-    if not isinstance(hx_api_token, collections.abc.Mapping):
-        raise ValueError("The argument provided for the HyperFlex API token "
-                         "is not valid. Please provide a valid dictionary "
-                         "for the 'hx_api_token' argument.")
-    
-    # Set the Request headers
-    request_headers = {"Content-Type": "application/json"}
-    # Set the Request URL
-    request_url = "https://{}/aaa/v1/token?grant_type=refresh".format(ip)
-    # Set the POST body
-    post_body = {
-        "access_token": hx_api_token["access_token"],
-        "refresh_token": hx_api_token["refresh_token"],
-        "token_type": hx_api_token["token_type"]
-        }
-
-    try:
-        print("Attempting to refresh the HyperFlex API access token...")
-        # Send the POST request
-        refresh_hx_api_token = requests.post(request_url,
-                                             headers=request_headers,
-                                             data=json.dumps(post_body),
-                                             verify=False
-                                             )
-        # Handle POST request response
-        if refresh_hx_api_token.status_code == 201:
-            hx_api_token = refresh_hx_api_token.json()
-            print("The HyperFlex API access token was successfully refreshed.")
-            return hx_api_token
-        else:
-            print("There was an error refreshing the HyperFlex API access token: ")
-            print("Status Code: {}".format(str(refresh_hx_api_token.status_code)))
-            print("{}".format(str(refresh_hx_api_token.json())))
-            return
-    except Exception as exception_message:
-        print("There was an error refreshing the HyperFlex API access token: ")
-        print("{}".format(str(exception_message)))
-        return
+    # Verify the pool_size argument
+    if not isinstance(pool_size, int) or isinstance(pool_size, bool) or pool_size < 1:
+        raise ValueError("The pool size setting is not valid. Please provide "
+                         "a positive integer for the 'pool_size' argument.")
 
+    with _hx_api_sessions_lock:
+        hx_api_session = _hx_api_sessions.get(ip)
+        if hx_api_session is None:
+            # Establish a new keep-alive session for the HyperFlex cluster
+            hx_api_session = requests.Session()
+            hx_api_session.verify = False
+            hx_api_session_adapter = requests.adapters.HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=pool_size
+                )
+            if tls_session_resumption:
+                hx_api_session_adapter.init_poolmanager(
+                    1,pool_size,ssl_context=_get_hx_api_tls_context())
+            hx_api_session.mount("https://", hx_api_session_adapter)
+            _hx_api_sessions[ip] = hx_api_session
+        return hx_api_session
 
-def validate_token(ip,hx_api_token,scope="READ"):
-    """This is a function that validates a HyperFlex API access token.
-    A newly issued HyperFlex API access token is valid for 18 days from the
-    point of creation. The validate_token() function can be used to check if
-    an issued HyperFlex API access token is still valid.
 
-    Args:
-        ip: The targeted HyperFlex Connect or Cluster Management IP address.
-            The value must be a string.
-        hx_api_token: A dictionary value for a granted HyperFlex AAA token
-            containing the following keys:
-            1. "access_token": An access token obtained from the HyperFlex API
-                AAA (Authorization, Accounting and Authentication). The access
-                token is used to authorize API operations by properly
-                authenticated users.
-            2. "refresh_token": A refresh token obtained from the HyperFlex API
-                AAA (Authorization, Accounting and Authentication). The
-                refresh token can be used to obtain a new access token without
-                the need to re-provide HyperFlex username and password
-                credentials.
-            3. "token_type": A token type obtained from the HyperFlex API
-                AAA (Authorization, Accounting and Authentication). The
-                token type value is "Bearer".
-        scope: (Optional) The scope of the validate access token operation.
-            Providing this argument is optional. The value must be a string.
-            The options are "READ" or "MODIFY". The default value is "READ".
+def close_hx_api_sessions():
+    """This is a function that closes all shared HTTP sessions created by
+    the get_hx_api_session() function and releases their pooled connections.
+    New sessions will be created automatically by later API token operations.
 
     Returns:
-        The Boolean value True is returned for a successful validation. The
-        Boolean value False is returned if the validation fails.
+        The number of sessions that were closed as an integer.
+    """
+
+    with _hx_api_sessions_lock:
+        hx_api_sessions = list(_hx_api_sessions.values())
+        _hx_api_sessions.clear()
+    for hx_api_session in hx_api_sessions:
+        hx_api_session.close()
+    return len(hx_api_sessions)
+
+
+class RetryPolicy:
+    """This is a class that describes how requests to the HyperFlex AAA
+    service are retried after a transient failure. Connection errors,
+    timeouts and responses with a retryable HTTP status code are retried
+    after an exponential backoff with full jitter. The delay requested by
+    the Retry-After header of a response is honored, up to the maximum
+    backoff.
+
+    Args:
+        attempts: (Optional) The number of retries after the first request.
+            Providing this argument is optional. The value must be an integer.
+            The value 0 disables retries. The default value is 2.
+        backoff: (Optional) The base delay in seconds before the first
+            retry. The delay doubles with each later retry. Providing this
+            argument is optional. The value must be a number. The default
+            value is 0.5.
+        max_backoff: (Optional) The maximum delay in seconds before a retry.
+            Providing this argument is optional. The value must be a number.
+            The default value is 10.
+        status_codes: (Optional) The HTTP status codes that are retried.
+            Providing this argument is optional. The value must be a tuple of
+            integers. The default value is (429, 500, 502, 503, 504).
+        jitter: (Optional) The option to pick a random delay between zero
+            and the exponential backoff, so that many clients recovering from
+            the same outage do not retry at the same moment. Providing this
+            argument is optional. The default value is True.
 
     Raises:
-        Exception: There was an error performing the validation of the
-            HyperFlex API access token. The status code or error message will
-            be specified.
-        ValueError: There was an invalid argument provided for the HyperFlex
-            API token or desired scope operation. A recommendation on how to
+        ValueError: There was an invalid argument provided for the attempts,
+            backoff or max backoff settings. A recommendation on how to
             resolve the error will be displayed.
     """
 
-    # Verify the hx_api_token argument
-    if not isinstance(hx_api_token, collections.abc.Mapping):
-        raise ValueError("The argument provided for the HyperFlex API token "
-                         "is not valid. Please provide a valid dictionary "
-                         "for the 'hx_api_token' argument.")
+    def __init__(self,attempts=DEFAULT_RETRY_ATTEMPTS,
+                 backoff=DEFAULT_RETRY_BACKOFF,
+                 max_backoff=DEFAULT_RETRY_MAX_BACKOFF,
+                 status_codes=DEFAULT_RETRY_STATUS_CODES,
+                 jitter=True):
+        # Verify the attempts argument
+        if not isinstance(attempts, int) or isinstance(attempts, bool) or attempts < 0:
+            raise ValueError("The retry attempts setting is not valid. Please "
+                             "provide a non-negative integer for the "
+                             "'attempts' argument.")
+        # Verify the backoff and max_backoff arguments
+        for backoff_name, backoff_value in (("backoff", backoff),
+                                            ("max_backoff", max_backoff)):
+            if (not isinstance(backoff_value, (int, float))
+                    or isinstance(backoff_value, bool) or backoff_value < 0):
+                raise ValueError("The {} setting is not valid. Please provide "
+                                 "a non-negative number for the '{}' "
+                                 "argument.".format(backoff_name,
+                                                    backoff_name))
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.status_codes = frozenset(status_codes)
+        self.jitter = jitter
 
-    # Verify the scope argument
-    if scope not in ("READ", "MODIFY"):
-        raise ValueError("The argument provided for the scope operation is "
-                         "not valid. Please provide either the value 'READ' "
-                         "or 'MODIFY' in string format for the 'scope' "
-                         "argument.")
-    
-    # Set the Request headers
-    request_headers = {"Content-Type": "application/json"}
-    # Set the Request URL
-    request_url = "https://{}/aaa/v1/validate".format(ip)
-    # Set the POST body
-    post_body = {
-        "access_token": hx_api_token["access_token"],
-        "scope": scope,
-        "token_type": hx_api_token["token_type"]
-        }
+    def __repr__(self):
+        return ("RetryPolicy(attempts={!r}, backoff={!r}, max_backoff={!r}, "
+                "status_codes={!r}, jitter={!r})".format(
+                    self.attempts, self.backoff, self.max_backoff,
+                    tuple(sorted(self.status_codes)), self.jitter))
 
-    try:
-        print("Attempting to validate the HyperFlex API access token...")
-        # Send the POST request
-        validate_hx_api_token = requests.post(request_url,
-                                              headers=request_headers,
-                                              data=json.dumps(post_body),
-                                              verify=False
-                                              )
-        # Handle POST request response
-        if validate_hx_api_token.status_code == 200:
-            print("The HyperFlex API access token was successfully validated.")
-            return True
-        else:
-            print("There was an error validating the HyperFlex API access token: ")
-            print("Status Code: {}".format(str(validate_hx_api_token.status_code)))
-            print("{}".format(str(validate_hx_api_token.json())))
-            return False
-    except Exception as exception_message:
-        print("There was an error validating the HyperFlex API access token: ")
-        print("{}".format(str(exception_message)))
-        return False
+    def retry_delay(self,attempt,retry_after=None):
+        """Returns the number of seconds to wait before the given retry,
+        counted from 0. A Retry-After header value in seconds or as an HTTP
+        date takes precedence over a shorter backoff.
+        """
+        retry_delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+        if self.jitter:
+            retry_delay = random.uniform(0, retry_delay)
+        retry_after_delay = _parse_retry_after(retry_after)
+        if retry_after_delay is not None:
+            retry_delay = max(retry_delay,
+                              min(self.max_backoff, retry_after_delay))
+        return retry_delay
 
 
-def revoke_token(ip,hx_api_token):
-    """This is a function that revokes a HyperFlex API access token.
-    A newly issued HyperFlex API access token is valid for 18 days from the
-    point of creation. The revoke_token() function can be used to revoke a
-    previously issued HyperFlex API access token for any reason (e.g. security,
-    etc.).
+def _parse_retry_after(retry_after):
+    """Returns the delay in seconds of a Retry-After header value, or None if
+    the value is missing or not valid.
+    """
+    if not retry_after:
+        return
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        retry_after_time = email.utils.parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return
+    return max(0.0, retry_after_time.timestamp() - time.time())
 
-    Args:
-        ip: The targeted HyperFlex Connect or Cluster Management IP address.
-            The value must be a string.
-        hx_api_token: A dictionary value for a granted HyperFlex AAA token
-            containing the following keys:
-            1. "access_token": An access token obtained from the HyperFlex API
-                AAA (Authorization, Accounting and Authentication). The
-                access token is used to authorize API operations by properly
-                authenticated users.
-            2. "refresh_token": A refresh token obtained from the HyperFlex API
-                AAA (Authorization, Accounting and Authentication). The
-                refresh token can be used to obtain a new access token without
-                the need to re-provide HyperFlex username and password
-                credentials.
-            3. "token_type": A token type obtained from the HyperFlex API
-                AAA (Authorization, Accounting and Authentication). The
-                token type value is "Bearer".
+
+def get_retry_policy():
+    """This is a function that returns the RetryPolicy used by the AAA
+    functions when no retry policy argument is provided.
 
     Returns:
-        The Boolean value True is returned for a successful revocation. The
-        Boolean value False is returned if the revocation fails.
+        The default RetryPolicy object of the module.
+    """
+
+    global _hx_api_retry_policy
+    if _hx_api_retry_policy is None:
+        _hx_api_retry_policy = RetryPolicy()
+    return _hx_api_retry_policy
+
+
+def set_retry_policy(retry_policy):
+    """This is a function that sets the RetryPolicy used by the AAA functions
+    when no retry policy argument is provided.
+
+    Args:
+        retry_policy: A RetryPolicy object. The value None restores the
+            default retry policy. Use RetryPolicy(attempts=0) to disable
+            retries.
 
     Raises:
-        Exception: There was an error performing the revocation of the
-            HyperFlex API access token. The status code or error message will
-            be specified.
-        ValueError: There was an invalid argument provided for the HyperFlex
-            API token. A recommendation on how to resolve the error will be
+        ValueError: There was an invalid argument provided for the retry
+            policy. A recommendation on how to resolve the error will be
             displayed.
     """
 
-    # Verify the hx_api_token argument
-    if not isinstance(hx_api_token, collections.abc.Mapping):
-        raise ValueError("The argument provided for the HyperFlex API token "
-                         "is not valid. Please provide a valid dictionary "
-                         "for the 'hx_api_token' argument.")
+    global _hx_api_retry_policy
+    # Verify the retry_policy argument
+    if retry_policy is not None and not isinstance(retry_policy, RetryPolicy):
+        raise ValueError("The retry policy setting is not valid. Please "
+                         "provide a RetryPolicy object or None for the "
+                         "'retry_policy' argument.")
+    _hx_api_retry_policy = retry_policy
 
-    # Set the Request headers
-    request_headers = {"Content-Type": "application/json"}
-    # Set the Request URL
-    request_url = "https://{}/aaa/v1/revoke".format(ip)
-    # Set the POST body
-    post_body = {
-        "access_token": hx_api_token["access_token"],
-        "refresh_token": hx_api_token["refresh_token"],
-        "token_type": hx_api_token["token_type"]
-        }
 
-    try:
-        print("Attempting to revoke the HyperFlex API access token...")
-        # Send the POST request
-        revoke_hx_api_token = requests.post(request_url,
-                                            headers=request_headers,
-                                            data=json.dumps(post_body),
-                                            verify=False
-                                            )
-        # Handle POST request response
-        if revoke_hx_api_token.status_code == 200:
-            print("The HyperFlex API access token was successfully revoked.")
-            return True
-        else:
-            print("There was an error revoking the HyperFlex API access token: ")
-            print("Status Code: {}".format(str(revoke_hx_api_token.status_code)))
-            print("{}".format(str(revoke_hx_api_token.json())))
-            return False
-    except Exception as exception_message:
-        print("There was an error revoking the HyperFlex API access token: ")
-        print("{}".format(str(exception_message)))
-        return False
+class CircuitBreakerOpenError(Exception):
+    """Raised when a request to the HyperFlex AAA service of a cluster is
+    rejected because the circuit breaker of the cluster is open.
+    """
 
 
-def create_token_file(ip,username,password,file_path,overwrite=True):
-    r"""This is a function that creates an XML file containing a newly issued
-    HyperFlex API token.
+class CircuitBreaker:
+    """This is a class that stops sending requests to a HyperFlex cluster
+    that is known to be down. After a number of consecutive failed requests,
+    the breaker opens and requests fail immediately without contacting the
+    cluster. Once the reset timeout has passed, one trial request is let
+    through. A successful trial request closes the breaker, and a failed one
+    opens it again. Connection errors, timeouts and HTTP 5xx responses count
+    as failures. Any other response shows the cluster is reachable and
+    counts as a success, including a rejected token.
 
     Args:
-        ip: The targeted HyperFlex Connect or Cluster Management IP address.
-            The value must be a string.
-        username: The username credentials that will be used to log into
-            HyperFlex. The value must be a string.
-        password: The password credentials that will be used to log into
-            HyperFlex. The value must be a string.
-        file_path: The file name and storage location to write a HyperFlex API
-            token file. The value must be a string. An example value is
-            "c:\\folder\\file.xml".
-        overwrite: (Optional) The option to overwrite any pre-existing file at
-            the provided file path value given to the 'file_path' argument.
-            Providing this argument is optional. If the argument is set to the
-            Boolean value True, any pre-existing token file will be
+        failure_threshold: (Optional) The number of consecutive failures
+            that opens the breaker. Providing this argument is optional. The
+            value must be a positive integer. The default value is 5.
+        reset_timeout: (Optional) The number of seconds the breaker stays
+            open before a trial request is let through. Providing this
+            argument is optional. The value must be a number. The default
+            value is 30.
+
+    Raises:
+        ValueError: There was an invalid argument provided for the failure
+            threshold or reset timeout settings. A recommendation on how to
+            resolve the error will be displayed.
+    """
+
+    def __init__(self,failure_threshold=DEFAULT_CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+                 reset_timeout=DEFAULT_CIRCUIT_BREAKER_RESET_TIMEOUT):
+        # Verify the failure_threshold argument
+        if (not isinstance(failure_threshold, int)
+                or isinstance(failure_threshold, bool) or failure_threshold < 1):
+            raise ValueError("The failure threshold setting is not valid. "
+                             "Please provide a positive integer for the "
+                             "'failure_threshold' argument.")
+        # Verify the reset_timeout argument
+        if (not isinstance(reset_timeout, (int, float))
+                or isinstance(reset_timeout, bool) or reset_timeout < 0):
+            raise ValueError("The reset timeout setting is not valid. Please "
+                             "provide a non-negative number for the "
+                             "'reset_timeout' argument.")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_time = None
+        self._trial_in_progress = False
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "CircuitBreaker(state={!r}, failures={!r})".format(
+            self.state, self._failures)
+
+    @property
+    def state(self):
+        """The state of the breaker: "closed", "open" or "half_open"."""
+        with self._lock:
+            return self._state()
+
+    def _state(self):
+        if self._opened_time is None:
+            return "closed"
+        if time.monotonic() - self._opened_time < self.reset_timeout:
+            return "open"
+        return "half_open"
+
+    def allow_request(self):
+        """Returns True if a request may be sent. In the half open state,
+        only one trial request is allowed until its outcome is recorded.
+        """
+        with self._lock:
+            breaker_state = self._state()
+            if breaker_state == "closed":
+                return True
+            if breaker_state == "half_open" and not self._trial_in_progress:
+                self._trial_in_progress = True
+                return True
+            return False
+
+    def record_success(self):
+        """Records a request that reached the cluster and closes the
+        breaker.
+        """
+        with self._lock:
+            self._failures = 0
+            self._opened_time = None
+            self._trial_in_progress = False
+
+    def record_failure(self):
+        """Records a failed request and opens the breaker when the failure
+        threshold is reached or a trial request failed.
+        """
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_progress or self._failures >= self.failure_threshold:
+                self._opened_time = time.monotonic()
+            self._trial_in_progress = False
+
+    def reset(self):
+        """Closes the breaker and clears its failure count."""
+        self.record_success()
+
+
+def get_circuit_breaker(ip,failure_threshold=DEFAULT_CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+                        reset_timeout=DEFAULT_CIRCUIT_BREAKER_RESET_TIMEOUT):
+    """This is a function that returns the circuit breaker of a HyperFlex
+    cluster. The breaker is shared by the synchronous and asynchronous AAA
+    functions, so once a cluster is known to be down, all token operations
+    on it fail fast until the cluster is reachable again.
+
+    Args:
+        ip: The targeted HyperFlex Connect or Cluster Management IP address.
+            The value must be a string.
+        failure_threshold: (Optional) The number of consecutive failures that
+            opens the breaker. Providing this argument is optional. The
+            setting only applies when the breaker for the cluster is first
+            created. The default value is 5.
+        reset_timeout: (Optional) The number of seconds the breaker stays
+            open before a trial request is let through. Providing this
+            argument is optional. The setting only applies when the breaker
+            for the cluster is first created. The default value is 30.
+
+    Returns:
+        The CircuitBreaker object of the HyperFlex cluster. The same object
+        is returned on every call with the same IP address.
+    """
+
+    with _hx_api_circuit_breakers_lock:
+        circuit_breaker = _hx_api_circuit_breakers.get(ip)
+        if circuit_breaker is None:
+            circuit_breaker = CircuitBreaker(failure_threshold,reset_timeout)
+            _hx_api_circuit_breakers[ip] = circuit_breaker
+        return circuit_breaker
+
+
+def reset_circuit_breakers():
+    """This is a function that discards the circuit breakers of all HyperFlex
+    clusters, so every cluster is contacted again on the next request.
+    """
+
+    with _hx_api_circuit_breakers_lock:
+        _hx_api_circuit_breakers.clear()
+
+
+def _is_circuit_breaker_failure(request_status):
+    """Returns True if a request status counts as a failure of the cluster
+    for its circuit breaker.
+    """
+    return request_status == "error" or request_status >= 500
+
+
+def _reject_open_circuit(operation,ip,circuit_breaker):
+    """Raises CircuitBreakerOpenError if the circuit breaker of the cluster
+    does not allow a request.
+    """
+    if circuit_breaker.allow_request():
+        return
+    _record_metric("hx_api_circuit_breaker_rejections_total",
+                   {"operation": operation, "ip": ip})
+    raise CircuitBreakerOpenError(
+        "The circuit breaker for the HyperFlex cluster at {} is open after "
+        "repeated failures. Requests will be attempted again in up to {} "
+        "seconds.".format(ip, circuit_breaker.reset_timeout))
+
+
+class DeadlineExceededError(TimeoutError):
+    """Raised when the deadline of a HyperFlex API token operation passes
+    before the operation could be completed.
+    """
+
+
+def _verify_timeout_arguments(timeout,deadline):
+    """Verifies the timeout and deadline arguments of the HyperFlex API token
+    functions.
+
+    Returns:
+        The connect and read timeouts in seconds as a tuple, with the module
+        settings DEFAULT_CONNECT_TIMEOUT and DEFAULT_READ_TIMEOUT applied if
+        no timeout was provided.
+    """
+
+    # Verify the timeout argument
+    if timeout is None:
+        timeout = (DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT)
+    elif not isinstance(timeout, tuple):
+        timeout = (timeout, timeout)
+    if len(timeout) != 2 or not all(
+            isinstance(timeout_value, (int, float))
+            and not isinstance(timeout_value, bool) and timeout_value > 0
+            for timeout_value in timeout):
+        raise ValueError("The timeout setting is not valid. Please provide a "
+                         "positive number or a tuple of positive connect and "
+                         "read timeouts for the 'timeout' argument.")
+
+    # Verify the deadline argument
+    if deadline is not None and (not isinstance(deadline, (int, float))
+                                 or isinstance(deadline, bool)
+                                 or deadline <= 0):
+        raise ValueError("The deadline setting is not valid. Please provide "
+                         "a positive number of seconds or None for the "
+                         "'deadline' argument.")
+    return timeout
+
+
+def _deadline_time(deadline):
+    """Returns the time.monotonic() value at which a deadline given in
+    seconds passes, or None if no deadline was given.
+    """
+    if deadline is None:
+        return
+    return time.monotonic() + deadline
+
+
+def _remaining_time(deadline_time):
+    """Returns the number of seconds left before a deadline time, or None if
+    there is no deadline. DeadlineExceededError is raised if the deadline has
+    passed.
+    """
+    if deadline_time is None:
+        return
+    remaining_time = deadline_time - time.monotonic()
+    if remaining_time <= 0:
+        raise DeadlineExceededError("The deadline of the HyperFlex API token "
+                                    "operation has passed.")
+    return remaining_time
+
+
+def _request_timeout(timeout,deadline_time):
+    """Returns the connect and read timeouts of a request, shortened to the
+    time left before the deadline.
+    """
+    remaining_time = _remaining_time(deadline_time)
+    if remaining_time is None:
+        return timeout
+    return (min(timeout[0], remaining_time), min(timeout[1], remaining_time))
+
+
+def _check_retry_deadline(retry_delay,deadline_time):
+    """Raises DeadlineExceededError if the deadline would pass while waiting
+    to retry a request.
+    """
+    if deadline_time is not None and time.monotonic() + retry_delay >= deadline_time:
+        raise DeadlineExceededError("The deadline of the HyperFlex API token "
+                                    "operation would pass before the request "
+                                    "could be retried.")
+
+
+def _log_aaa_retry(operation,ip,request_status,retry_delay,attempt,
+                   retry_policy):
+    """Records and logs a retry of a request to the HyperFlex AAA service."""
+    _record_metric("hx_api_aaa_retries_total",
+                   {"operation": operation, "ip": ip})
+    logger.warning("The HyperFlex AAA request %s to %s failed with status "
+                   "%s, retrying in %.2f seconds (retry %s of %s)...",
+                   operation, ip, request_status, retry_delay, attempt + 1,
+                   retry_policy.attempts,
+                   extra={"hx_ip": ip, "hx_operation": operation})
+
+
+def _is_unanswered_login(operation,exception_message,read_timeout_errors):
+    """Returns True if a password login failed while waiting for the answer
+    of the HyperFlex AAA service. The service may already have issued a
+    token, so the login is neither retried nor passed on to another
+    endpoint, which would issue a second token.
+    """
+    return (operation == "obtain_token"
+            and isinstance(exception_message, read_timeout_errors))
+
+
+def _aaa_outage_errors():
+    """Returns the exceptions raised by the synchronous AAA functions when
+    the HyperFlex AAA service could not be reached or answered with a
+    server error, as opposed to rejecting the request.
+    """
+    return (CircuitBreakerOpenError,
+            requests.exceptions.ConnectionError,
+            requests.exceptions.Timeout,
+            requests.exceptions.HTTPError)
+
+
+def _async_read_timeout_errors():
+    """Returns the aiohttp exceptions raised when a request timed out while
+    waiting for the answer. Versions of aiohttp that do not tell read
+    timeouts apart from connect timeouts report any timeout.
+    """
+    import aiohttp
+
+    return getattr(aiohttp, "SocketTimeoutError", asyncio.TimeoutError)
+
+
+def _async_aaa_outage_errors():
+    """Returns the exceptions raised by the asynchronous AAA functions when
+    the HyperFlex AAA service could not be reached or answered with a
+    server error. See the _aaa_outage_errors() function for details.
+    """
+    import aiohttp
+
+    return (CircuitBreakerOpenError,
+            aiohttp.ClientConnectionError,
+            aiohttp.ClientResponseError,
+            asyncio.TimeoutError)
+
+
+def _is_aaa_outage_status(status_code):
+    """Returns True if an HTTP status code left after the retries shows the
+    HyperFlex AAA service is unavailable rather than rejecting the request.
+    """
+    return status_code == 429 or status_code >= 500
+
+
+def _send_endpoint_aaa_request(operation,ip,session,request_url,request_body,
+                               retry_policy=None,timeout=None,
+                               deadline_time=None):
+    """Sends a POST request to the HyperFlex AAA service of a single endpoint
+    and returns the requests.Response object. Transient failures are retried according to
+    the retry policy, and the circuit breaker of the cluster is consulted
+    before each attempt and updated with its outcome. Each attempt is
+    recorded in the metrics. The connect and read timeouts of each attempt
+    are shortened to the time left before the deadline time, and no retry
+    is started that could not finish before it.
+    """
+    if retry_policy is None:
+        retry_policy = get_retry_policy()
+    if timeout is None:
+        timeout = (DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT)
+    circuit_breaker = get_circuit_breaker(ip)
+    attempt = 0
+    while True:
+        request_timeout = _request_timeout(timeout,deadline_time)
+        _reject_open_circuit(operation,ip,circuit_breaker)
+        request_status = "error"
+        request_start_time = time.perf_counter()
+        try:
+            aaa_response = session.post(request_url,
+                                        headers={"Content-Type": "application/json"},
+                                        data=json.dumps(request_body),
+                                        verify=False,
+                                        timeout=request_timeout
+                                        )
+            request_status = aaa_response.status_code
+        except (requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout) as exception_message:
+            if (attempt >= retry_policy.attempts
+                    or _is_unanswered_login(operation,exception_message,
+                                            requests.exceptions.ReadTimeout)):
+                raise
+            retry_after = None
+        else:
+            if (request_status not in retry_policy.status_codes
+                    or attempt >= retry_policy.attempts):
+                return aaa_response
+            retry_after = aaa_response.headers.get("Retry-After")
+            aaa_response.close()
+        finally:
+            _record_aaa_request(operation,ip,request_start_time,
+                                request_status)
+            if _is_circuit_breaker_failure(request_status):
+                circuit_breaker.record_failure()
+            else:
+                circuit_breaker.record_success()
+        # Fail fast instead of waiting if the failure opened the breaker
+        if circuit_breaker.state == "open":
+            _reject_open_circuit(operation,ip,circuit_breaker)
+        retry_delay = retry_policy.retry_delay(attempt,retry_after)
+        _check_retry_deadline(retry_delay,deadline_time)
+        _log_aaa_retry(operation,ip,request_status,retry_delay,attempt,
+                       retry_policy)
+        time.sleep(retry_delay)
+        attempt += 1
+
+
+async def _async_send_endpoint_aaa_request(operation,ip,session,request_url,
+                                           request_body,retry_policy=None,
+                                           timeout=None,deadline_time=None):
+    """Sends a POST request to the HyperFlex AAA service of a single endpoint
+    with an aiohttp session and returns the aiohttp.ClientResponse object. It
+    is the awaitable counterpart of the _send_endpoint_aaa_request()
+    function.
+    """
+    import aiohttp
+
+    if retry_policy is None:
+        retry_policy = get_retry_policy()
+    if timeout is None:
+        timeout = (DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT)
+    circuit_breaker = get_circuit_breaker(ip)
+    attempt = 0
+    while True:
+        request_timeout = _request_timeout(timeout,deadline_time)
+        _reject_open_circuit(operation,ip,circuit_breaker)
+        request_status = "error"
+        request_start_time = time.perf_counter()
+        try:
+            aaa_response = await session.post(
+                request_url,
+                headers={"Content-Type": "application/json"},
+                data=json.dumps(request_body),
+                ssl=False,
+                timeout=aiohttp.ClientTimeout(
+                    total=_remaining_time(deadline_time),
+                    sock_connect=request_timeout[0],
+                    sock_read=request_timeout[1])
+                )
+            request_status = aaa_response.status
+        except (aiohttp.ClientConnectionError,
+                asyncio.TimeoutError) as exception_message:
+            if (attempt >= retry_policy.attempts
+                    or _is_unanswered_login(operation,exception_message,
+                                            _async_read_timeout_errors())):
+                raise
+            retry_after = None
+        else:
+            if (request_status not in retry_policy.status_codes
+                    or attempt >= retry_policy.attempts):
+                return aaa_response
+            retry_after = aaa_response.headers.get("Retry-After")
+            aaa_response.release()
+        finally:
+            _record_aaa_request(operation,ip,request_start_time,
+                                request_status)
+            if _is_circuit_breaker_failure(request_status):
+                circuit_breaker.record_failure()
+            else:
+                circuit_breaker.record_success()
+        # Fail fast instead of waiting if the failure opened the breaker
+        if circuit_breaker.state == "open":
+            _reject_open_circuit(operation,ip,circuit_breaker)
+        retry_delay = retry_policy.retry_delay(attempt,retry_after)
+        _check_retry_deadline(retry_delay,deadline_time)
+        _log_aaa_retry(operation,ip,request_status,retry_delay,attempt,
+                       retry_policy)
+        await asyncio.sleep(retry_delay)
+        attempt += 1
+
+
+def _probe_aaa_service(ip,timeout,session=None):
+    """Sends an empty validation request, which any reachable HyperFlex AAA
+    service answers without a token, over the shared keep-alive session of
+    the IP address unless a session is given.
+
+    Returns:
+        The latency of the request in seconds. The value None is returned if
+        the AAA service could not be reached or answered with an HTTP 5xx
+        status code.
+    """
+    if session is None:
+        session = get_hx_api_session(ip)
+    probe_start_time = time.perf_counter()
+    try:
+        probe_response = session.post("https://{}/aaa/v1/validate".format(ip),
+                                      headers={"Content-Type": "application/json"},
+                                      data="{}",
+                                      verify=False,
+                                      timeout=timeout
+                                      )
+        probe_response.close()
+        if probe_response.status_code >= 500:
+            raise requests.exceptions.HTTPError(
+                "Status Code: {}".format(probe_response.status_code))
+    except requests.exceptions.RequestException as exception_message:
+        logger.debug("The probe of the HyperFlex AAA service at %s failed: "
+                     "%s", ip, exception_message)
+        return
+    return time.perf_counter() - probe_start_time
+
+
+def _prewarm_addresses(ips):
+    """Returns the addresses to pre-warm for a list of HyperFlex clusters,
+    replacing each cluster configured with set_cluster_endpoints() by its
+    endpoints.
+    """
+    if isinstance(ips, str):
+        ips = [ips]
+    prewarm_addresses = []
+    for ip in ips:
+        cluster_endpoints = _hx_api_cluster_endpoints.get(ip)
+        prewarm_addresses.extend(cluster_endpoints.endpoints
+                                 if cluster_endpoints is not None else [ip])
+    return list(dict.fromkeys(prewarm_addresses))
+
+
+def _verify_prewarm_arguments(connections,timeout):
+    """Raises a ValueError if the pre-warm connections or timeout setting is
+    not valid.
+    """
+    if (not isinstance(connections, int) or isinstance(connections, bool)
+            or connections < 1):
+        raise ValueError("The connections setting is not valid. Please "
+                         "provide a positive integer for the 'connections' "
+                         "argument.")
+    if (not isinstance(timeout, (int, float)) or isinstance(timeout, bool)
+            or timeout <= 0):
+        raise ValueError("The timeout setting is not valid. Please provide a "
+                         "positive number for the 'timeout' argument.")
+
+
+def prewarm_hx_api_sessions(ips,connections=1,
+                            timeout=DEFAULT_ENDPOINT_PROBE_TIMEOUT):
+    """This is a function that opens keep-alive connections to the HyperFlex
+    AAA service of one or more HyperFlex clusters ahead of time, for example
+    at application startup. The TCP and TLS handshakes are performed in
+    parallel for all clusters, and the connections are kept in the shared
+    HTTP sessions, so the first API token operation on each cluster costs a
+    single round trip. The TLS sessions are also cached for resumption by
+    later connections. For a cluster configured with set_cluster_endpoints(),
+    every endpoint is pre-warmed.
+
+    Args:
+        ips: The HyperFlex Connect or Cluster Management IP addresses, or
+            cluster names, to pre-warm. The value must be a string or a list
+            of strings.
+        connections: (Optional) The number of connections opened to each
+            address. Providing this argument is optional. The value must be a
+            positive integer no larger than the pool size of the sessions.
+            The default value is 1.
+        timeout: (Optional) The number of seconds after which opening a
+            connection counts as failed. Providing this argument is optional.
+            The value must be a positive number. The default value is 2.
+
+    Returns:
+        A dictionary keyed by address with the Boolean value True if all
+        connections to the address were opened, otherwise False.
+
+    Raises:
+        ValueError: There was an invalid argument provided for the
+            connections or timeout settings. A recommendation on how to
+            resolve the error will be displayed.
+    """
+
+    # Verify the connections and timeout arguments
+    _verify_prewarm_arguments(connections,timeout)
+
+    prewarm_addresses = _prewarm_addresses(ips)
+    prewarm_results = dict.fromkeys(prewarm_addresses, True)
+
+    def prewarm_connection(prewarm_address):
+        if _probe_aaa_service(prewarm_address,timeout) is None:
+            prewarm_results[prewarm_address] = False
+
+    # Hold all probes open at the same time, so each one uses a separate
+    # connection of the session pool
+    prewarm_threads = [threading.Thread(target=prewarm_connection,
+                                        args=(prewarm_address,),
+                                        name="hx-api-session-prewarm",
+                                        daemon=True)
+                       for prewarm_address in prewarm_addresses
+                       for _ in range(connections)]
+    for prewarm_thread in prewarm_threads:
+        prewarm_thread.start()
+    for prewarm_thread in prewarm_threads:
+        prewarm_thread.join()
+    logger.info("Pre-warmed connections to %s of %s HyperFlex AAA "
+                "addresses.", sum(prewarm_results.values()),
+                len(prewarm_results))
+    return prewarm_results
+
+
+class ClusterEndpoints:
+    r"""This is a class that holds the candidate addresses of one HyperFlex
+    cluster, for example the Cluster Management IP address and the IP
+    addresses of the nodes, and ranks them for requests to the HyperFlex AAA
+    service. A background thread probes the AAA service of every endpoint,
+    and requests are routed to the healthy endpoint with the lowest probe
+    latency. An endpoint that fails a request is moved to the back of the
+    ranking until it answers a probe again. Register the endpoints with the
+    set_cluster_endpoints() function instead of creating this class
+    directly.
+
+    Args:
+        cluster: The name under which the HyperFlex cluster is addressed. The
+            value must be a string. It is provided as the 'ip' argument of
+            the HyperFlex API Token Manager functions.
+        endpoints: The candidate HyperFlex Connect, Cluster Management or
+            node IP addresses of the cluster, in order of preference before
+            the first probe. The value must be a list of strings.
+        probe_interval: (Optional) The number of seconds between probes of
+            the endpoints. Providing this argument is optional. The value must
+            be a non-negative number. The value 0 disables the background
+            probes. The default value is 30.
+        probe_timeout: (Optional) The number of seconds after which a probe
+            of an endpoint counts as failed. Providing this argument is
+            optional. The value must be a positive number. The default value
+            is 2.
+
+    Raises:
+        ValueError: There was an invalid argument provided for the endpoints,
+            probe interval or probe timeout settings. A recommendation on how
+            to resolve the error will be displayed.
+    """
+
+    def __init__(self,cluster,endpoints,
+                 probe_interval=DEFAULT_ENDPOINT_PROBE_INTERVAL,
+                 probe_timeout=DEFAULT_ENDPOINT_PROBE_TIMEOUT):
+        # Verify the endpoints argument
+        if (isinstance(endpoints, (str, bytes))
+                or not isinstance(endpoints, collections.abc.Iterable)):
+            raise ValueError("The endpoints are not valid. Please provide a "
+                             "list of IP addresses in string format for the "
+                             "'endpoints' argument.")
+        endpoints = tuple(dict.fromkeys(endpoints))
+        if not endpoints or not all(isinstance(endpoint, str)
+                                    for endpoint in endpoints):
+            raise ValueError("The endpoints are not valid. Please provide a "
+                             "list of IP addresses in string format for the "
+                             "'endpoints' argument.")
+
+        # Verify the probe_interval and probe_timeout arguments
+        if (not isinstance(probe_interval, (int, float))
+                or isinstance(probe_interval, bool) or probe_interval < 0):
+            raise ValueError("The probe interval setting is not valid. Please "
+                             "provide a non-negative number for the "
+                             "'probe_interval' argument.")
+        if (not isinstance(probe_timeout, (int, float))
+                or isinstance(probe_timeout, bool) or probe_timeout <= 0):
+            raise ValueError("The probe timeout setting is not valid. Please "
+                             "provide a positive number for the "
+                             "'probe_timeout' argument.")
+
+        self.cluster = cluster
+        self.endpoints = endpoints
+        self.probe_interval = probe_interval
+        self.probe_timeout = probe_timeout
+        self._endpoint_latencies = dict.fromkeys(endpoints)
+        self._failed_endpoints = set()
+        self._endpoints_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def __repr__(self):
+        return "ClusterEndpoints({!r}, {!r})".format(self.cluster,
+                                                     list(self.endpoints))
+
+    def ranked_endpoints(self):
+        """Returns the endpoints in the order in which requests try them.
+        Healthy endpoints come first, fastest probe latency first, followed
+        by endpoints with an open circuit breaker and then by failed
+        endpoints. Endpoints that have not been probed yet keep their
+        configured order behind the probed healthy endpoints.
+        """
+        with self._endpoints_lock:
+            endpoint_ranks = {
+                endpoint: (endpoint in self._failed_endpoints,
+                           self._endpoint_latencies[endpoint] is None,
+                           self._endpoint_latencies[endpoint] or 0,
+                           endpoint_index)
+                for endpoint_index, endpoint in enumerate(self.endpoints)}
+        with _hx_api_circuit_breakers_lock:
+            open_endpoints = {endpoint for endpoint in self.endpoints
+                              if endpoint in _hx_api_circuit_breakers
+                              and _hx_api_circuit_breakers[endpoint].state
+                              == "open"}
+        return sorted(self.endpoints,
+                      key=lambda endpoint: (endpoint_ranks[endpoint][0],
+                                            endpoint in open_endpoints)
+                      + endpoint_ranks[endpoint][1:])
+
+    def endpoint_status(self):
+        """Returns the probe status of each endpoint as a dictionary keyed by
+        endpoint, with the "healthy" key as a Boolean value and the
+        "latency" key as the smoothed probe latency in seconds, or None if
+        the endpoint has not answered a probe yet.
+        """
+        with self._endpoints_lock:
+            return {endpoint: {"healthy": endpoint
+                               not in self._failed_endpoints,
+                               "latency": self._endpoint_latencies[endpoint]
+                               }
+                    for endpoint in self.endpoints}
+
+    def record_failure(self,endpoint):
+        """Moves an endpoint that failed a request to the back of the ranking
+        until it answers a probe again.
+        """
+        with self._endpoints_lock:
+            self._failed_endpoints.add(endpoint)
+
+    def _record_probe(self,endpoint,probe_latency):
+        """Records the outcome of a probe of an endpoint. The probe latency is
+        smoothed with the previous latency, and the value None marks a failed
+        probe.
+        """
+        with self._endpoints_lock:
+            if probe_latency is None:
+                self._failed_endpoints.add(endpoint)
+                return
+            self._failed_endpoints.discard(endpoint)
+            previous_latency = self._endpoint_latencies[endpoint]
+            self._endpoint_latencies[endpoint] = (
+                probe_latency if previous_latency is None
+                else (previous_latency + probe_latency) / 2)
+
+    def _probe_endpoint(self,endpoint):
+        """Probes the HyperFlex AAA service of an endpoint and records the
+        outcome. The shared keep-alive session of the endpoint is used, so
+        the probe also keeps a connection to the endpoint open.
+        """
+        self._record_probe(endpoint,_probe_aaa_service(endpoint,
+                                                       self.probe_timeout))
+
+    def probe(self):
+        """Probes every endpoint once, in parallel, and updates the ranking.
+        This is called by the background thread and can also be called
+        directly.
+
+        Returns:
+            The probe status of each endpoint. Run
+            'help(ClusterEndpoints.endpoint_status)' for details.
+        """
+        probe_threads = [threading.Thread(target=self._probe_endpoint,
+                                          args=(endpoint,),
+                                          name="hx-api-endpoint-probe",
+                                          daemon=True)
+                         for endpoint in self.endpoints]
+        for probe_thread in probe_threads:
+            probe_thread.start()
+        for probe_thread in probe_threads:
+            probe_thread.join()
+        return self.endpoint_status()
+
+    def _run(self):
+        """Probes the endpoints until the probes are stopped."""
+        while not self._stop_event.is_set():
+            try:
+                self.probe()
+            except Exception as exception_message:
+                logger.error("There was an error probing the endpoints of %s: "
+                             "%s", self.cluster, exception_message)
+            self._stop_event.wait(self.probe_interval)
+
+    def start(self):
+        """Starts the background probe thread, unless the probe interval is
+        0. The thread is a daemon thread, so it does not keep the Python
+        process running on its own.
+        """
+        if not self.probe_interval or (self._thread is not None
+                                       and self._thread.is_alive()):
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run,
+                                        name="hx-api-endpoint-prober",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self,timeout=None):
+        """Stops the background probe thread.
+
+        Args:
+            timeout: (Optional) The maximum number of seconds to wait for the
+                background thread to finish. The default value of None waits
+                until the thread has finished.
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+def set_cluster_endpoints(cluster,endpoints,
+                          probe_interval=DEFAULT_ENDPOINT_PROBE_INTERVAL,
+                          probe_timeout=DEFAULT_ENDPOINT_PROBE_TIMEOUT):
+    r"""This is a function that configures a HyperFlex cluster as a set of
+    candidate addresses with automatic failover. Once configured, the cluster
+    name can be provided as the 'ip' argument of any HyperFlex API Token
+    Manager function, and its requests to the HyperFlex AAA service are sent
+    to the fastest healthy endpoint. If an endpoint cannot be reached, or
+    answers with a retryable HTTP status code, the request is passed on to
+    the next endpoint. Retries following the retry policy are only made on
+    the last endpoint tried. The endpoints are probed in the background, so
+    token operations stay fast while a controller VM is in maintenance.
+
+    Args:
+        cluster: The name under which the HyperFlex cluster is addressed. The
+            value must be a string, for example the Cluster Management IP
+            address or a descriptive name such as "hx-cluster-1".
+        endpoints: The candidate HyperFlex Connect, Cluster Management or
+            node IP addresses of the cluster, in order of preference before
+            the first probe. The value must be a list of strings.
+        probe_interval: (Optional) The number of seconds between probes of
+            the endpoints. Providing this argument is optional. The value must
+            be a non-negative number. The value 0 disables the background
+            probes. The default value is 30.
+        probe_timeout: (Optional) The number of seconds after which a probe
+            of an endpoint counts as failed. Providing this argument is
+            optional. The value must be a positive number. The default value
+            is 2.
+
+    Returns:
+        The ClusterEndpoints object of the HyperFlex cluster, which replaces
+        any previous configuration for the cluster.
+
+    Raises:
+        ValueError: There was an invalid argument provided for the endpoints,
+            probe interval or probe timeout settings. A recommendation on how
+            to resolve the error will be displayed.
+
+    Example:
+        set_cluster_endpoints("hx-cluster-1",
+                              ["192.168.1.10", "192.168.1.11", "192.168.1.12"])
+        obtain_token("hx-cluster-1",username,password)
+    """
+
+    cluster_endpoints = ClusterEndpoints(cluster,endpoints,probe_interval,
+                                         probe_timeout)
+    with _hx_api_cluster_endpoints_lock:
+        previous_cluster_endpoints = _hx_api_cluster_endpoints.get(cluster)
+        _hx_api_cluster_endpoints[cluster] = cluster_endpoints
+    if previous_cluster_endpoints is not None:
+        previous_cluster_endpoints.stop(0)
+    cluster_endpoints.start()
+    return cluster_endpoints
+
+
+def get_cluster_endpoints(cluster):
+    """This is a function that returns the ClusterEndpoints object configured
+    for a HyperFlex cluster with the set_cluster_endpoints() function, or
+    None if the cluster has no endpoints configured.
+    """
+    return _hx_api_cluster_endpoints.get(cluster)
+
+
+def remove_cluster_endpoints(cluster=None):
+    """This is a function that removes the endpoint configuration of a
+    HyperFlex cluster and stops its background probes. Requests for the
+    cluster name are then sent to the name itself as an address again.
+
+    Args:
+        cluster: (Optional) The name of the HyperFlex cluster. Providing this
+            argument is optional. The default value of None removes the
+            configuration of every HyperFlex cluster.
+
+    Returns:
+        The number of endpoint configurations that were removed as an
+        integer.
+    """
+
+    with _hx_api_cluster_endpoints_lock:
+        if cluster is None:
+            removed_cluster_endpoints = list(
+                _hx_api_cluster_endpoints.values())
+            _hx_api_cluster_endpoints.clear()
+        else:
+            removed_cluster_endpoints = [
+                _hx_api_cluster_endpoints.pop(cluster)
+                ] if cluster in _hx_api_cluster_endpoints else []
+    for cluster_endpoints in removed_cluster_endpoints:
+        cluster_endpoints.stop(0)
+    return len(removed_cluster_endpoints)
+
+
+def _endpoint_request_options(cluster,endpoint,request_url,retry_policy,
+                              last_endpoint):
+    """Returns the request URL of an endpoint of a HyperFlex cluster and the
+    retry policy used for it. Only the last endpoint tried is retried, as
+    passing a request on to the next endpoint replaces the retries.
+    """
+    endpoint_request_url = request_url.replace(
+        "https://{}/".format(cluster),"https://{}/".format(endpoint),1)
+    if retry_policy is None:
+        retry_policy = get_retry_policy()
+    if not last_endpoint:
+        retry_policy = RetryPolicy(0,retry_policy.backoff,
+                                   retry_policy.max_backoff,
+                                   retry_policy.status_codes,
+                                   retry_policy.jitter)
+    return endpoint_request_url, retry_policy
+
+
+def _log_endpoint_failover(operation,cluster,endpoint,failure):
+    """Records and logs a request to the HyperFlex AAA service that is passed
+    on to the next endpoint of a cluster.
+    """
+    _record_metric("hx_api_endpoint_failovers_total",
+                   {"ip": cluster, "endpoint": endpoint})
+    logger.warning("The HyperFlex AAA request %s to %s failed at endpoint %s "
+                   "with %s, failing over to the next endpoint...",
+                   operation, cluster, endpoint, failure,
+                   extra={"hx_ip": cluster, "hx_operation": operation})
+
+
+def _send_aaa_request(operation,ip,session,request_url,request_body,
+                      retry_policy=None,timeout=None,deadline_time=None):
+    """Sends a POST request to the HyperFlex AAA service and returns the
+    requests.Response object. If endpoints are configured for the cluster
+    with set_cluster_endpoints(), the request is sent to the highest ranked
+    endpoint and passed on to the next endpoint if it fails. The shared
+    session of the cluster is replaced by the shared session of each
+    endpoint.
+    """
+    cluster_endpoints = _hx_api_cluster_endpoints.get(ip)
+    if cluster_endpoints is None:
+        return _send_endpoint_aaa_request(operation,ip,session,request_url,
+                                          request_body,retry_policy,timeout,
+                                          deadline_time)
+    shared_session = session is _hx_api_sessions.get(ip)
+    ranked_endpoints = cluster_endpoints.ranked_endpoints()
+    for endpoint_index, endpoint in enumerate(ranked_endpoints):
+        last_endpoint = endpoint_index == len(ranked_endpoints) - 1
+        endpoint_request_url, endpoint_retry_policy = (
+            _endpoint_request_options(ip,endpoint,request_url,retry_policy,
+                                      last_endpoint))
+        try:
+            aaa_response = _send_endpoint_aaa_request(
+                operation,endpoint,
+                get_hx_api_session(endpoint) if shared_session else session,
+                endpoint_request_url,request_body,endpoint_retry_policy,
+                timeout,deadline_time)
+        except (requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+                CircuitBreakerOpenError) as exception_message:
+            cluster_endpoints.record_failure(endpoint)
+            if last_endpoint or _is_unanswered_login(
+                    operation,exception_message,
+                    requests.exceptions.ReadTimeout):
+                raise
+            _log_endpoint_failover(operation,ip,endpoint,
+                                   type(exception_message).__name__)
+            continue
+        if (last_endpoint or aaa_response.status_code
+                not in endpoint_retry_policy.status_codes):
+            return aaa_response
+        aaa_response.close()
+        cluster_endpoints.record_failure(endpoint)
+        _log_endpoint_failover(operation,ip,endpoint,
+                               "status {}".format(aaa_response.status_code))
+
+
+async def _async_send_aaa_request(operation,ip,session,request_url,
+                                  request_body,retry_policy=None,
+                                  timeout=None,deadline_time=None):
+    """Sends a POST request to the HyperFlex AAA service with an aiohttp
+    session and returns the aiohttp.ClientResponse object. It is the
+    awaitable counterpart of the _send_aaa_request() function.
+    """
+    import aiohttp
+
+    cluster_endpoints = _hx_api_cluster_endpoints.get(ip)
+    if cluster_endpoints is None:
+        return await _async_send_endpoint_aaa_request(
+            operation,ip,session,request_url,request_body,retry_policy,
+            timeout,deadline_time)
+    shared_session = session is _hx_api_async_sessions.get(
+        (asyncio.get_running_loop(), ip))
+    ranked_endpoints = cluster_endpoints.ranked_endpoints()
+    for endpoint_index, endpoint in enumerate(ranked_endpoints):
+        last_endpoint = endpoint_index == len(ranked_endpoints) - 1
+        endpoint_request_url, endpoint_retry_policy = (
+            _endpoint_request_options(ip,endpoint,request_url,retry_policy,
+                                      last_endpoint))
+        try:
+            aaa_response = await _async_send_endpoint_aaa_request(
+                operation,endpoint,
+                get_async_hx_api_session(endpoint) if shared_session
+                else session,
+                endpoint_request_url,request_body,endpoint_retry_policy,
+                timeout,deadline_time)
+        except DeadlineExceededError:
+            # asyncio.TimeoutError also matches an exceeded deadline
+            raise
+        except (aiohttp.ClientConnectionError,
+                asyncio.TimeoutError,
+                CircuitBreakerOpenError) as exception_message:
+            cluster_endpoints.record_failure(endpoint)
+            if last_endpoint or _is_unanswered_login(
+                    operation,exception_message,
+                    _async_read_timeout_errors()):
+                raise
+            _log_endpoint_failover(operation,ip,endpoint,
+                                   type(exception_message).__name__)
+            continue
+        if (last_endpoint or aaa_response.status
+                not in endpoint_retry_policy.status_codes):
+            return aaa_response
+        aaa_response.release()
+        cluster_endpoints.record_failure(endpoint)
+        _log_endpoint_failover(operation,ip,endpoint,
+                               "status {}".format(aaa_response.status))
+
+
+def _record_metric(metric_name,metric_labels,value=1):
+    """Adds a value to a counter metric, or records an observation in a
+    histogram metric, for the given labels.
+    """
+    metric_key = (metric_name, tuple(sorted(metric_labels.items())))
+    with _hx_api_metrics_lock:
+        if _HX_API_METRICS[metric_name][0] == "counter":
+            _hx_api_metrics[metric_key] = (_hx_api_metrics.get(metric_key, 0)
+                                           + value)
+            return
+        histogram = _hx_api_metrics.get(metric_key)
+        if histogram is None:
+            histogram = _hx_api_metrics[metric_key] = [
+                [0] * len(DEFAULT_METRICS_LATENCY_BUCKETS), 0.0, 0]
+        for bucket_index, bucket_bound in enumerate(
+                DEFAULT_METRICS_LATENCY_BUCKETS):
+            if value <= bucket_bound:
+                histogram[0][bucket_index] += 1
+        histogram[1] += value
+        histogram[2] += 1
+
+
+def _record_aaa_request(operation,ip,request_start_time,request_status):
+    """Records the latency and outcome of a request to the HyperFlex AAA
+    service. The status is the HTTP status code, or "error" if no response
+    was received.
+    """
+    request_duration = time.perf_counter() - request_start_time
+    _record_metric("hx_api_aaa_request_duration_seconds",
+                   {"operation": operation, "ip": ip},
+                   request_duration)
+    _record_metric("hx_api_aaa_requests_total",
+                   {"operation": operation, "ip": ip,
+                    "status": str(request_status)})
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("HyperFlex AAA request %s to %s completed with status "
+                     "%s in %.3f seconds.",
+                     operation, ip, request_status, request_duration,
+                     extra={"hx_ip": ip,
+                            "hx_operation": operation,
+                            "hx_status": request_status,
+                            "hx_duration": request_duration})
+
+
+def _record_manage_token_file_phase(ip,phase,phase_start_time):
+    """Records the duration of a phase of the manage_token_file() function."""
+    _record_metric("hx_api_token_manage_phase_duration_seconds",
+                   {"ip": ip, "phase": phase},
+                   time.perf_counter() - phase_start_time)
+
+
+def _record_manage_token_file_result(ip,result,manage_start_time):
+    """Records the result and total duration of a manage_token_file() call.
+    The result is one of "cache_hit", "validated", "renewed", "created",
+    "not_renewed", "unvalidated", "unavailable" or "failed".
+    """
+    _record_manage_token_file_phase(ip,"total",manage_start_time)
+    _record_metric("hx_api_token_manage_results_total",
+                   {"ip": ip, "result": result})
+    if logger.isEnabledFor(logging.DEBUG):
+        manage_duration = time.perf_counter() - manage_start_time
+        logger.debug("HyperFlex API token file management for %s completed "
+                     "with result %s in %.3f seconds.",
+                     ip, result, manage_duration,
+                     extra={"hx_ip": ip,
+                            "hx_operation": "manage_token_file",
+                            "hx_result": result,
+                            "hx_duration": manage_duration})
+
+
+def get_metrics():
+    """This is a function that returns the latency and outcome metrics
+    recorded by the HyperFlex API Token Manager in the current process.
+
+    Returns:
+        A dictionary keyed by metric name. Each value is a list with one
+        dictionary for each set of labels. Counter entries contain the
+        "labels" and "value" keys. Histogram entries contain the "labels",
+        "buckets" (the cumulative count for each upper bound in seconds),
+        "sum" and "count" keys.
+    """
+
+    with _hx_api_metrics_lock:
+        metric_items = [(metric_key, value if not isinstance(value, list)
+                         else [list(value[0]), value[1], value[2]])
+                        for metric_key, value in _hx_api_metrics.items()]
+    metrics = {metric_name: [] for metric_name in _HX_API_METRICS}
+    for (metric_name, metric_labels), value in sorted(metric_items):
+        if _HX_API_METRICS[metric_name][0] == "counter":
+            metrics[metric_name].append({"labels": dict(metric_labels),
+                                         "value": value})
+        else:
+            metrics[metric_name].append(
+                {"labels": dict(metric_labels),
+                 "buckets": dict(zip(DEFAULT_METRICS_LATENCY_BUCKETS,
+                                     value[0])),
+                 "sum": value[1],
+                 "count": value[2]
+                 })
+    return metrics
+
+
+def reset_metrics():
+    """This is a function that clears all metrics recorded by the HyperFlex
+    API Token Manager in the current process.
+    """
+
+    with _hx_api_metrics_lock:
+        _hx_api_metrics.clear()
+
+
+def _format_prometheus_labels(metric_labels):
+    """Formats metric labels in the Prometheus text exposition format."""
+    if not metric_labels:
+        return ""
+    return "{" + ",".join(
+        '{}="{}"'.format(label_name,
+                         str(label_value).replace("\\", "\\\\")
+                         .replace('"', '\\"').replace("\n", "\\n"))
+        for label_name, label_value in metric_labels.items()) + "}"
+
+
+def render_prometheus_metrics():
+    """This is a function that returns the metrics recorded by the HyperFlex
+    API Token Manager in the Prometheus text exposition format.
+
+    Returns:
+        A string in the Prometheus text exposition format, version 0.0.4.
+    """
+
+    metric_lines = []
+    for metric_name, metric_entries in get_metrics().items():
+        metric_type, metric_help = _HX_API_METRICS[metric_name]
+        metric_lines.append("# HELP {} {}".format(metric_name, metric_help))
+        metric_lines.append("# TYPE {} {}".format(metric_name, metric_type))
+        for metric_entry in metric_entries:
+            metric_labels = metric_entry["labels"]
+            if metric_type == "counter":
+                metric_lines.append("{}{} {}".format(
+                    metric_name, _format_prometheus_labels(metric_labels),
+                    metric_entry["value"]))
+                continue
+            for bucket_bound, bucket_count in metric_entry["buckets"].items():
+                bucket_labels = dict(metric_labels, le=repr(float(bucket_bound)))
+                metric_lines.append("{}_bucket{} {}".format(
+                    metric_name, _format_prometheus_labels(bucket_labels),
+                    bucket_count))
+            metric_lines.append("{}_bucket{} {}".format(
+                metric_name,
+                _format_prometheus_labels(dict(metric_labels, le="+Inf")),
+                metric_entry["count"]))
+            metric_lines.append("{}_sum{} {}".format(
+                metric_name, _format_prometheus_labels(metric_labels),
+                repr(metric_entry["sum"])))
+            metric_lines.append("{}_count{} {}".format(
+                metric_name, _format_prometheus_labels(metric_labels),
+                metric_entry["count"]))
+    return "\n".join(metric_lines) + "\n"
+
+
+class _PrometheusMetricsRequestHandlerMixin:
+    """Serves the HyperFlex API Token Manager metrics on the /metrics path
+    when combined with http.server.BaseHTTPRequestHandler.
+    """
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        metrics_data = render_prometheus_metrics().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type",
+                         "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(metrics_data)))
+        self.end_headers()
+        self.wfile.write(metrics_data)
+
+    def log_message(self,format,*args):
+        pass
+
+
+def start_metrics_server(port=DEFAULT_METRICS_PORT,address="127.0.0.1"):
+    """This is a function that serves the HyperFlex API Token Manager metrics
+    over HTTP in the Prometheus text exposition format on the /metrics path.
+    The server runs in a daemon thread.
+
+    Args:
+        port: (Optional) The TCP port of the metrics endpoint. Providing this
+            argument is optional. The value must be an integer. The default
+            value is 9464.
+        address: (Optional) The IP address the metrics endpoint listens on.
+            Providing this argument is optional. The value must be a string.
+            The default value is "127.0.0.1", which only accepts local
+            connections. Use "0.0.0.0" to accept remote connections.
+
+    Returns:
+        The http.server.ThreadingHTTPServer object of the metrics endpoint.
+        Call its shutdown() method to stop the endpoint.
+    """
+
+    class _PrometheusMetricsRequestHandler(
+            _PrometheusMetricsRequestHandlerMixin,
+            http.server.BaseHTTPRequestHandler):
+        pass
+
+    metrics_server = http.server.ThreadingHTTPServer(
+        (address, port),_PrometheusMetricsRequestHandler)
+    metrics_server.daemon_threads = True
+    threading.Thread(target=metrics_server.serve_forever,
+                     name="hx-api-metrics",
+                     daemon=True).start()
+    logger.info("The HyperFlex API Token Manager metrics are available at "
+                "http://%s:%s/metrics.", address, metrics_server.server_port)
+    return metrics_server
+
+
+def obtain_token(ip,username,password,session=None,retry_policy=None,timeout=None,
+                 deadline=None):
+    """This is a function that obtains a HyperFlex API access token.
+    A HyperFlex API access token authorizes API operations on a HyperFlex
+    cluster.
+
+    Args:
+        ip: The targeted HyperFlex Connect or Cluster Management IP address.
+            The value must be a string.
+        username: The username credentials that will be used to log into
+            HyperFlex. The value must be a string.
+        password: The password credentials that will be used to log into
+            HyperFlex. The value must be a string.
+        session: (Optional) A requests.Session object used to send the
+            request to the HyperFlex AAA service. Providing this argument is
+            optional. If no session is provided, the shared keep-alive session
+            for the IP address from get_hx_api_session() is used.
+        retry_policy: (Optional) A RetryPolicy object that sets how
+            transient failures are retried. Providing this argument is
+            optional. If no retry policy is provided, the policy from
+            get_retry_policy() is used.
+        timeout: (Optional) The connect and read timeouts in seconds of
+            each request. Providing this argument is optional. The value
+            must be a number or a tuple of two numbers. If no timeout is
+            provided, the module settings DEFAULT_CONNECT_TIMEOUT and
+            DEFAULT_READ_TIMEOUT are used, which have default values of 5
+            and 30.
+        deadline: (Optional) The maximum number of seconds the function
+            may take, including retries. Providing this argument is
+            optional. The value must be a positive number. The timeouts
+            of each request are shortened to the time left, and no retry
+            is started that could not finish in time. The default value
+            of None sets no deadline.
+
+    Returns:
+        A HyperFlex API access token, refresh token and token type that have
+        been granted as key-value pairs in a dictionary.
+
+    Raises:
+        Exception: There was an error obtaining a HyperFlex API access token.
+            The status code or error message will be specified.
+        ValueError: There was an invalid argument provided for the timeout
+            or deadline settings. A recommendation on how to resolve the
+            error will be displayed.
+    """
+
+    # Verify the timeout and deadline arguments
+    timeout = _verify_timeout_arguments(timeout,deadline)
+    deadline_time = _deadline_time(deadline)
+
+    # Set the HTTP session
+    if session is None:
+        session = get_hx_api_session(ip)
+    # Set the Request URL
+    request_url = "https://{}/aaa/v1/auth?grant_type=password".format(ip)
+    # Set the POST body
+    post_body = {
+        "username": username,
+        "password": password,
+        "client_id": "HxGuiClient",
+        "client_secret": "Sunnyvale",
+        "redirect_uri": "http://localhost:8080/aaa/redirect"
+        }
+
+    try:
+        logger.debug("Attempting to obtain a HyperFlex API access token...")
+        # Send the POST request, retrying transient failures
+        obtain_hx_api_token = _send_aaa_request("obtain_token",ip,session,
+                                                request_url,post_body,
+                                                retry_policy,timeout,
+                                                deadline_time)
+        # Handle POST request response
+        if obtain_hx_api_token.status_code == 201:
+            hx_api_token = obtain_hx_api_token.json()
+            _register_issued_token(ip,hx_api_token)
+            logger.info("A HyperFlex API access token was successfully "
+                        "obtained.")
+            return hx_api_token
+        else:
+            logger.error("There was an error obtaining a HyperFlex API "
+                         "access token: Status Code: %s, %s",
+                         obtain_hx_api_token.status_code,
+                         obtain_hx_api_token.text)
+            return
+    except Exception as exception_message:
+        logger.error("There was an error obtaining a HyperFlex API access "
+                     "token: %s", exception_message)
+        return
+
+
+def refresh_token(ip,hx_api_token,session=None,retry_policy=None,timeout=None,
+                  deadline=None):
+    """This is a function that refreshes or renews a HyperFlex API access
+    token. A new HyperFlex API access token is obtained without the need to
+    provide username and password credentials.
+
+    Args:
+        ip: The targeted HyperFlex Connect or Cluster Management IP address.
+            The value must be a string.
+        hx_api_token: A dictionary value for a granted HyperFlex AAA token
+            containing the following keys:
+            1. "access_token": An access token obtained from the HyperFlex API
+                AAA (Authorization, Accounting and Authentication). The
+                access token is used to authorize API operations by properly
+                authenticated users.
+            2. "refresh_token": A refresh token obtained from the HyperFlex API
+                AAA (Authorization, Accounting and Authentication). The
+                refresh token can be used to obtain a new access token without
+                the need to re-provide HyperFlex username and password
+                credentials.
+            3. "token_type": A token type obtained from the HyperFlex API
+                AAA (Authorization, Accounting and Authentication). The
+                token type value is "Bearer".
+        session: (Optional) A requests.Session object used to send the
+            request to the HyperFlex AAA service. Providing this argument is
+            optional. If no session is provided, the shared keep-alive session
+            for the IP address from get_hx_api_session() is used.
+        retry_policy: (Optional) A RetryPolicy object that sets how
+            transient failures are retried. Providing this argument is
+            optional. If no retry policy is provided, the policy from
+            get_retry_policy() is used.
+        timeout: (Optional) The connect and read timeouts in seconds of
+            each request. Providing this argument is optional. The value
+            must be a number or a tuple of two numbers. If no timeout is
+            provided, the module settings DEFAULT_CONNECT_TIMEOUT and
+            DEFAULT_READ_TIMEOUT are used, which have default values of 5
+            and 30.
+        deadline: (Optional) The maximum number of seconds the function
+            may take, including retries. Providing this argument is
+            optional. The value must be a positive number. The timeouts
+            of each request are shortened to the time left, and no retry
+            is started that could not finish in time. The default value
+            of None sets no deadline.
+
+    Returns:
+        A HyperFlex API access token, refresh token and token type that have
+        been granted as key-value pairs in a dictionary.
+
+    Raises:
+        Exception: There was an error refreshing the HyperFlex API access
+            token. The status code or error message will be specified.
+        ValueError: There was an invalid argument provided for the HyperFlex
+            API token, timeout or deadline settings. A recommendation on how
+            to resolve the error will be displayed.
+    """
+
+    # Verify the hx_api_token argument
+    if not isinstance(hx_api_token, collections.abc.Mapping):
+        raise ValueError("The argument provided for the HyperFlex API token "
+                         "is not valid. Please provide a valid dictionary "
+                         "for the 'hx_api_token' argument.")
+    
+    # Verify the timeout and deadline arguments
+    timeout = _verify_timeout_arguments(timeout,deadline)
+    deadline_time = _deadline_time(deadline)
+
+    try:
+        return _refresh_token(ip,hx_api_token,session,retry_policy,timeout,
+                              deadline_time)
+    except Exception as exception_message:
+        logger.error("There was an error refreshing the HyperFlex API access "
+                     "token: %s", exception_message)
+        return
+
+
+def _refresh_token(ip,hx_api_token,session,retry_policy,timeout,
+                   deadline_time):
+    """Sends a refresh request for a HyperFlex API token to the HyperFlex
+    AAA service. See the refresh_token() function for details.
+
+    Returns:
+        The refreshed HyperFlex API token as a dictionary. The value None is
+        returned if the HyperFlex AAA service rejected the refresh.
+
+    Raises:
+        The exceptions listed by the _aaa_outage_errors() function if the
+        HyperFlex AAA service is unavailable, so the caller can tell an
+        outage apart from a rejected refresh token.
+    """
+
+    # Set the HTTP session
+    if session is None:
+        session = get_hx_api_session(ip)
+    # Set the Request URL
+    request_url = "https://{}/aaa/v1/token?grant_type=refresh".format(ip)
+    # Set the POST body
+    post_body = {
+        "access_token": hx_api_token["access_token"],
+        "refresh_token": hx_api_token["refresh_token"],
+        "token_type": hx_api_token["token_type"]
+        }
+
+    logger.debug("Attempting to refresh the HyperFlex API access token...")
+    # Send the POST request, retrying transient failures
+    refresh_hx_api_token = _send_aaa_request("refresh_token",ip,session,
+                                             request_url,post_body,
+                                             retry_policy,timeout,
+                                             deadline_time)
+    # Handle POST request response
+    if refresh_hx_api_token.status_code == 201:
+        refreshed_hx_api_token = refresh_hx_api_token.json()
+        _register_issued_token(ip,hx_api_token,refreshed_hx_api_token)
+        logger.info("The HyperFlex API access token was successfully "
+                    "refreshed.")
+        return refreshed_hx_api_token
+    if _is_aaa_outage_status(refresh_hx_api_token.status_code):
+        refresh_hx_api_token.raise_for_status()
+    logger.error("There was an error refreshing the HyperFlex API access "
+                 "token: Status Code: %s, %s",
+                 refresh_hx_api_token.status_code,
+                 refresh_hx_api_token.text)
+    return
+
+
+def validate_token(ip,hx_api_token,scope="READ",session=None,
+                   retry_policy=None,timeout=None,deadline=None,
+                   offline_validation=False):
+    """This is a function that validates a HyperFlex API access token.
+    A newly issued HyperFlex API access token is valid for 18 days from the
+    point of creation. The validate_token() function can be used to check if
+    an issued HyperFlex API access token is still valid.
+
+    Args:
+        ip: The targeted HyperFlex Connect or Cluster Management IP address.
+            The value must be a string.
+        hx_api_token: A dictionary value for a granted HyperFlex AAA token
+            containing the following keys:
+            1. "access_token": An access token obtained from the HyperFlex API
+                AAA (Authorization, Accounting and Authentication). The access
+                token is used to authorize API operations by properly
+                authenticated users.
+            2. "refresh_token": A refresh token obtained from the HyperFlex API
+                AAA (Authorization, Accounting and Authentication). The
+                refresh token can be used to obtain a new access token without
+                the need to re-provide HyperFlex username and password
+                credentials.
+            3. "token_type": A token type obtained from the HyperFlex API
+                AAA (Authorization, Accounting and Authentication). The
+                token type value is "Bearer".
+        scope: (Optional) The scope of the validate access token operation.
+            Providing this argument is optional. The value must be a string.
+            The options are "READ" or "MODIFY". The default value is "READ".
+        session: (Optional) A requests.Session object used to send the
+            request to the HyperFlex AAA service. Providing this argument is
+            optional. If no session is provided, the shared keep-alive session
+            for the IP address from get_hx_api_session() is used.
+        retry_policy: (Optional) A RetryPolicy object that sets how
+            transient failures are retried. Providing this argument is
+            optional. If no retry policy is provided, the policy from
+            get_retry_policy() is used.
+        timeout: (Optional) The connect and read timeouts in seconds of
+            each request. Providing this argument is optional. The value
+            must be a number or a tuple of two numbers. If no timeout is
+            provided, the module settings DEFAULT_CONNECT_TIMEOUT and
+            DEFAULT_READ_TIMEOUT are used, which have default values of 5
+            and 30.
+        deadline: (Optional) The maximum number of seconds the function
+            may take, including retries. Providing this argument is
+            optional. The value must be a positive number. The timeouts
+            of each request are shortened to the time left, and no retry
+            is started that could not finish in time. The default value
+            of None sets no deadline.
+        offline_validation: (Optional) The option to validate an access
+            token issued as a JSON Web Token from its expiry claims,
+            without a request to the HyperFlex AAA service. Providing
+            this argument is optional. A "READ" scope token whose "exp"
+            claim is more than DEFAULT_TOKEN_EXPIRY_MARGIN seconds (300
+            by default) in the future is reported as valid. Tokens
+            without expiry claims, near their expiry or validated for the
+            "MODIFY" scope are validated by the HyperFlex AAA service. A
+            revoked token is not detected offline. The default value is
+            False.
+
+    Returns:
+        The Boolean value True is returned for a successful validation. The
+        Boolean value False is returned if the HyperFlex AAA service rejects
+        the access token, or if the access token could not be validated
+        because the HyperFlex AAA service is unavailable or the deadline
+        passed.
+
+    Raises:
+        ValueError: There was an invalid argument provided for the HyperFlex
+            API token, desired scope operation, timeout or deadline settings.
+            A recommendation on how to resolve the error will be displayed.
+    """
+
+    # Verify the hx_api_token argument
+    if not isinstance(hx_api_token, collections.abc.Mapping):
+        raise ValueError("The argument provided for the HyperFlex API token "
+                         "is not valid. Please provide a valid dictionary "
+                         "for the 'hx_api_token' argument.")
+
+    # Verify the scope argument
+    if scope not in ("READ", "MODIFY"):
+        raise ValueError("The argument provided for the scope operation is "
+                         "not valid. Please provide either the value 'READ' "
+                         "or 'MODIFY' in string format for the 'scope' "
+                         "argument.")
+    
+    # Verify the timeout and deadline arguments
+    timeout = _verify_timeout_arguments(timeout,deadline)
+    deadline_time = _deadline_time(deadline)
+
+    try:
+        return _validate_token(ip,hx_api_token,scope,session,retry_policy,
+                               timeout,deadline_time,offline_validation)
+    except (DeadlineExceededError,) + _aaa_outage_errors():
+        # The error has been logged. An unavailable HyperFlex AAA service is
+        # only raised to the manage_token_file() function
+        return False
+
+
+def _validate_token(ip,hx_api_token,scope,session,retry_policy,timeout,
+                    deadline_time,offline_validation):
+    """Validates a HyperFlex API access token. See the validate_token()
+    function for details.
+
+    Returns:
+        The Boolean value True is returned for a successful validation. The
+        Boolean value False is returned if the HyperFlex AAA service rejects
+        the access token.
+
+    Raises:
+        DeadlineExceededError: The deadline passed before the access token
+            could be validated.
+        The exceptions listed by the _aaa_outage_errors() function if the
+        HyperFlex AAA service is unavailable, so the caller can tell an
+        outage apart from a rejected access token.
+    """
+
+    # Validate the access token offline from its expiry claims
+    if offline_validation and scope == "READ":
+        if _check_token_claims(hx_api_token["access_token"]):
+            _record_metric("hx_api_token_offline_validations_total",
+                           {"ip": ip, "result": "valid"})
+            logger.debug("The HyperFlex API access token was validated "
+                         "offline from its expiry claims.")
+            return True
+        _record_metric("hx_api_token_offline_validations_total",
+                       {"ip": ip, "result": "fallback"})
+
+    # Set the HTTP session
+    if session is None:
+        session = get_hx_api_session(ip)
+    # Set the Request URL
+    request_url = "https://{}/aaa/v1/validate".format(ip)
+    # Set the POST body
+    post_body = {
+        "access_token": hx_api_token["access_token"],
+        "scope": scope,
+        "token_type": hx_api_token["token_type"]
+        }
+
+    try:
+        logger.debug("Attempting to validate the HyperFlex API access "
+                     "token...")
+        # Send the POST request, retrying transient failures
+        validate_hx_api_token = _send_aaa_request("validate_token",ip,session,
+                                                  request_url,post_body,
+                                                  retry_policy,timeout,
+                                                  deadline_time)
+        # Handle POST request response
+        if validate_hx_api_token.status_code == 200:
+            logger.debug("The HyperFlex API access token was successfully "
+                         "validated.")
+            return True
+        elif _is_aaa_outage_status(validate_hx_api_token.status_code):
+            validate_hx_api_token.raise_for_status()
+        else:
+            logger.error("There was an error validating the HyperFlex API "
+                         "access token: Status Code: %s, %s",
+                         validate_hx_api_token.status_code,
+                         validate_hx_api_token.text)
+            return False
+    except DeadlineExceededError:
+        logger.error("The HyperFlex API access token could not be validated "
+                     "before the deadline passed.")
+        raise
+    except _aaa_outage_errors() as exception_message:
+        # An unavailable HyperFlex AAA service says nothing about the token
+        logger.error("The HyperFlex API access token could not be validated "
+                     "because the HyperFlex AAA service is unavailable: %s",
+                     exception_message)
+        raise
+    except Exception as exception_message:
+        logger.error("There was an error validating the HyperFlex API access "
+                     "token: %s", exception_message)
+        return False
+
+
+def revoke_token(ip,hx_api_token,session=None,retry_policy=None,timeout=None,
+                 deadline=None):
+    """This is a function that revokes a HyperFlex API access token.
+    A newly issued HyperFlex API access token is valid for 18 days from the
+    point of creation. The revoke_token() function can be used to revoke a
+    previously issued HyperFlex API access token for any reason (e.g. security,
+    etc.).
+
+    Args:
+        ip: The targeted HyperFlex Connect or Cluster Management IP address.
+            The value must be a string.
+        hx_api_token: A dictionary value for a granted HyperFlex AAA token
+            containing the following keys:
+            1. "access_token": An access token obtained from the HyperFlex API
+                AAA (Authorization, Accounting and Authentication). The
+                access token is used to authorize API operations by properly
+                authenticated users.
+            2. "refresh_token": A refresh token obtained from the HyperFlex API
+                AAA (Authorization, Accounting and Authentication). The
+                refresh token can be used to obtain a new access token without
+                the need to re-provide HyperFlex username and password
+                credentials.
+            3. "token_type": A token type obtained from the HyperFlex API
+                AAA (Authorization, Accounting and Authentication). The
+                token type value is "Bearer".
+        session: (Optional) A requests.Session object used to send the
+            request to the HyperFlex AAA service. Providing this argument is
+            optional. If no session is provided, the shared keep-alive session
+            for the IP address from get_hx_api_session() is used.
+        retry_policy: (Optional) A RetryPolicy object that sets how
+            transient failures are retried. Providing this argument is
+            optional. If no retry policy is provided, the policy from
+            get_retry_policy() is used.
+        timeout: (Optional) The connect and read timeouts in seconds of
+            each request. Providing this argument is optional. The value
+            must be a number or a tuple of two numbers. If no timeout is
+            provided, the module settings DEFAULT_CONNECT_TIMEOUT and
+            DEFAULT_READ_TIMEOUT are used, which have default values of 5
+            and 30.
+        deadline: (Optional) The maximum number of seconds the function
+            may take, including retries. Providing this argument is
+            optional. The value must be a positive number. The timeouts
+            of each request are shortened to the time left, and no retry
+            is started that could not finish in time. The default value
+            of None sets no deadline.
+
+    Returns:
+        The Boolean value True is returned for a successful revocation. The
+        Boolean value False is returned if the revocation fails.
+
+    Raises:
+        Exception: There was an error performing the revocation of the
+            HyperFlex API access token. The status code or error message will
+            be specified.
+        ValueError: There was an invalid argument provided for the HyperFlex
+            API token, timeout or deadline settings. A recommendation on how
+            to resolve the error will be displayed.
+    """
+
+    # Verify the hx_api_token argument
+    if not isinstance(hx_api_token, collections.abc.Mapping):
+        raise ValueError("The argument provided for the HyperFlex API token "
+                         "is not valid. Please provide a valid dictionary "
+                         "for the 'hx_api_token' argument.")
+
+    # Verify the timeout and deadline arguments
+    timeout = _verify_timeout_arguments(timeout,deadline)
+    deadline_time = _deadline_time(deadline)
+
+    # Set the HTTP session
+    if session is None:
+        session = get_hx_api_session(ip)
+    # Set the Request URL
+    request_url = "https://{}/aaa/v1/revoke".format(ip)
+    # Set the POST body
+    post_body = {
+        "access_token": hx_api_token["access_token"],
+        "refresh_token": hx_api_token["refresh_token"],
+        "token_type": hx_api_token["token_type"]
+        }
+
+    try:
+        logger.debug("Attempting to revoke the HyperFlex API access token...")
+        # Send the POST request, retrying transient failures
+        revoke_hx_api_token = _send_aaa_request("revoke_token",ip,session,
+                                                request_url,post_body,
+                                                retry_policy,timeout,
+                                                deadline_time)
+        # Handle POST request response
+        if revoke_hx_api_token.status_code == 200:
+            _unregister_issued_token(ip,hx_api_token)
+            logger.info("The HyperFlex API access token was successfully "
+                        "revoked.")
+            return True
+        else:
+            logger.error("There was an error revoking the HyperFlex API "
+                         "access token: Status Code: %s, %s",
+                         revoke_hx_api_token.status_code,
+                         revoke_hx_api_token.text)
+            return False
+    except Exception as exception_message:
+        logger.error("There was an error revoking the HyperFlex API access "
+                     "token: %s", exception_message)
+        return False
+
+
+def create_token_file(ip,username,password,file_path,overwrite=True,
+                      session=None,file_format=None,timeout=None,
+                      deadline=None):
+    r"""This is a function that creates a token file containing a newly issued
+    HyperFlex API token.
+
+    Args:
+        ip: The targeted HyperFlex Connect or Cluster Management IP address.
+            The value must be a string.
+        username: The username credentials that will be used to log into
+            HyperFlex. The value must be a string.
+        password: The password credentials that will be used to log into
+            HyperFlex. The value must be a string.
+        file_path: The file name and storage location to write a HyperFlex API
+            token file. The value must be a string. An example value is
+            "c:\\folder\\file.xml". A SQLiteTokenStore object can also be
+            provided to keep the token in a SQLite token store instead.
+        overwrite: (Optional) The option to overwrite any pre-existing file at
+            the provided file path value given to the 'file_path' argument.
+            Providing this argument is optional. If the argument is set to the
+            Boolean value True, any pre-existing token file will be
+            automatically overwritten. If the argument is set to the Boolean
+            value False, the create_token_file() function will stop and not
+            proceed with creating a new token file if a pre-existing token
+            file is already in place at the given file path location. The
+            default value is True.
+        session: (Optional) A requests.Session object used to send the
+            request to the HyperFlex AAA service. Providing this argument is
+            optional. If no session is provided, the shared keep-alive session
+            for the IP address from get_hx_api_session() is used.
+        file_format: (Optional) The format of the HyperFlex API token file.
+            Providing this argument is optional. The value must be a string.
+            The options are "xml" or "json". The "json" option writes a
+            compact JSON token file that loads faster than XML. The
+            load_token_file() function detects the format automatically. The
+            default value of None keeps the format of a pre-existing token
+            file, and otherwise uses JSON if the file name ends with ".json"
+            and XML for any other file name.
+        timeout: (Optional) The connect and read timeouts in seconds of
+            each request to the HyperFlex AAA service. Providing this
+            argument is optional. Run 'help(obtain_token)' for details.
+        deadline: (Optional) The maximum number of seconds the function
+            may take. Providing this argument is optional. The value must
+            be a positive number. The default value of None sets no
+            deadline.
+
+    Returns:
+        The file path of the new HyperFlex API token file is returned if
+        creation was successful. The token file is written in XML or JSON
+        format, as chosen by the 'file_format' argument. If a SQLiteTokenStore
+        object was provided, the SQLiteTokenStoreEntry of the stored token
+        is returned instead. The value None is returned if creating a
+        HyperFlex API token file failed.
+
+    Raises:
+        Exception: An exception occurred while creating a HyperFlex API token
+            file. The exact error will be specified.
+        ValueError: There was an invalid argument provided for the overwrite,
+            file format, timeout or deadline settings. A recommendation on how
+            to resolve the error will be displayed.
+    """
+
+    # Verify the overwrite argument
+    if not isinstance(overwrite, bool):
+        raise ValueError("The overwrite setting is not valid. Please provide "
+                         "a Boolean value of True or False for the "
+                         "'overwrite' argument.")
+
+    # Verify the file_format argument
+    _verify_token_file_format(file_format)
+    
+    # Resolve a token store to the entry for the IP address and username
+    file_path = _resolve_token_location(ip,username,file_path)
+    # Start the HyperFlex API token file creation process
+    logger.debug("Starting the HyperFlex API token file creation process...")
+    # Check the overwrite argument setting
+    if not overwrite:
+        # Check for the presence of a pre-existing HyperFlex API token file
+        if _token_file_exists(file_path):
+            logger.info("A HyperFlex API token file already exists at the "
+                        "given file path location. No changes have been "
+                        "made. To overwrite the pre-existing file, set the "
+                        "'overwrite' argument to the Boolean value True.")
+            return
+    # Obtain a new HyperFlex API token
+    hx_api_token = obtain_token(ip,username,password,session=session,
+                                timeout=timeout,deadline=deadline)
+    # Write the new HyperFlex API token file
+    return _write_token_file(hx_api_token,file_path,"login",file_format)
+
+
+def _new_token_file_record(hx_api_token,renewal_method):
+    """Returns the data stored for a newly granted HyperFlex API token as a
+    dictionary with the same keys as the data options of load_token_file().
+    """
+    return {"access_token": hx_api_token["access_token"],
+            "refresh_token": hx_api_token["refresh_token"],
+            "token_type": hx_api_token["token_type"],
+            "human_readable_time": datetime.datetime.utcnow().strftime(
+                "%A, %B %d, %Y at %I:%M:%S %p UTC"),
+            "unix_timestamp_time": str(_current_unix_timestamp()),
+            "source_module": __file__ if __file__ else "N/A",
+            "renewal_method": renewal_method
+            }
+
+
+def _write_token_file(hx_api_token,file_path,renewal_method,file_format=None):
+    """Writes a granted HyperFlex API token to a token file or to a
+    SQLiteTokenStoreEntry.
+
+    Returns:
+        The file path of the HyperFlex API token file if writing was
+        successful. The value None is returned if writing failed or no
+        HyperFlex API token was granted.
+    """
+    if not hx_api_token:
+        logger.error("No HyperFlex API token was granted, so the HyperFlex "
+                     "API token file at %s has not been written.", file_path)
+        return
+    hx_api_token_file_record = _new_token_file_record(hx_api_token,
+                                                      renewal_method)
+    return _write_token_file_record(hx_api_token_file_record,file_path,
+                                    file_format)
+
+
+def _resolve_token_file_format(file_path,file_format):
+    """Returns the format used to write a HyperFlex API token file. If no
+    format is given, a pre-existing token file keeps its format and a new
+    token file uses JSON if the file name ends with ".json", otherwise XML.
+    """
+    if file_format is not None:
+        return file_format
+    try:
+        with open(file_path, "rb") as hx_api_token_file:
+            if hx_api_token_file.read(64).lstrip().startswith(b"{"):
+                return "json"
+            return "xml"
+    except OSError:
+        pass
+    if str(file_path).lower().endswith(".json"):
+        return "json"
+    return "xml"
+
+
+def _verify_token_file_format(file_format):
+    """Raises a ValueError if the file format setting is not valid."""
+    if file_format not in (None, "xml", "json"):
+        raise ValueError("The file format setting is not valid. Please "
+                         "provide either the value 'xml' or 'json' in string "
+                         "format for the 'file_format' argument.")
+
+
+def _write_token_file_record(hx_api_token_file_record,file_path,
+                             file_format=None):
+    """Writes the data of a HyperFlex API token to a token file in XML or
+    JSON format, or to a SQLiteTokenStoreEntry.
+
+    Returns:
+        The file path of the HyperFlex API token file if writing was
+        successful. The value None is returned if writing failed.
+    """
+    try:
+        if isinstance(file_path, SQLiteTokenStoreEntry):
+            # Store the HyperFlex API token in the SQLite token store
+            file_path.store._save_record(file_path.ip,file_path.username,
+                                         hx_api_token_file_record)
+            logger.info("A HyperFlex API token has been stored in %s.",
+                        file_path)
+            return file_path
+        if _resolve_token_file_format(file_path,file_format) == "json":
+            # Serialize the HyperFlex API token data as compact JSON
+            hx_api_token_json_data = json.dumps(
+                hx_api_token_file_record,separators=(",", ":")
+                ).encode("utf-8")
+            _replace_file_atomically(
+                file_path,
+                lambda hx_api_token_file: hx_api_token_file.write(
+                    hx_api_token_json_data)
+                )
+            logger.info("A HyperFlex API token file has been created at %s.",
+                        file_path)
+            return file_path
+        # Establish XML file tree nodes
+        hx_api_token_xml_data = et.Element("hx_api_token")
+        token_xml_data = et.SubElement(hx_api_token_xml_data, "token")
+        access_token_xml_data = et.SubElement(token_xml_data, "access_token")
+        refresh_token_xml_data = et.SubElement(token_xml_data, "refresh_token")
+        token_type_xml_data = et.SubElement(token_xml_data, "token_type")
+        creation_time_format_xml_data = et.SubElement(hx_api_token_xml_data,
+                                                      "creation_time_format"
+                                                      )
+        human_readable_time_xml_data = et.SubElement(creation_time_format_xml_data,
+                                                     "human_readable_time"
+                                                     )
+        unix_timestamp_time_xml_data = et.SubElement(creation_time_format_xml_data,
+                                                     "unix_timestamp_time"
+                                                     )
+        source_module_xml_data = et.SubElement(hx_api_token_xml_data,
+                                               "source_module"
+                                               )
+        renewal_method_xml_data = et.SubElement(hx_api_token_xml_data,
+                                                "renewal_method"
+                                                )
+        # Map HyperFlex API token data to XML entries
+        access_token_xml_data.text = hx_api_token_file_record["access_token"]
+        refresh_token_xml_data.text = hx_api_token_file_record["refresh_token"]
+        token_type_xml_data.text = hx_api_token_file_record["token_type"]
+        human_readable_time_xml_data.text = hx_api_token_file_record[
+            "human_readable_time"]
+        unix_timestamp_time_xml_data.text = hx_api_token_file_record[
+            "unix_timestamp_time"]
+        source_module_xml_data.text = hx_api_token_file_record["source_module"]
+        renewal_method_xml_data.text = hx_api_token_file_record["renewal_method"]
+        # Establish XML file tree
+        hx_api_token_xml = et.ElementTree(hx_api_token_xml_data)
+        # Write XML file to a temporary file and move it into place, so
+        # readers never see a partially written HyperFlex API token file
+        _replace_file_atomically(file_path,hx_api_token_xml.write)
+        logger.info("A HyperFlex API token file has been created at %s.",
+                    file_path)
+        return file_path
+    except Exception as exception_message:
+        logger.error("There was an error creating a HyperFlex API token "
+                     "file: %s", exception_message)
+        return
+
+
+def _replace_file_atomically(file_path,write_function):
+    """Writes a file by passing a temporary file object opened in binary
+    mode to the write function and then renaming the temporary file over
+    the file path. The permissions of a pre-existing file are preserved.
+    """
+    file_directory = os.path.dirname(os.path.abspath(file_path))
+    temporary_file_descriptor, temporary_file_path = tempfile.mkstemp(
+        prefix=".{}.".format(os.path.basename(file_path)),
+        suffix=".tmp",
+        dir=file_directory
+        )
+    try:
+        with os.fdopen(temporary_file_descriptor, "wb") as temporary_file:
+            write_function(temporary_file)
+            temporary_file.flush()
+            os.fsync(temporary_file.fileno())
+        try:
+            file_mode = os.stat(file_path).st_mode
+        except FileNotFoundError:
+            file_mode = 0o666 & ~_get_umask()
+        os.chmod(temporary_file_path, file_mode)
+        # Windows refuses to replace a file that is briefly held open by a
+        # reader, so the rename is retried for a short time
+        for replace_attempt in range(50):
+            try:
+                os.replace(temporary_file_path, file_path)
+                break
+            except PermissionError:
+                if os.name != "nt" or replace_attempt == 49:
+                    raise
+                time.sleep(0.01)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(temporary_file_path)
+        raise
+
+
+def _get_umask():
+    """Returns the file mode creation mask of the process."""
+    global _umask
+    if _umask is None:
+        _umask = os.umask(0o022)
+        os.umask(_umask)
+    return _umask
+
+
+@contextlib.contextmanager
+def _token_file_lock(file_path,deadline_time=None):
+    """Holds an exclusive advisory lock for a HyperFlex API token file while
+    the context is active. The lock is taken on a separate lock file next to
+    the token file, so it also coordinates separate processes. The lock file
+    is left in place for later use. If a deadline time is given, the lock is
+    polled until the deadline and DeadlineExceededError is raised if it could
+    not be acquired.
+    """
+    if deadline_time is None:
+        lock_file = _acquire_token_file_lock(file_path,blocking=True)
+    else:
+        while True:
+            lock_file = _acquire_token_file_lock(file_path,blocking=False)
+            if lock_file is not None:
+                break
+            time.sleep(min(0.05, _remaining_time(deadline_time)))
+    try:
+        yield
+    finally:
+        _release_token_file_lock(lock_file)
+
+
+def _acquire_token_file_lock(file_path,blocking):
+    """Acquires the exclusive advisory lock for a HyperFlex API token file.
+
+    Returns:
+        The open lock file holding the lock. The value None is returned if
+        blocking is False and the lock is held by another caller.
+    """
+    if isinstance(file_path, SQLiteTokenStoreEntry):
+        return file_path.store._acquire_lock(file_path.ip,file_path.username,
+                                             blocking)
+    lock_file = open(file_path + ".lock", "a+b")
+    try:
+        if os.name == "nt":
+            import msvcrt
+            while True:
+                try:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+                    return lock_file
+                except OSError:
+                    if not blocking:
+                        lock_file.close()
+                        return
+                    time.sleep(0.05)
+        else:
+            import fcntl
+            try:
+                fcntl.flock(lock_file.fileno(),
+                            fcntl.LOCK_EX if blocking
+                            else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                lock_file.close()
+                return
+            return lock_file
+    except BaseException:
+        lock_file.close()
+        raise
+
+
+def _release_token_file_lock(lock_file):
+    """Releases a lock acquired by the _acquire_token_file_lock() function."""
+    if isinstance(lock_file, _SQLiteTokenStoreLock):
+        lock_file.release()
+        return
+    try:
+        if os.name == "nt":
+            import msvcrt
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+    finally:
+        lock_file.close()
+
+
+def renew_token_file(ip,username,password,file_path,renewal_strategy="refresh",
+                     session=None,timeout=None,deadline=None):
+    r"""This is a function that renews the HyperFlex API token held in a
+    token file. By default, the refresh token stored in a pre-existing token
+    file is used to obtain a new access token. A username and password login
+    is only performed if the refresh is rejected or no pre-existing token
+    file is available. If the HyperFlex AAA service cannot be reached or
+    answers with a server error, the renewal fails without a login. The
+    renewal method that was used is recorded in the token file.
+
+    Args:
+        ip: The targeted HyperFlex Connect or Cluster Management IP address.
+            The value must be a string.
+        username: The username credentials that will be used to log into
+            HyperFlex if a refresh is not possible. The value must be a
+            string.
+        password: The password credentials that will be used to log into
+            HyperFlex if a refresh is not possible. The value must be a
+            string.
+        file_path: The file name and storage location of the HyperFlex API
+            token file. The value must be a string. An example value is
+            "c:\\folder\\file.xml". A SQLiteTokenStore object can also be
+            provided to keep the token in a SQLite token store instead.
+        renewal_strategy: (Optional) The strategy used to renew the HyperFlex
+            API token. Providing this argument is optional. The value must be
+            a string. The options are "refresh" or "login". The "refresh"
+            option tries the stored refresh token first and falls back to a
+            username and password login. The "login" option always performs
+            a username and password login. The default value is "refresh".
+        session: (Optional) A requests.Session object used to send the
+            request to the HyperFlex AAA service. Providing this argument is
+            optional. If no session is provided, the shared keep-alive session
+            for the IP address from get_hx_api_session() is used.
+        timeout: (Optional) The connect and read timeouts in seconds of
+            each request to the HyperFlex AAA service. Providing this
+            argument is optional. Run 'help(obtain_token)' for details.
+        deadline: (Optional) The maximum number of seconds the function
+            may take. Providing this argument is optional. The value must
+            be a positive number. The default value of None sets no
+            deadline.
+
+    Returns:
+        The file path of the renewed HyperFlex API token file is returned if
+        renewal was successful. The token file keeps its XML or JSON format.
+        If a SQLiteTokenStore object was provided, the SQLiteTokenStoreEntry
+        of the stored token is returned instead. The value None is returned
+        if renewing the HyperFlex API token file failed.
+
+    Raises:
+        Exception: An exception occurred while renewing the HyperFlex API
+            token file. The exact error will be specified.
+        ValueError: There was an invalid argument provided for the renewal
+            strategy, timeout or deadline settings. A recommendation on how to
+            resolve the error will be displayed.
+    """
+
+    # Verify the renewal_strategy argument
+    if renewal_strategy not in ("refresh", "login"):
+        raise ValueError("The renewal strategy setting is not valid. Please "
+                         "provide either the value 'refresh' or 'login' in "
+                         "string format for the 'renewal_strategy' "
+                         "argument.")
+
+    # Verify the timeout and deadline arguments
+    timeout = _verify_timeout_arguments(timeout,deadline)
+    deadline_time = _deadline_time(deadline)
+
+    # Resolve a token store to the entry for the IP address and username
+    file_path = _resolve_token_location(ip,username,file_path)
+    # Start the HyperFlex API token file renewal process
+    logger.debug("Starting the HyperFlex API token file renewal process...")
+    if renewal_strategy == "refresh" and _token_file_exists(file_path):
+        # Refresh the pre-existing HyperFlex API token
+        existing_hx_api_token = load_token_file(file_path)
+        if existing_hx_api_token and existing_hx_api_token["refresh_token"]:
+            try:
+                refreshed_hx_api_token = _refresh_token(
+                    ip,existing_hx_api_token,session,None,timeout,
+                    deadline_time)
+            except _aaa_outage_errors() as exception_message:
+                # A login would fail in the same way and only adds load
+                logger.error("The HyperFlex API token could not be refreshed "
+                             "because the HyperFlex AAA service is "
+                             "unavailable, so no username and password login "
+                             "is attempted: %s", exception_message)
+                return
+            except DeadlineExceededError:
+                raise
+            except Exception as exception_message:
+                logger.error("There was an error refreshing the HyperFlex "
+                             "API access token: %s", exception_message)
+                refreshed_hx_api_token = None
+            if refreshed_hx_api_token:
+                # Keep any token values not returned by the refresh
+                renewed_hx_api_token = dict(existing_hx_api_token)
+                renewed_hx_api_token.update(
+                    {key: value for key, value in refreshed_hx_api_token.items()
+                     if value})
+                renewed_hx_api_token_file = _write_token_file(
+                    renewed_hx_api_token,file_path,"refresh")
+                if renewed_hx_api_token_file:
+                    _record_metric("hx_api_token_renewals_total",
+                                   {"ip": ip, "method": "refresh"})
+                    logger.info("The HyperFlex API token file was renewed "
+                                "using the refresh token.")
+                    return renewed_hx_api_token_file
+        logger.warning("The HyperFlex API token could not be refreshed, "
+                       "falling back to a username and password login...")
+    # Obtain a new HyperFlex API token
+    hx_api_token = obtain_token(ip,username,password,session=session,
+                                timeout=timeout,
+                                deadline=_remaining_time(deadline_time))
+    renewed_hx_api_token_file = _write_token_file(
+        hx_api_token,file_path,"login")
+    if renewed_hx_api_token_file:
+        _record_metric("hx_api_token_renewals_total",
+                       {"ip": ip, "method": "login"})
+        logger.info("The HyperFlex API token file was renewed using a "
+                    "username and password login.")
+    return renewed_hx_api_token_file
+
+
+def _parse_token_file(file_path):
+    """Parses the XML or JSON data in a HyperFlex API token file. The format
+    is detected from the first character of the file.
+
+    Returns:
+        A dictionary with the data of the HyperFlex API token file.
+    """
+    with open(file_path, "rb") as hx_api_token_file:
+        hx_api_token_file_data = hx_api_token_file.read()
+    if hx_api_token_file_data.lstrip().startswith(b"{"):
+        # Load the JSON data in the HyperFlex API token file
+        hx_api_token_json_data = json.loads(hx_api_token_file_data)
+        hx_api_token_file_record = {key: hx_api_token_json_data.get(key)
+                                    for key in ("access_token",
+                                                "refresh_token",
+                                                "token_type",
+                                                "human_readable_time",
+                                                "unix_timestamp_time",
+                                                "source_module"
+                                                )
+                                    }
+        hx_api_token_file_record["renewal_method"] = (
+            hx_api_token_json_data.get("renewal_method") or "login")
+        return hx_api_token_file_record
+    # Load and parse the XML data in the HyperFlex API token file
+    hx_api_token_xml_data = et.fromstring(hx_api_token_file_data)
+    # Token files created before renewal methods were recorded were always
+    # created with a username and password login
+    renewal_method_xml_data = hx_api_token_xml_data.find("renewal_method")
+    if renewal_method_xml_data is not None:
+        renewal_method_data = renewal_method_xml_data.text
+    else:
+        renewal_method_data = "login"
+    return {"access_token": hx_api_token_xml_data.find(
+                "token/access_token").text,
+            "refresh_token": hx_api_token_xml_data.find(
+                "token/refresh_token").text,
+            "token_type": hx_api_token_xml_data.find(
+                "token/token_type").text,
+            "human_readable_time": hx_api_token_xml_data.find(
+                "creation_time_format/human_readable_time").text,
+            "unix_timestamp_time": hx_api_token_xml_data.find(
+                "creation_time_format/unix_timestamp_time").text,
+            "source_module": hx_api_token_xml_data.find(
+                "source_module").text,
+            "renewal_method": renewal_method_data
+            }
+
+
+def _read_token_file_record(file_path,file_status=None):
+    """Returns the data of a HyperFlex API token file. Parsed data is cached
+    in memory by file path and reused while the modification time, size and
+    inode of the file are unchanged, so repeated reads cost a single stat.
+
+    Args:
+        file_status: The os.stat() result of the file if it is already known.
+
+    Returns:
+        A dictionary with the data of the HyperFlex API token file.
+    """
+    if isinstance(file_path, SQLiteTokenStoreEntry):
+        return file_path.store._load_record(file_path.ip,file_path.username)
+    if file_status is None:
+        file_status = os.stat(file_path)
+    file_signature = (file_status.st_mtime_ns,
+                      file_status.st_size,
+                      file_status.st_ino
+                      )
+    with _hx_api_token_file_records_lock:
+        cached_record = _hx_api_token_file_records.get(file_path)
+    if cached_record is not None and cached_record[0] == file_signature:
+        _record_metric("hx_api_token_file_cache_total",{"result": "hit"})
+        return cached_record[1]
+    _record_metric("hx_api_token_file_cache_total",{"result": "miss"})
+    hx_api_token_file_record = _parse_token_file(file_path)
+    with _hx_api_token_file_records_lock:
+        _hx_api_token_file_records[file_path] = (file_signature,
+                                                 hx_api_token_file_record)
+    return hx_api_token_file_record
+
+
+def _load_token_file_record(file_path):
+    """Loads all data of a HyperFlex API token file with a single read of
+    the parsed token file cache.
+
+    Returns:
+        A dictionary with the data of the HyperFlex API token file. The
+        value None is returned if the token file could not be loaded or
+        holds no access token.
+    """
+    try:
+        hx_api_token_file_record = _read_token_file_record(file_path)
+    except Exception as exception_message:
+        logger.error("There was an error loading the HyperFlex API token "
+                     "file: %s", exception_message)
+        return
+    if not hx_api_token_file_record or not hx_api_token_file_record.get(
+            "access_token"):
+        return
+    return hx_api_token_file_record
+
+
+def _token_file_data(hx_api_token_file_record,data):
+    """Returns the value of the 'data' argument of the load_token_file()
+    function from the data of a HyperFlex API token file.
+    """
+    if data == "token":
+        return {"access_token": hx_api_token_file_record["access_token"],
+                "refresh_token": hx_api_token_file_record["refresh_token"],
+                "token_type": hx_api_token_file_record["token_type"]
+                }
+    return hx_api_token_file_record[data]
+
+
+def clear_token_file_cache():
+    """This is a function that clears the in-memory cache of parsed HyperFlex
+    API token files used by the load_token_file() function. Cached data is
+    refreshed automatically when a token file changes, so clearing the cache
+    is only needed to release memory.
+
+    Returns:
+        The number of cached token files that were cleared as an integer.
+    """
+
+    with _hx_api_token_file_records_lock:
+        cleared_records = len(_hx_api_token_file_records)
+        _hx_api_token_file_records.clear()
+    return cleared_records
+
+
+def _token_file_exists(file_path):
+    """Returns True if a HyperFlex API token file exists at the file path, or
+    if a HyperFlex API token is stored for a SQLiteTokenStoreEntry.
+    """
+    if isinstance(file_path, SQLiteTokenStoreEntry):
+        return file_path.exists()
+    return os.path.isfile(file_path)
+
+
+def _resolve_token_location(ip,username,file_path):
+    """Returns the SQLiteTokenStoreEntry for the IP address and username if a
+    SQLiteTokenStore is given in place of a file path. Any other file path
+    value is returned unchanged.
+    """
+    if isinstance(file_path, SQLiteTokenStore):
+        return file_path.entry(ip,username)
+    return file_path
+
+
+class SQLiteTokenStore:
+    r"""This is a class that stores the HyperFlex API tokens of many HyperFlex
+    clusters in one indexed SQLite database instead of one XML file per
+    token. Tokens are keyed by HyperFlex cluster IP address and username, and
+    hold the same data as an XML token file. A SQLiteTokenStore object can be
+    provided in place of the 'file_path' argument of the create_token_file(),
+    renew_token_file() and manage_token_file() functions. An entry returned
+    by the entry() method can be provided in place of the 'file_path'
+    argument of any HyperFlex API Token Manager function, including
+    load_token_file().
+
+    Args:
+        database_path: The file name and storage location of the SQLite
+            database. The value must be a string. The database is created if
+            it does not exist. An example value is "c:\\folder\\tokens.db".
+        lock_timeout: (Optional) The number of seconds after which a renewal
+            lock held by a process that stopped without releasing it expires.
+            Providing this argument is optional. The value must be a positive
+            integer. The default value is 300.
+
+    Raises:
+        ValueError: There was an invalid argument provided for the lock
+            timeout setting. A recommendation on how to resolve the error will
+            be displayed.
+
+    Example:
+        store = SQLiteTokenStore("c:\\folder\\tokens.db")
+        manage_token_file(ip,username,password,store)
+        load_token_file(store.entry(ip,username),"access_token")
+    """
+
+    def __init__(self,database_path,lock_timeout=DEFAULT_STORE_LOCK_TIMEOUT):
+        # Verify the lock_timeout argument
+        if (not isinstance(lock_timeout, int) or isinstance(lock_timeout, bool)
+                or lock_timeout < 1):
+            raise ValueError("The lock timeout setting is not valid. Please "
+                             "provide a positive integer for the "
+                             "'lock_timeout' argument.")
+
+        self.database_path = database_path
+        self.lock_timeout = lock_timeout
+        self._thread_connections = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        self._connection().executescript("""
+            CREATE TABLE IF NOT EXISTS hx_api_tokens (
+                ip TEXT NOT NULL,
+                username TEXT NOT NULL,
+                access_token TEXT NOT NULL,
+                refresh_token TEXT,
+                token_type TEXT,
+                human_readable_time TEXT,
+                unix_timestamp_time INTEGER NOT NULL,
+                source_module TEXT,
+                renewal_method TEXT,
+                PRIMARY KEY (ip, username)
+                );
+            CREATE INDEX IF NOT EXISTS hx_api_tokens_by_unix_timestamp_time
+                ON hx_api_tokens (unix_timestamp_time);
+            CREATE TABLE IF NOT EXISTS hx_api_token_locks (
+                ip TEXT NOT NULL,
+                username TEXT NOT NULL,
+                lock_owner TEXT NOT NULL,
+                lock_expiry REAL NOT NULL,
+                PRIMARY KEY (ip, username)
+                );
+            """)
+
+    def __repr__(self):
+        return "SQLiteTokenStore({!r})".format(self.database_path)
+
+    def _connection(self):
+        """Returns the SQLite connection of the calling thread."""
+        connection = getattr(self._thread_connections, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.database_path,
+                                         timeout=30,
+                                         isolation_level=None,
+                                         check_same_thread=False
+                                         )
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._thread_connections.connection = connection
+            with self._connections_lock:
+                self._connections.append(connection)
+        return connection
+
+    def entry(self,ip,username):
+        """Returns the SQLiteTokenStoreEntry for the HyperFlex API token of a
+        HyperFlex cluster and username.
+
+        Args:
+            ip: The HyperFlex Connect or Cluster Management IP address. The
+                value must be a string.
+            username: The HyperFlex username. The value must be a string.
+        """
+        return SQLiteTokenStoreEntry(self,ip,username)
+
+    def _save_record(self,ip,username,hx_api_token_file_record):
+        """Stores the data of a HyperFlex API token, replacing any previous
+        token for the HyperFlex cluster and username.
+        """
+        self._connection().execute(
+            "INSERT OR REPLACE INTO hx_api_tokens (ip, username, "
+            "access_token, refresh_token, token_type, human_readable_time, "
+            "unix_timestamp_time, source_module, renewal_method) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (ip,
+             username,
+             hx_api_token_file_record["access_token"],
+             hx_api_token_file_record["refresh_token"],
+             hx_api_token_file_record["token_type"],
+             hx_api_token_file_record["human_readable_time"],
+             int(hx_api_token_file_record["unix_timestamp_time"]),
+             hx_api_token_file_record["source_module"],
+             hx_api_token_file_record["renewal_method"])
+            )
+
+    @staticmethod
+    def _row_to_record(hx_api_token_row):
+        """Converts a database row to the data of a HyperFlex API token."""
+        hx_api_token_file_record = dict(hx_api_token_row)
+        hx_api_token_file_record["unix_timestamp_time"] = str(
+            hx_api_token_file_record["unix_timestamp_time"])
+        return hx_api_token_file_record
+
+    def _load_record(self,ip,username):
+        """Returns the data of the HyperFlex API token for a HyperFlex cluster
+        and username, or None if no token is stored.
+        """
+        hx_api_token_row = self._connection().execute(
+            "SELECT access_token, refresh_token, token_type, "
+            "human_readable_time, unix_timestamp_time, source_module, "
+            "renewal_method FROM hx_api_tokens WHERE ip = ? AND username = ?",
+            (ip, username)
+            ).fetchone()
+        if hx_api_token_row is None:
+            return
+        return self._row_to_record(hx_api_token_row)
+
+    def delete_token(self,ip,username):
+        """Deletes the HyperFlex API token of a HyperFlex cluster and username
+        from the store. The token is not revoked.
+
+        Args:
+            ip: The HyperFlex Connect or Cluster Management IP address. The
+                value must be a string.
+            username: The HyperFlex username. The value must be a string.
+
+        Returns:
+            The Boolean value True is returned if a token was deleted. The
+            Boolean value False is returned if no token was stored.
+        """
+        return self._connection().execute(
+            "DELETE FROM hx_api_tokens WHERE ip = ? AND username = ?",
+            (ip, username)
+            ).rowcount > 0
+
+    def find_tokens(self,older_than=None):
+        """Returns the HyperFlex API tokens held in the store, using the
+        creation time index to select tokens by age.
+
+        Args:
+            older_than: (Optional) Only tokens created at least this many
+                seconds ago are returned. Providing this argument is optional.
+                The value must be an integer. The default value of None
+                returns all tokens.
+
+        Returns:
+            A list of dictionaries, oldest first, each containing the "ip"
+            and "username" keys and the same keys as the data options of the
+            load_token_file() function.
+        """
+        if older_than is None:
+            hx_api_token_rows = self._connection().execute(
+                "SELECT * FROM hx_api_tokens ORDER BY unix_timestamp_time"
+                ).fetchall()
+        else:
+            hx_api_token_rows = self._connection().execute(
+                "SELECT * FROM hx_api_tokens WHERE unix_timestamp_time <= ? "
+                "ORDER BY unix_timestamp_time",
+                (_current_unix_timestamp() - older_than,)
+                ).fetchall()
+        return [self._row_to_record(hx_api_token_row)
+                for hx_api_token_row in hx_api_token_rows]
+
+    def _acquire_lock(self,ip,username,blocking):
+        """Acquires the renewal lock for a HyperFlex cluster and username. The
+        lock is a row in the database, so it also coordinates separate
+        processes that share the store.
+
+        Returns:
+            A _SQLiteTokenStoreLock object. The value None is returned if
+            blocking is False and the lock is held by another caller.
+        """
+        lock_owner = uuid.uuid4().hex
+        connection = self._connection()
+        while True:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.execute(
+                    "DELETE FROM hx_api_token_locks WHERE ip = ? AND "
+                    "username = ? AND lock_expiry < ?",
+                    (ip, username, time.time())
+                    )
+                lock_acquired = connection.execute(
+                    "INSERT OR IGNORE INTO hx_api_token_locks (ip, username, "
+                    "lock_owner, lock_expiry) VALUES (?, ?, ?, ?)",
+                    (ip, username, lock_owner, time.time() + self.lock_timeout)
+                    ).rowcount > 0
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            if lock_acquired:
+                return _SQLiteTokenStoreLock(self,ip,username,lock_owner)
+            if not blocking:
+                return
+            time.sleep(0.05)
+
+    def _release_lock(self,ip,username,lock_owner):
+        """Releases a renewal lock acquired by the _acquire_lock() method."""
+        self._connection().execute(
+            "DELETE FROM hx_api_token_locks WHERE ip = ? AND username = ? AND "
+            "lock_owner = ?",
+            (ip, username, lock_owner)
+            )
+
+    def close(self):
+        """Closes the database connections opened by the store."""
+        with self._connections_lock:
+            connections = list(self._connections)
+            self._connections.clear()
+        for connection in connections:
+            connection.close()
+        self._thread_connections = threading.local()
+
+
+class SQLiteTokenStoreEntry:
+    """This is a class that identifies the HyperFlex API token of one
+    HyperFlex cluster and username in a SQLiteTokenStore. Entries are
+    returned by the SQLiteTokenStore.entry() method and can be provided in
+    place of the 'file_path' argument of any HyperFlex API Token Manager
+    function.
+    """
+
+    def __init__(self,store,ip,username):
+        self.store = store
+        self.ip = ip
+        self.username = username
+
+    def __eq__(self,other):
+        if not isinstance(other, SQLiteTokenStoreEntry):
+            return NotImplemented
+        return ((self.store.database_path, self.ip, self.username)
+                == (other.store.database_path, other.ip, other.username))
+
+    def __hash__(self):
+        return hash((self.store.database_path, self.ip, self.username))
+
+    def __repr__(self):
+        return "SQLiteTokenStoreEntry({!r}, {!r}, {!r})".format(
+            self.store.database_path, self.ip, self.username)
+
+    def __str__(self):
+        return "{} for {} on {}".format(self.store.database_path,
+                                        self.username,
+                                        self.ip)
+
+    def exists(self):
+        """Returns True if a HyperFlex API token is stored for the entry."""
+        return self.store._load_record(self.ip,self.username) is not None
+
+
+class _SQLiteTokenStoreLock:
+    """A renewal lock held in a SQLiteTokenStore."""
+
+    def __init__(self,store,ip,username,lock_owner):
+        self.store = store
+        self.ip = ip
+        self.username = username
+        self.lock_owner = lock_owner
+
+    def release(self):
+        self.store._release_lock(self.ip,self.username,self.lock_owner)
+
+
+def load_token_file(file_path,data="token"):
+    r"""This is a function that loads data from a HyperFlex API token file in
+    the XML or JSON token file format, or from a SQLite token store entry.
+    The format of a token file is detected from its content.
+
+    Args:
+        file_path: The file name and storage location from which to load a
+            HyperFlex API token file. The value must be a string. An example
+            value is "c:\\folder\\file.xml". A SQLiteTokenStoreEntry object
+            can also be provided to load a token from a SQLite token store.
+        data: (Optional) The data from a HyperFlex API token file that is
+            returned by the load_token_file() function. Providing this
+            argument is optional. The default value of "token" is set, which
+            returns the access token, refresh token, and token type as a
+            dictionary. The user provided value must be a string. See the
+            following list for the options available for the 'data' argument and
+            the returned value:
+            1. "token": Returns a dictionary with the access token, refresh
+                token, and token type.
+            2. "access_token": Returns a string value of only the access
+                token.
+            3. "refresh_token": Returns a string value of only the refresh
+                token.
+            4. "token_type": Returns a string value of only the token type.
+            5. "human_readable_time": Returns a string value of the HyperFlex API
+                token file creation time in a human-readable format.
+            6. "unix_timestamp_time": Returns a string value of the HyperFlex API
+                token file creation time in Unix timestamp format.
+            7. "source_module": Returns a string value of the source module
+                used to create the HyperFlex API token file.
+            8. "renewal_method": Returns a string value of the method used
+                to obtain the HyperFlex API token, either "login" or
+                "refresh".
+    
+    Returns:
+        The return is based on the value of the 'data' argument. If the default
+        value of "token" is set, the access token, refresh token, and token
+        type will be returned as a dictionary. See the following list to see
+        the options available for the 'data' argument and the returned value:
+            1. "token": Returns a dictionary with the access token, refresh
+                token, and token type.
+            2. "access_token": Returns a string value of only the access token.
+            3. "refresh_token": Returns a string value of only the refresh token.
+            4. "token_type": Returns a string value of only the token type.
+            5. "human_readable_time": Returns a string value of the HyperFlex
+                API token file creation time in a human-readable format.
+            6. "unix_timestamp_time": Returns a string value of the HyperFlex
+                API token file creation time in Unix timestamp format.
+            7. "source_module": Returns a string value of the source module
+                used to create the HyperFlex API token file.
+            8. "renewal_method": Returns a string value of the method used
+                to obtain the HyperFlex API token, either "login" or
+                "refresh".
+
+    Raises:
+        Exception: An exception occurred while loading the HyperFlex API token
+            file. The exact error will be specified.
+        ValueError: There was an invalid argument provided for the file path
+            or data setting. A recommendation on how to resolve the error will
+            be displayed.
+    """
+
+    # Verify the file_path argument
+    if isinstance(file_path, SQLiteTokenStoreEntry):
+        hx_api_token_file_status = None
+        if not file_path.exists():
+            raise ValueError("There is no HyperFlex API token in {} for the "
+                             "provided 'file_path' argument.".format(
+                                 file_path))
+    else:
+        try:
+            hx_api_token_file_status = os.stat(file_path)
+        except OSError:
+            hx_api_token_file_status = None
+    if (not isinstance(file_path, SQLiteTokenStoreEntry)
+            and (hx_api_token_file_status is None
+                 or not stat.S_ISREG(hx_api_token_file_status.st_mode))):
+        raise ValueError(r"The file at the provided file path does not exist. "
+                         "Please provide the file path to a valid file in "
+                         "string format for the 'file_path' argument. An "
+                         "example value is 'c:\\folder\\file.xml'.")
+
+    # Verify the data argument
+    if data not in ("token",
+                    "access_token",
+                    "refresh_token",
+                    "token_type",
+                    "human_readable_time",
+                    "unix_timestamp_time",
+                    "source_module",
+                    "renewal_method"
+                    ):
+        raise ValueError("The argument provided for the requested data type "
+                         "is not valid. Run 'help(load_token_file)' for "
+                         "available options.")
+
+    # Start the HyperFlex API token file loading process
+    logger.debug("Starting the HyperFlex API token file loading process...")
+    # Verify the presence of the HyperFlex API token file and load data
+    logger.debug("Verifying the presence of the HyperFlex API token file...")
+    try:
+        logger.debug("The HyperFlex API token file was found, proceeding "
+                     "with loading data from the file...")
+        # Load the HyperFlex API token file data, reusing the parsed data
+        # while the file is unchanged
+        hx_api_token_file_record = _read_token_file_record(
+            file_path,hx_api_token_file_status)
+        # Map the file data to the potential return data values
+        access_token_data = hx_api_token_file_record["access_token"]
+        refresh_token_data = hx_api_token_file_record["refresh_token"]
+        token_type_data = hx_api_token_file_record["token_type"]
+        human_readable_time_data = hx_api_token_file_record[
+            "human_readable_time"]
+        unix_timestamp_time_data = hx_api_token_file_record[
+            "unix_timestamp_time"]
+        source_module_data = hx_api_token_file_record["source_module"]
+        renewal_method_data = hx_api_token_file_record["renewal_method"]
+        token_data = {"access_token": access_token_data,
+                      "refresh_token": refresh_token_data,
+                      "token_type": token_type_data
+                      }
+        logger.debug("The HyperFlex API token file has been loaded.")
+        # Return the value mapped to the data argument setting
+        if data == "token":
+            logger.debug("The requested token data has been returned.")
+            return token_data
+        elif data == "access_token":
+            logger.debug("The requested access token data has been returned.")
+            return access_token_data
+        elif data == "refresh_token":
+            logger.debug("The requested refresh token data has been returned.")
+            return refresh_token_data
+        elif data == "token_type":
+            logger.debug("The requested token type data has been returned.")
+            return token_type_data
+        elif data == "human_readable_time":
+            logger.debug("The requested human readable time data has been "
+                         "returned.")
+            return human_readable_time_data
+        elif data == "unix_timestamp_time":
+            logger.debug("The requested Unix timestamp data has been "
+                         "returned.")
+            return unix_timestamp_time_data
+        elif data == "source_module":
+            logger.debug("The requested source module data has been returned.")
+            return source_module_data
+        elif data == "renewal_method":
+            logger.debug("The requested renewal method data has been "
+                         "returned.")
+            return renewal_method_data
+        else:
+            logger.error("No data has been returned, a valid value for the "
+                         "'data' argument needs to be provided.%s",
+                         """
+                         Please provide one of the following options in string
+                         format for the 'data' argument:
+                             1. "token": Returns a dictionary with the access
+                                 token, refresh token, and token type.
+                             2. "access_token": Returns a string value of
+                                 only the access token.
+                             3. "refresh_token": Returns a string value of
+                                 only the refresh token.
+                             4. "token_type": Returns a string value of only
+                                 the token type.
+                             5. "human_readable_time": Returns a string value
+                                 of the HyperFlex API token file creation time
+                                 in a human-readable format.
+                             6. "unix_timestamp_time": Returns a string value
+                                 of the HyperFlex API token file creation time
+                                 in Unix timestamp format.
+                             7. "source_module": Returns a string value of
+                                 the source module used to create the
+                                 HyperFlex API token file.
+                             8. "renewal_method": Returns a string value of
+                                 the method used to obtain the HyperFlex API
+                                 token.
+                         """
+                         )
+            return
+    except Exception as exception_message:
+        logger.error("There was an error loading a HyperFlex API token file: "
+                     "%s", exception_message)
+        return
+        
+
+def convert_token_file(source_file_path,file_format="json",
+                       destination_file_path=None):
+    r"""This is a function that converts a HyperFlex API token file to the
+    XML or JSON token file format. The token data, creation time and renewal
+    method are kept unchanged.
+
+    Args:
+        source_file_path: The file name and storage location of the
+            pre-existing HyperFlex API token file. The value must be a string.
+            An example value is "c:\\folder\\file.xml".
+        file_format: (Optional) The format of the converted HyperFlex API
+            token file. Providing this argument is optional. The value must
+            be a string. The options are "xml" or "json". The default value
+            is "json".
+        destination_file_path: (Optional) The file name and storage location
+            of the converted HyperFlex API token file. Providing this argument
+            is optional. The value must be a string. An example value is
+            "c:\\folder\\file.json". The default value of None converts the
+            source token file in place.
+
+    Returns:
+        The file path of the converted HyperFlex API token file is returned if
+        conversion was successful. The value None is returned if converting
+        the HyperFlex API token file failed.
+
+    Raises:
+        ValueError: There was an invalid argument provided for the source file
+            path or file format setting. A recommendation on how to resolve
+            the error will be displayed.
+    """
+
+    # Verify the source_file_path argument
+    if not os.path.isfile(source_file_path):
+        raise ValueError(r"The file at the provided source file path does not "
+                         "exist. Please provide the file path to a valid file "
+                         "in string format for the 'source_file_path' "
+                         "argument. An example value is "
+                         "'c:\\folder\\file.xml'.")
+
+    # Verify the file_format argument
+    if file_format not in ("xml", "json"):
+        raise ValueError("The file format setting is not valid. Please "
+                         "provide either the value 'xml' or 'json' in string "
+                         "format for the 'file_format' argument.")
+
+    # Set the destination file path
+    if destination_file_path is None:
+        destination_file_path = source_file_path
+
+    # Start the HyperFlex API token file conversion process
+    logger.debug("Starting the HyperFlex API token file conversion process...")
+    try:
+        # Hold the renewal lock so a concurrent renewal is not overwritten
+        # with the previous token data
+        with _token_file_lock(destination_file_path):
+            hx_api_token_file_record = _read_token_file_record(
+                source_file_path)
+            converted_hx_api_token_file = _write_token_file_record(
+                hx_api_token_file_record,destination_file_path,file_format)
+    except Exception as exception_message:
+        logger.error("There was an error converting a HyperFlex API token "
+                     "file: %s", exception_message)
+        return
+    if converted_hx_api_token_file:
+        logger.info("The HyperFlex API token file has been converted to %s "
+                    "format.", file_format.upper())
+    return converted_hx_api_token_file
+
+
+def _current_unix_timestamp():
+    """Returns the current time as an integer Unix timestamp using the same
+    clock as the creation time stored in HyperFlex API token files.
+    """
+    return int(datetime.datetime.utcnow().timestamp())
+
+
+def _check_token_trust(ip,access_token,creation_time,validation_ttl):
+    """Determines whether a HyperFlex API access token can be trusted without
+    contacting the HyperFlex AAA service.
+
+    Returns:
+        The string "expired" if the token is older than the HyperFlex API
+        token lifetime, "trusted" if the token was created or successfully
+        validated within the validation TTL, or "unknown" if the token must
+        be validated by the HyperFlex AAA service.
+    """
+    current_time = _current_unix_timestamp()
+    try:
+        token_age = current_time - int(creation_time)
+    except (TypeError, ValueError):
+        return "unknown"
+    if token_age < 0:
+        return "unknown"
+    if token_age >= HX_API_TOKEN_LIFETIME:
+        return "expired"
+    if validation_ttl > 0:
+        if token_age < validation_ttl:
+            return "trusted"
+        with _validated_hx_api_tokens_lock:
+            last_validation_time = _validated_hx_api_tokens.get(
+                (ip, access_token))
+        if (last_validation_time is not None
+                and 0 <= current_time - last_validation_time < validation_ttl):
+            return "trusted"
+    return "unknown"
+
+
+def _record_token_validation(ip,access_token):
+    """Records the time of a successful HyperFlex API access token validation
+    in the validation cache.
+    """
+    with _validated_hx_api_tokens_lock:
+        _validated_hx_api_tokens[(ip, access_token)] = _current_unix_timestamp()
+
+
+def clear_validation_cache():
+    """This is a function that clears the in-memory cache of successful
+    HyperFlex API access token validations used by the manage_token_file()
+    function. Tokens will be validated by the HyperFlex AAA service on the
+    next call to manage_token_file() unless they are within the validation
+    TTL of their creation time.
+
+    Returns:
+        The number of cached validations that were cleared as an integer.
+    """
+
+    with _validated_hx_api_tokens_lock:
+        cleared_validations = len(_validated_hx_api_tokens)
+        _validated_hx_api_tokens.clear()
+    return cleared_validations
+
+
+def load_trusted_token(ip,username,file_path,validation_ttl=None):
+    r"""This is a function that loads the HyperFlex API token held in a token
+    file only if it can be used without contacting the HyperFlex AAA
+    service. A token is trusted if it was created, or successfully validated
+    by this process, within the validation TTL. No request is sent, so the
+    function is suited to serving a token from a hot path and falling back
+    to manage_token_file() when no trusted token is available.
+
+    Args:
+        ip: The targeted HyperFlex Connect or Cluster Management IP address.
+            The value must be a string.
+        username: The username the token was obtained with. The value must be
+            a string. The value is used to find the token in a
+            SQLiteTokenStore.
+        file_path: The file name and storage location of the HyperFlex API
+            token file. The value must be a string. An example value is
+            "c:\\folder\\file.xml". A SQLiteTokenStore object can also be
+            provided.
+        validation_ttl: (Optional) The trust window in seconds for HyperFlex
+            API access tokens. Providing this argument is optional. The value
+            must be a non-negative integer. If no value is provided, the
+            module setting DEFAULT_VALIDATION_TTL is used. Run
+            'help(manage_token_file)' for details.
+
+    Returns:
+        A dictionary with the access token, refresh token, and token type if
+        a trusted HyperFlex API token is available. The value None is
+        returned if the token file is missing or unreadable, or if the token
+        must be validated by the HyperFlex AAA service first.
+
+    Raises:
+        ValueError: There was an invalid argument provided for the validation
+            TTL setting. A recommendation on how to resolve the error will be
+            displayed.
+    """
+
+    # Verify the validation_ttl argument
+    if validation_ttl is None:
+        validation_ttl = DEFAULT_VALIDATION_TTL
+    if (not isinstance(validation_ttl, int) or isinstance(validation_ttl, bool)
+            or validation_ttl < 0):
+        raise ValueError("The validation TTL setting is not valid. Please "
+                         "provide a non-negative integer for the "
+                         "'validation_ttl' argument.")
+
+    # Resolve a token store to the entry for the IP address and username
+    file_path = _resolve_token_location(ip,username,file_path)
+    try:
+        hx_api_token_file_record = _read_token_file_record(file_path)
+    except (OSError, ValueError, SyntaxError):
+        return
+    if not hx_api_token_file_record:
+        return
+    if _check_token_trust(ip,
+                          hx_api_token_file_record["access_token"],
+                          hx_api_token_file_record["unix_timestamp_time"],
+                          validation_ttl) != "trusted":
+        return
+    return {"access_token": hx_api_token_file_record["access_token"],
+            "refresh_token": hx_api_token_file_record["refresh_token"],
+            "token_type": hx_api_token_file_record["token_type"]
+            }
+
+
+@functools.lru_cache(maxsize=256)
+def _decode_token_claims(access_token):
+    """Decodes the claims of a JSON Web Token without verifying its
+    signature. The decoded claims of recent tokens are cached.
+
+    Returns:
+        The claims as a dictionary, or None if the token is not a JSON Web
+        Token.
+    """
+    token_segments = access_token.split(".")
+    if len(token_segments) != 3:
+        return
+    claims_segment = token_segments[1]
+    try:
+        token_claims = json.loads(base64.urlsafe_b64decode(
+            claims_segment + "=" * (-len(claims_segment) % 4)))
+    except (ValueError, TypeError):
+        return
+    if not isinstance(token_claims, dict):
+        return
+    return token_claims
+
+
+def get_token_claims(access_token):
+    """This is a function that decodes the claims of a HyperFlex API access
+    token issued as a JSON Web Token (JWT), such as the "exp" expiry time
+    and the "iat" issue time. The signature of the token is not verified, so
+    the claims must only be used to decide whether a token is worth sending,
+    not to authorize anything.
+
+    Args:
+        access_token: A HyperFlex API access token. The value must be a
+            string.
+
+    Returns:
+        The claims of the access token as a dictionary. The value None is
+        returned if the access token is not a JSON Web Token.
+    """
+
+    if not isinstance(access_token, str):
+        return
+    token_claims = _decode_token_claims(access_token)
+    if token_claims is None:
+        return
+    return dict(token_claims)
+
+
+def _check_token_claims(access_token,expiry_margin=DEFAULT_TOKEN_EXPIRY_MARGIN):
+    """Determines whether the expiry claims of a HyperFlex API access token
+    show it is valid without contacting the HyperFlex AAA service.
+
+    Returns:
+        The Boolean value True if the token carries an "exp" claim more than
+        the expiry margin in the future and is not used before its "nbf"
+        claim. The Boolean value False is returned if the claims are missing
+        or the token is near or past its expiry, and the token must be
+        validated by the HyperFlex AAA service.
+    """
+    if not isinstance(access_token, str):
+        return False
+    token_claims = _decode_token_claims(access_token)
+    if token_claims is None:
+        return False
+    current_time = time.time()
+    try:
+        if float(token_claims["exp"]) - current_time <= expiry_margin:
+            return False
+        if float(token_claims.get("nbf", 0)) > current_time:
+            return False
+    except (KeyError, TypeError, ValueError):
+        return False
+    return True
+
+
+def _renew_token_file_once(ip,username,password,file_path,stale_access_token,
+                           renewal_strategy,session,timeout=None,
+                           deadline_time=None):
+    """Creates or renews a HyperFlex API token file unless another caller
+    has already replaced the stale token while this caller was waiting. The
+    token file is locked for the duration, so only one process renews it.
+
+    Args:
+        stale_access_token: The access token that failed validation, or None
+            if the token file did not exist.
+        deadline_time: The time.monotonic() value by which the renewal,
+            including the wait for the lock, must finish, or None.
+
+    Returns:
+        The file path of the HyperFlex API token file if a valid token is
+        in place. The value None is returned if renewal failed.
+    """
+    with _token_file_lock(file_path,deadline_time):
+        return _renew_locked_token_file(ip,username,password,file_path,
+                                        stale_access_token,renewal_strategy,
+                                        session,timeout,deadline_time)
+
+
+def _renew_locked_token_file(ip,username,password,file_path,stale_access_token,
+                             renewal_strategy,session,timeout,deadline_time):
+    """Creates or renews a HyperFlex API token file while its lock is held.
+    See the _renew_token_file_once() function for details.
+    """
+    if _token_file_exists(file_path):
+        if stale_access_token is None:
+            logger.debug("The HyperFlex API token file was already created "
+                         "by another caller.")
+            return file_path
+        current_access_token = load_token_file(file_path,"access_token")
+        if current_access_token and current_access_token != stale_access_token:
+            logger.debug("The HyperFlex API token file was already renewed "
+                         "by another caller.")
+            return file_path
+        return renew_token_file(ip,username,password,file_path,
+                                renewal_strategy=renewal_strategy,
+                                session=session,timeout=timeout,
+                                deadline=_remaining_time(deadline_time))
+    return create_token_file(ip,username,password,file_path,session=session,
+                             timeout=timeout,
+                             deadline=_remaining_time(deadline_time))
+
+
+def _coalesce_token_renewal(renewal_key,renewal_function,*args,
+                            deadline_time=None):
+    """Runs a HyperFlex API token renewal once for all concurrent callers in
+    this process with the same renewal key. The first caller performs the
+    renewal and the other callers wait for and share its result.
+
+    Args:
+        renewal_key: A tuple of the IP address, username and file path.
+        renewal_function: The function that performs the renewal.
+        deadline_time: The time.monotonic() value until which a caller
+            waits for a renewal in progress, or None to wait indefinitely.
+
+    Returns:
+        The value returned by the renewal function.
+
+    Raises:
+        DeadlineExceededError: The deadline passed while waiting for a
+            renewal in progress. If the renewal in progress passed its own
+            deadline, a waiting caller with time left performs the renewal
+            itself instead.
+    """
+    while True:
+        with _hx_api_token_renewals_lock:
+            hx_api_token_renewal = _hx_api_token_renewals.get(renewal_key)
+            renewal_leader = hx_api_token_renewal is None
+            if renewal_leader:
+                hx_api_token_renewal = {"done": threading.Event(),
+                                        "result": None,
+                                        "error": None
+                                        }
+                _hx_api_token_renewals[renewal_key] = hx_api_token_renewal
+        if renewal_leader:
+            break
+        logger.debug("Waiting for a HyperFlex API token renewal already in "
+                     "progress...")
+        if not hx_api_token_renewal["done"].wait(
+                _remaining_time(deadline_time)):
+            raise DeadlineExceededError("The deadline of the HyperFlex API "
+                                        "token operation passed while "
+                                        "waiting for a renewal in progress.")
+        renewal_error = hx_api_token_renewal["error"]
+        if renewal_error is None:
+            return hx_api_token_renewal["result"]
+        if not isinstance(renewal_error, DeadlineExceededError):
+            raise renewal_error
+        # The deadline of the renewal in progress passed, so retry the
+        # renewal under the deadline of this caller if any time is left
+        _remaining_time(deadline_time)
+        logger.debug("The HyperFlex API token renewal in progress passed its "
+                     "deadline. Retrying the renewal...")
+    try:
+        hx_api_token_renewal["result"] = renewal_function(*args)
+        return hx_api_token_renewal["result"]
+    except BaseException as exception_message:
+        hx_api_token_renewal["error"] = exception_message
+        raise
+    finally:
+        with _hx_api_token_renewals_lock:
+            del _hx_api_token_renewals[renewal_key]
+        hx_api_token_renewal["done"].set()
+
+
+def _verify_manage_token_file_arguments(data,overwrite,validation_ttl,
+                                        force_validate,renewal_strategy,
+                                        function_name):
+    """Verifies the arguments shared by the manage_token_file() and
+    async_manage_token_file() functions.
+
+    Returns:
+        The validation TTL in seconds, with the module setting
+        DEFAULT_VALIDATION_TTL applied if no value was provided.
+    """
+
+    # Verify the data argument
+    if data not in ("token",
+                    "access_token",
+                    "refresh_token",
+                    "token_type",
+                    "human_readable_time",
+                    "unix_timestamp_time",
+                    "source_module",
+                    "renewal_method"
+                    ):
+        raise ValueError("The argument provided for the requested data type "
+                         "is not valid. Run 'help({})' for "
+                         "available options.".format(function_name))
+    
+    # Verify the overwrite argument
+    if not isinstance(overwrite, bool):
+        raise ValueError("The overwrite setting is not valid. Please provide "
+                         "a Boolean value of True or False for the "
+                         "'overwrite' argument.")
+
+    # Verify the validation_ttl argument
+    if validation_ttl is None:
+        validation_ttl = DEFAULT_VALIDATION_TTL
+    if (not isinstance(validation_ttl, int) or isinstance(validation_ttl, bool)
+            or validation_ttl < 0):
+        raise ValueError("The validation TTL setting is not valid. Please "
+                         "provide a non-negative integer for the "
+                         "'validation_ttl' argument.")
+
+    # Verify the force_validate argument
+    if not isinstance(force_validate, bool):
+        raise ValueError("The force validate setting is not valid. Please "
+                         "provide a Boolean value of True or False for the "
+                         "'force_validate' argument.")
+
+    # Verify the renewal_strategy argument
+    if renewal_strategy not in ("refresh", "login"):
+        raise ValueError("The renewal strategy setting is not valid. Please "
+                         "provide either the value 'refresh' or 'login' in "
+                         "string format for the 'renewal_strategy' "
+                         "argument.")
+
+    return validation_ttl
+
+
+def _manage_token_file_steps(ip,username,password,file_path,data,overwrite,
+                             session,validation_ttl,force_validate,
+                             renewal_strategy,timeout,deadline_time,
+                             offline_validation,aaa_outage_errors):
+    """Makes the decisions of a HyperFlex API token file management process
+    for the manage_token_file() and async_manage_token_file() functions, so
+    both functions follow the same process. Each step that reads the token
+    file or sends requests to the HyperFlex AAA service is yielded as a
+    tuple of the step name and its arguments, and the result of the step is
+    sent back, or its exception thrown back, by the function running the
+    steps. See the _MANAGE_TOKEN_FILE_STEPS dictionary for the steps.
+
+    Args:
+        aaa_outage_errors: The function returning the exception types raised
+            by the validation step when the HyperFlex AAA service is
+            unavailable.
+
+    Returns:
+        The value returned by the management function.
+    """
+    manage_start_time = time.perf_counter()
+    logger.debug("Starting the HyperFlex API token file management process...")
+    # Check for the presence of a pre-existing HyperFlex API token file
+    logger.debug("Checking for the presence of a pre-existing HyperFlex API "
+                 "token file...")
+    if not (yield ("exists", (file_path,))):
+        logger.info("A HyperFlex API token file was not found.")
+        phase_start_time = time.perf_counter()
+        # Create a new HyperFlex API token file, coalescing concurrent callers
+        new_hx_api_token_file = yield ("renew", (
+            ip,username,password,file_path,None,renewal_strategy,session,
+            timeout,deadline_time))
+        # Report a failed renewal, raising if the deadline passed
+        if new_hx_api_token_file is None:
+            _remaining_time(deadline_time)
+            _record_manage_token_file_result(ip,"failed",
+                                             manage_start_time)
+            return
+        # Load the new HyperFlex API token file
+        loaded_new_hx_api_token_file = yield ("load", (
+            new_hx_api_token_file,data))
+        _record_manage_token_file_phase(ip,"create",phase_start_time)
+        _record_manage_token_file_result(ip,"created",manage_start_time)
+        logger.debug("A valid HyperFlex API token is ready.")
+        return loaded_new_hx_api_token_file
+    else:
+        # Load the pre-existing HyperFlex API token file once, so the
+        # requested data, the access token and its creation time all come
+        # from the same version of the file
+        phase_start_time = time.perf_counter()
+        existing_hx_api_token_file_record = yield ("load_record",
+                                                   (file_path,))
+        _record_manage_token_file_phase(ip,"load",phase_start_time)
+        if existing_hx_api_token_file_record is None:
+            logger.warning("The pre-existing HyperFlex API token file could "
+                           "not be loaded.")
+            # No access token matches the empty string, so the unreadable
+            # token file is renewed unless another caller already did
+            stale_access_token = ""
+            validate_loaded_existing_hx_api_token_file = False
+        elif data in ("token",
+                      "access_token",
+                      "refresh_token"
+                      ):
+            loaded_existing_hx_api_token_file = _token_file_data(
+                existing_hx_api_token_file_record,data)
+            existing_hx_api_token = _token_file_data(
+                existing_hx_api_token_file_record,"token")
+            stale_access_token = existing_hx_api_token["access_token"]
+            # Check the pre-existing HyperFlex API token against the cache
+            if force_validate:
+                existing_hx_api_token_trust = "unknown"
+            else:
+                existing_hx_api_token_trust = _check_token_trust(
+                    ip,
+                    stale_access_token,
+                    existing_hx_api_token_file_record["unix_timestamp_time"],
+                    validation_ttl
+                    )
+            if existing_hx_api_token_trust == "trusted":
+                logger.debug("The pre-existing HyperFlex API token is within "
+                             "the validation TTL of %s seconds.",
+                             validation_ttl)
+                _record_manage_token_file_result(ip,"cache_hit",
+                                                 manage_start_time)
+                logger.debug("A valid HyperFlex API token is ready.")
+                return loaded_existing_hx_api_token_file
+            elif existing_hx_api_token_trust == "expired":
+                logger.info("The pre-existing HyperFlex API token is older "
+                            "than the HyperFlex API token lifetime and has "
+                            "expired.")
+                validate_loaded_existing_hx_api_token_file = False
+            else:
+                # Validate the pre-existing HyperFlex API token file
+                logger.debug("Moving to validation of the requested %s "
+                             "data...", data)
+                phase_start_time = time.perf_counter()
+                try:
+                    validate_loaded_existing_hx_api_token_file = yield (
+                        "validate",
+                        (ip,existing_hx_api_token,"READ",session,None,
+                         timeout,deadline_time,(offline_validation
+                                                and not force_validate)))
+                except DeadlineExceededError:
+                    raise
+                except aaa_outage_errors():
+                    # The token is not renewed while the HyperFlex AAA
+                    # service is unavailable, as it may well still be valid
+                    _record_manage_token_file_result(ip,"unavailable",
+                                                     manage_start_time)
+                    raise
+                _record_manage_token_file_phase(ip,"validate",
+                                                phase_start_time)
+            if validate_loaded_existing_hx_api_token_file:
+                _record_token_validation(ip,stale_access_token)
+                _record_manage_token_file_result(ip,"validated",
+                                                 manage_start_time)
+                logger.debug("A valid HyperFlex API token is ready.")
+                return loaded_existing_hx_api_token_file
+            logger.info("The access token in the pre-existing HyperFlex API "
+                        "token file has failed validation.")
+        else:
+            logger.debug("The pre-existing HyperFlex API token file has been "
+                         "loaded. It has not been validated. Set the 'data' "
+                         "argument to 'token', 'access_token' or "
+                         "'refresh_token' to enable automatic validation and "
+                         "renewals of HyperFlex API tokens.")
+            _record_manage_token_file_result(ip,"unvalidated",
+                                             manage_start_time)
+            return _token_file_data(existing_hx_api_token_file_record,data)
+        if overwrite:
+            logger.info("The pre-existing HyperFlex API token file will now "
+                        "be updated with a new valid token...")
+            phase_start_time = time.perf_counter()
+            # Renew the pre-existing HyperFlex API token file, coalescing
+            # concurrent callers
+            new_hx_api_token_file = yield ("renew", (
+                ip,username,password,file_path,stale_access_token,
+                renewal_strategy,session,timeout,deadline_time))
+            # Report a failed renewal, raising if the deadline passed
+            if new_hx_api_token_file is None:
+                _remaining_time(deadline_time)
+                _record_manage_token_file_result(ip,"failed",
+                                                 manage_start_time)
+                return
+            # Load the new HyperFlex API token file
+            loaded_new_hx_api_token_file = yield ("load", (
+                new_hx_api_token_file,data))
+            _record_manage_token_file_phase(ip,"renew",phase_start_time)
+            _record_manage_token_file_result(ip,"renewed",manage_start_time)
+            logger.debug("A valid HyperFlex API token is ready.")
+            return loaded_new_hx_api_token_file
+        logger.warning("The 'overwrite' argument is set to False, so the "
+                       "pre-existing HyperFlex API token file will not be "
+                       "updated.")
+        _record_manage_token_file_result(ip,"not_renewed",manage_start_time)
+        return
+
+
+def _renew_managed_token_file(ip,username,password,file_path,
+                              stale_access_token,renewal_strategy,session,
+                              timeout,deadline_time):
+    """Creates or renews the HyperFlex API token file of a management
+    process, coalescing concurrent callers.
+    """
+    return _coalesce_token_renewal(
+        (ip, username, file_path),_renew_token_file_once,
+        ip,username,password,file_path,stale_access_token,renewal_strategy,
+        session,timeout,deadline_time,deadline_time=deadline_time)
+
+
+# The functions run for each step of a HyperFlex API token file management
+# process in the calling thread
+_MANAGE_TOKEN_FILE_STEPS = {"exists": _token_file_exists,
+                            "load_record": _load_token_file_record,
+                            "load": load_token_file,
+                            "validate": _validate_token,
+                            "renew": _renew_managed_token_file
+                            }
+
+
+def _run_manage_token_file_steps(manage_steps):
+    """Runs the steps yielded by the _manage_token_file_steps() generator in
+    the calling thread and returns the result of the management process.
+    """
+    step_result = step_error = None
+    while True:
+        try:
+            if step_error is None:
+                step_name, step_arguments = manage_steps.send(step_result)
+            else:
+                step_name, step_arguments = manage_steps.throw(step_error)
+        except StopIteration as manage_result:
+            return manage_result.value
+        try:
+            step_result = _MANAGE_TOKEN_FILE_STEPS[step_name](*step_arguments)
+            step_error = None
+        except Exception as exception_message:
+            step_result, step_error = None, exception_message
+
+
+def manage_token_file(ip,username,password,file_path,data="token",overwrite=True,
+                      session=None,validation_ttl=None,force_validate=False,
+                      renewal_strategy="refresh",timeout=None,deadline=None,
+                      offline_validation=False):
+    r"""This is a function that creates or loads a HyperFlex API token file in
+    the XML or JSON token file format, or a SQLite token store entry, and
+    then validates the loaded token data. The format of a pre-existing token
+    file is detected from its content and kept on renewal, and a new token
+    file uses JSON if its name ends with ".json", otherwise XML. If the loaded
+    HyperFlex API access token is not valid, a new access token will be
+    automatically obtained. If there is a no HyperFlex API token file present
+    in the provided file path, a new token file will be automatically created.
+
+    Args:
+        ip: The targeted HyperFlex Connect or Cluster Management IP address.
+            The value must be a string.
+        username: The username credentials that will be used to log into
+            HyperFlex. The value must be a string.
+        password: The password credentials that will be used to log into
+            HyperFlex. The value must be a string.
+        file_path: The file name and storage location to write a HyperFlex API
+            token file. The value must be a string. An example value is
+            "c:\\folder\\file.xml". A SQLiteTokenStore object can also be
+            provided to keep the token in a SQLite token store instead.
+        data: (Optional) The data from a HyperFlex API token file that is
+            returned by the manage_token_file() function. Providing this
+            argument is optional. The default value of "token" is set, which
+            returns the access token, refresh token, and token type as a
+            dictionary. The user provided value must be a string. See the
+            following list for the options available for the 'data' argument
+            and the returned value:
+                1. "token": Returns a dictionary with the access token,
+                    refresh token, and token type.
+                2. "access_token": Returns a string value of only the access
+                    token.
+                3. "refresh_token": Returns a string value of only the
+                    refresh token.
+                4. "token_type": Returns a string value of only the token
+                    type.
+                5. "human_readable_time": Returns a string value of the HyperFlex
+                    API token file creation time in a human-readable format.
+                6. "unix_timestamp_time": Returns a string value of the HyperFlex
+                    API token file creation time in Unix timestamp format.
+                7. "source_module": Returns a string value of the source
+                    module used to create the HyperFlex API token file.
+                8. "renewal_method": Returns a string value of the method
+                    used to obtain the HyperFlex API token, either "login" or
+                    "refresh".
+            NOTE: For automatic validation and renewals of HyperFlex API
+            tokens to occur, the 'data' argument must be set to "token"
+            (default), "access_token", or "refresh_token".
+        overwrite: (Optional) The option to overwrite any pre-existing file at
+            the provided file path value given to the 'file_path' argument.
+            Providing this argument is optional. If the argument is set to the
+            Boolean value True, any pre-existing token file will be
             automatically overwritten. If the argument is set to the Boolean
-            value False, the create_token_file() function will stop and not
+            value False, the manage_token_file() function will stop and not
             proceed with creating a new token file if a pre-existing token
             file is already in place at the given file path location. The
             default value is True.
+            NOTE: For automatic validation and renewals of HyperFlex API
+            tokens to occur, the 'overwrite' argument must be set to the
+            Boolean value True (default). Setting the 'overwrite' argument to
+            the Boolean value False will disable the ability to update
+            pre-existing HyperFlex API token files.
+        session: (Optional) A requests.Session object used to send the
+            request to the HyperFlex AAA service. Providing this argument is
+            optional. If no session is provided, the shared keep-alive session
+            for the IP address from get_hx_api_session() is used.
+        validation_ttl: (Optional) The trust window in seconds for HyperFlex
+            API access tokens. Providing this argument is optional. The value
+            must be an integer. A pre-existing token that was created or
+            successfully validated by this process within the trust window is
+            returned without sending a validation request to the HyperFlex
+            AAA service. A token older than the 18 day HyperFlex API token
+            lifetime is renewed without being validated. If no value is
+            provided, the module setting DEFAULT_VALIDATION_TTL is used, which
+            has a default value of 0 and disables the trust window.
+        force_validate: (Optional) The option to always validate a
+            pre-existing HyperFlex API access token with the HyperFlex AAA
+            service. Providing this argument is optional. If the argument is
+            set to the Boolean value True, the trust window and the token
+            lifetime check are ignored. The default value is False.
+        renewal_strategy: (Optional) The strategy used to renew a pre-existing
+            HyperFlex API token that has failed validation. Providing this
+            argument is optional. The value must be a string. The options are
+            "refresh" or "login". The "refresh" option tries the stored
+            refresh token first and falls back to a username and password
+            login. The "login" option always performs a username and password
+            login. The default value is "refresh".
+        timeout: (Optional) The connect and read timeouts in seconds of
+            each request to the HyperFlex AAA service. Providing this
+            argument is optional. Run 'help(obtain_token)' for details.
+        deadline: (Optional) The maximum number of seconds the function may
+            take. Providing this argument is optional. The value must be a
+            positive number. The time left is carried through validation,
+            waiting for a renewal in progress or the token file lock, and
+            the refresh and login requests, so the whole call is bounded.
+            If the deadline passes, DeadlineExceededError is raised. The
+            default value of None sets no deadline.
+        offline_validation: (Optional) The option to validate a pre-existing
+            access token issued as a JSON Web Token from its expiry claims
+            instead of sending a validation request to the HyperFlex AAA
+            service. Providing this argument is optional. Tokens without
+            expiry claims or near their expiry are still validated by the
+            HyperFlex AAA service, and the option is ignored if the
+            'force_validate' argument is set to True. Run
+            'help(validate_token)' for details. The default value is False.
+
+    Returns:
+        The return is based on the value of the 'data' argument. If the default
+        value of "token" is set, the access token, refresh token, and token
+        type will be returned as a dictionary. See the following list to see
+        the options available for the 'data' argument and the returned value:    
+            1. "token": Returns a dictionary with the access token, refresh
+                token, and token type.
+            2. "access_token": Returns a string value of only the access
+                token.
+            3. "refresh_token": Returns a string value of only the refresh
+                token.
+            4. "token_type": Returns a string value of only the token type.
+            5. "human_readable_time": Returns a string value of the HyperFlex
+                API token file creation time in a human-readable format.
+            6. "unix_timestamp_time": Returns a string value of the HyperFlex
+                API token file creation time in Unix timestamp format.
+            7. "source_module": Returns a string value of the source module
+                used to create the HyperFlex API token file.
+            8. "renewal_method": Returns a string value of the method used
+                to obtain the HyperFlex API token, either "login" or
+                "refresh".
+
+    Raises:
+        Exception: An exception occurred while managing the HyperFlex API token
+            file. The exact error will be specified.
+        CircuitBreakerOpenError: The pre-existing HyperFlex API token could
+            not be validated because the circuit breaker of the HyperFlex
+            cluster is open. The token file is not renewed.
+        requests.exceptions.RequestException: The pre-existing HyperFlex API
+            token could not be validated because the HyperFlex AAA service
+            could not be reached, did not answer in time or answered with a
+            server error. The token file is not renewed. Run
+            'help(validate_token)' for details.
+        DeadlineExceededError: The deadline passed before a valid HyperFlex
+            API token was ready.
+        ValueError: There was an invalid argument provided for the file path,
+            data, overwrite, validation TTL, force validate, renewal strategy,
+            timeout or deadline settings. A recommendation on how to resolve
+            the error will be displayed.
+    """
+
+    # Verify the data, overwrite, validation_ttl, force_validate and
+    # renewal_strategy arguments
+    validation_ttl = _verify_manage_token_file_arguments(
+        data,overwrite,validation_ttl,force_validate,renewal_strategy,
+        "manage_token_file")
+
+    # Verify the timeout and deadline arguments
+    timeout = _verify_timeout_arguments(timeout,deadline)
+    
+    # Resolve a token store to the entry for the IP address and username
+    file_path = _resolve_token_location(ip,username,file_path)
+    # Start the HyperFlex API token file management process
+    return _run_manage_token_file_steps(_manage_token_file_steps(
+        ip,username,password,file_path,data,overwrite,session,validation_ttl,
+        force_validate,renewal_strategy,timeout,_deadline_time(deadline),
+        offline_validation,_aaa_outage_errors))
+
+
+
+def verify_fleet_inventory(inventory):
+    """This is a function that verifies an inventory of HyperFlex clusters
+    in the format used by the manage_token_fleet() function and the
+    HyperFlex API token broker.
+
+    Args:
+        inventory: A list of dictionaries, one for each HyperFlex cluster.
+            Run 'help(manage_token_fleet)' for details.
+
+    Returns:
+        A list of tuples containing the name and the inventory entry of each
+        HyperFlex cluster, in the order of the inventory. The name is the
+        "name" key of the entry, or the IP address if no name is given.
+
+    Raises:
+        ValueError: The inventory is not a list of dictionaries with the
+            required keys, or contains more than one entry with the same
+            name. A recommendation on how to resolve the error will be
+            displayed.
+    """
+
+    if (isinstance(inventory, (str, bytes))
+            or not isinstance(inventory, collections.abc.Iterable)):
+        raise ValueError("The inventory is not valid. Please provide a list "
+                         "of dictionaries for the 'inventory' argument.")
+    fleet_entries = []
+    fleet_entry_names = set()
+    for inventory_entry in inventory:
+        if (not isinstance(inventory_entry, collections.abc.Mapping)
+                or not all(key in inventory_entry for key in ("ip",
+                                                              "username",
+                                                              "password",
+                                                              "file_path"))):
+            raise ValueError("An inventory entry is not valid. Each entry "
+                             "must be a dictionary with the 'ip', "
+                             "'username', 'password' and 'file_path' keys.")
+        fleet_entry_name = inventory_entry.get("name", inventory_entry["ip"])
+        if fleet_entry_name in fleet_entry_names:
+            raise ValueError("The inventory contains more than one entry for "
+                             "{}. Please provide a unique 'name' key for "
+                             "entries that share an IP address.".format(
+                                 fleet_entry_name))
+        fleet_entry_names.add(fleet_entry_name)
+        fleet_entries.append((fleet_entry_name, inventory_entry))
+    return fleet_entries
+
+
+def get_fleet_entry_options(inventory_entry,manage_token_file_options=None):
+    """This is a function that returns the manage_token_file() arguments of a
+    single HyperFlex cluster in an inventory. Any keys of the inventory entry
+    other than "name", "ip", "username", "password" and "file_path" are
+    manage_token_file() arguments for that HyperFlex cluster only.
+
+    Args:
+        inventory_entry: A dictionary for one HyperFlex cluster of an
+            inventory. Run 'help(manage_token_fleet)' for details.
+        manage_token_file_options: (Optional) A dictionary of
+            manage_token_file() arguments shared by all HyperFlex clusters,
+            which the options of the inventory entry override. The default
+            value of None shares no arguments.
+
+    Returns:
+        A dictionary of keyword arguments for the manage_token_file()
+        function.
+    """
+    fleet_entry_options = dict(manage_token_file_options or {})
+    fleet_entry_options.update(
+        {key: value for key, value in inventory_entry.items()
+         if key not in ("name", "ip", "username", "password", "file_path")})
+    return fleet_entry_options
+
+
+def _verify_max_workers_argument(max_workers):
+    """Verifies the maximum number of workers of the fleet and bulk
+    revocation functions.
+    """
+    if not isinstance(max_workers, int) or isinstance(max_workers, bool) or max_workers < 1:
+        raise ValueError("The maximum workers setting is not valid. Please "
+                         "provide a positive integer for the 'max_workers' "
+                         "argument.")
+
+
+def _start_fleet_run(inventory,max_workers):
+    """Verifies the arguments shared by the manage_token_fleet() and
+    async_manage_token_fleet() functions and logs the start of the run.
+
+    Returns:
+        A list of the verified inventory entries. Run
+        'help(verify_fleet_inventory)' for details.
+    """
+    fleet_entries = verify_fleet_inventory(inventory)
+    _verify_max_workers_argument(max_workers)
+    logger.info("Starting the HyperFlex API token fleet management process "
+                "for %s clusters...", len(fleet_entries))
+    return fleet_entries
+
+
+def _fleet_entry_arguments(inventory_entry):
+    """Returns the IP address, username, password and file path of a single
+    HyperFlex cluster in a fleet run as a tuple.
+    """
+    return (inventory_entry["ip"],
+            inventory_entry["username"],
+            inventory_entry["password"],
+            inventory_entry["file_path"])
+
+
+def _finish_fleet_run(fleet_entries,fleet_entry_results):
+    """Keys the results of a fleet run by the name of each inventory entry
+    and logs the completion of the run.
+    """
+    fleet_results = {
+        fleet_entry_name: fleet_entry_result
+        for (fleet_entry_name, inventory_entry), fleet_entry_result
+        in zip(fleet_entries, fleet_entry_results)
+        }
+    logger.info("The HyperFlex API token fleet management process has "
+                "completed. %s of %s clusters succeeded.",
+                sum(1 for fleet_result in fleet_results.values()
+                    if fleet_result["status"] == "success"),
+                len(fleet_results))
+    return fleet_results
+
+
+def _fleet_entry_result(inventory_entry,result,error,start_time):
+    """Builds the result of a single HyperFlex cluster in a fleet run."""
+    return {"ip": inventory_entry["ip"],
+            "file_path": inventory_entry["file_path"],
+            "status": "success" if error is None and result is not None
+                      else "failed",
+            "result": result,
+            "error": error,
+            "duration": time.perf_counter() - start_time
+            }
+
+
+def manage_token_fleet(inventory,max_workers=DEFAULT_FLEET_WORKERS,
+                       **manage_token_file_options):
+    r"""This is a function that runs the manage_token_file() function for
+    many HyperFlex clusters concurrently. The HyperFlex clusters are handled
+    by a bounded pool of worker threads, so a slow or unreachable cluster
+    does not delay the others and the whole run takes about as long as the
+    slowest cluster.
+
+    Args:
+        inventory: A list of dictionaries, one for each HyperFlex cluster.
+            Each dictionary must contain the following keys:
+            1. "ip": The targeted HyperFlex Connect or Cluster Management IP
+                address as a string.
+            2. "username": The username credentials that will be used to log
+                into HyperFlex as a string.
+            3. "password": The password credentials that will be used to log
+                into HyperFlex as a string.
+            4. "file_path": The file name and storage location of the
+                HyperFlex API token file as a string. An example value is
+                "c:\\folder\\file.xml".
+            The optional key "name" sets the key of the HyperFlex cluster in
+            the returned results. The default is the IP address. Any other
+            keys are passed to the manage_token_file() function as arguments
+            for that HyperFlex cluster only, for example "data" or
+            "validation_ttl".
+        max_workers: (Optional) The maximum number of HyperFlex clusters that
+            are managed at the same time. Providing this argument is optional.
+            The value must be an integer. The default value is 16.
+        manage_token_file_options: (Optional) Any additional keyword arguments
+            are passed to the manage_token_file() function for every HyperFlex
+            cluster, for example data="access_token" or validation_ttl=300.
+
+    Returns:
+        A dictionary with the result of each HyperFlex cluster, keyed by the
+        "name" of the inventory entry or the IP address. Each result is a
+        dictionary containing the following keys:
+            1. "ip": The HyperFlex Connect or Cluster Management IP address.
+            2. "file_path": The file path of the HyperFlex API token file.
+            3. "status": The string "success" if the manage_token_file()
+                function returned data, otherwise the string "failed".
+            4. "result": The value returned by the manage_token_file()
+                function.
+            5. "error": A string describing an exception raised while managing
+                the HyperFlex cluster, otherwise None.
+            6. "duration": The time taken to manage the HyperFlex cluster in
+                seconds as a float.
+
+    Raises:
+        ValueError: There was an invalid argument provided for the inventory
+            or the maximum number of workers. A recommendation on how to
+            resolve the error will be displayed.
+    """
+
+    # Verify the inventory and max_workers arguments
+    fleet_entries = _start_fleet_run(inventory,max_workers)
+
+    def manage_fleet_entry(inventory_entry):
+        start_time = time.perf_counter()
+        try:
+            result = manage_token_file(
+                *_fleet_entry_arguments(inventory_entry),
+                **get_fleet_entry_options(inventory_entry,
+                                          manage_token_file_options))
+            return _fleet_entry_result(inventory_entry,result,None,start_time)
+        except Exception as exception_message:
+            return _fleet_entry_result(inventory_entry,None,
+                                       str(exception_message),start_time)
+
+    # Start the HyperFlex API token fleet management process
+    fleet_entry_results = []
+    if fleet_entries:
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(max_workers, len(fleet_entries))) as executor:
+            fleet_entry_results = list(executor.map(
+                manage_fleet_entry,
+                (inventory_entry
+                 for fleet_entry_name, inventory_entry in fleet_entries)))
+    return _finish_fleet_run(fleet_entries,fleet_entry_results)
+
+
+def _verify_revocation_entries(tokens):
+    """Verifies the HyperFlex API tokens given to the bulk revocation
+    functions.
+
+    Returns:
+        A list of the verified entries in the given order.
+    """
+
+    if (isinstance(tokens, (str, bytes))
+            or not isinstance(tokens, collections.abc.Iterable)):
+        raise ValueError("The tokens are not valid. Please provide a list of "
+                         "dictionaries for the 'tokens' argument.")
+    revocation_entries = list(tokens)
+    for revocation_entry in revocation_entries:
+        if (not isinstance(revocation_entry, collections.abc.Mapping)
+                or "ip" not in revocation_entry
+                or ("file_path" in revocation_entry)
+                == ("hx_api_token" in revocation_entry)):
+            raise ValueError("A token entry is not valid. Each entry must be "
+                             "a dictionary with the 'ip' key and either the "
+                             "'file_path' or the 'hx_api_token' key.")
+    return revocation_entries
+
+
+def _start_bulk_revocation(tokens,max_workers):
+    """Verifies the arguments shared by the revoke_tokens() and
+    async_revoke_tokens() functions and logs the start of the revocation.
+
+    Returns:
+        A list of the verified entries in the given order.
+    """
+    revocation_entries = _verify_revocation_entries(tokens)
+    _verify_max_workers_argument(max_workers)
+    logger.info("Starting the revocation of %s HyperFlex API tokens...",
+                len(revocation_entries))
+    return revocation_entries
+
+
+def _finish_bulk_revocation(revocation_results):
+    """Logs the completion of a bulk revocation and returns its results."""
+    logger.info("The revocation of HyperFlex API tokens has completed. %s of "
+                "%s tokens were revoked.",
+                sum(1 for revocation_result in revocation_results
+                    if revocation_result["status"] == "revoked"),
+                len(revocation_results))
+    return revocation_results
+
+
+def _load_revocation_token(revocation_entry):
+    """Returns the HyperFlex API token of a bulk revocation entry, loading it
+    from the token file if needed.
+    """
+    if "hx_api_token" in revocation_entry:
+        return revocation_entry["hx_api_token"]
+    file_path = _resolve_token_location(revocation_entry["ip"],
+                                        revocation_entry.get("username"),
+                                        revocation_entry["file_path"])
+    return load_token_file(file_path)
+
+
+def _revocation_result(revocation_entry,revoked,error,start_time):
+    """Builds the result of a single HyperFlex API token in a bulk
+    revocation.
+    """
+    file_path = revocation_entry.get("file_path")
+    return {"name": revocation_entry.get("name"),
+            "ip": revocation_entry["ip"],
+            "file_path": None if file_path is None else str(file_path),
+            "status": "revoked" if revoked else "failed",
+            "error": error,
+            "duration": time.perf_counter() - start_time
+            }
+
+
+def revoke_tokens(tokens,max_workers=DEFAULT_FLEET_WORKERS,
+                  **revoke_token_options):
+    r"""This is a function that revokes many HyperFlex API access tokens
+    concurrently, for example when tearing down a lab environment. The tokens
+    are revoked by a bounded pool of worker threads, so hundreds of tokens
+    across many HyperFlex clusters are revoked in about the time of the
+    slowest revocations instead of one after another.
+
+    Args:
+        tokens: A list of dictionaries, one for each HyperFlex API token.
+            Each dictionary must contain the "ip" key with the HyperFlex
+            Connect or Cluster Management IP address as a string, and one of
+            the following keys:
+            1. "file_path": The file name and storage location of a
+                HyperFlex API token file. An example value is
+                "c:\folder\file.xml". A SQLiteTokenStore object can also be
+                provided together with a "username" key.
+            2. "hx_api_token": A HyperFlex API token dictionary containing
+                the "access_token", "refresh_token" and "token_type" keys.
+            The optional key "name" is copied to the result of the token.
+        max_workers: (Optional) The maximum number of tokens that are revoked
+            at the same time. Providing this argument is optional. The value
+            must be an integer. The default value is 16.
+        revoke_token_options: (Optional) Any additional keyword arguments are
+            passed to the revoke_token() function for every token, for
+            example deadline=10.
+
+    Returns:
+        A list with the result of each token, in the order of the 'tokens'
+        argument. Each result is a dictionary containing the following keys:
+            1. "name": The "name" of the token entry, otherwise None.
+            2. "ip": The HyperFlex Connect or Cluster Management IP address.
+            3. "file_path": The file path of the HyperFlex API token file,
+                otherwise None.
+            4. "status": The string "revoked" if the token was revoked,
+                otherwise the string "failed".
+            5. "error": A string describing an exception raised while
+                revoking the token, otherwise None.
+            6. "duration": The time taken to revoke the token in seconds as
+                a float.
+
+    Raises:
+        ValueError: There was an invalid argument provided for the tokens or
+            the maximum number of workers. A recommendation on how to resolve
+            the error will be displayed.
+    """
+
+    # Verify the tokens and max_workers arguments
+    revocation_entries = _start_bulk_revocation(tokens,max_workers)
+
+    def revoke_entry(revocation_entry):
+        start_time = time.perf_counter()
+        try:
+            revoked = revoke_token(revocation_entry["ip"],
+                                   _load_revocation_token(revocation_entry),
+                                   **revoke_token_options)
+            return _revocation_result(revocation_entry,revoked,None,
+                                      start_time)
+        except Exception as exception_message:
+            return _revocation_result(revocation_entry,False,
+                                      str(exception_message),start_time)
+
+    # Start the HyperFlex API token bulk revocation process
+    # Plain worker threads are used instead of a ThreadPoolExecutor, which
+    # refuses new work once the interpreter has started to exit
+    revocation_results = [None] * len(revocation_entries)
+    pending_entries = iter(enumerate(revocation_entries))
+    pending_entries_lock = threading.Lock()
+
+    def revocation_worker():
+        while True:
+            with pending_entries_lock:
+                entry_index, revocation_entry = next(pending_entries,
+                                                     (None, None))
+            if revocation_entry is None:
+                return
+            revocation_results[entry_index] = revoke_entry(revocation_entry)
+
+    revocation_workers = [threading.Thread(target=revocation_worker,
+                                           name="hx-api-token-revocation",
+                                           daemon=True)
+                          for _ in range(min(max_workers,
+                                             len(revocation_entries)))]
+    for revocation_worker_thread in revocation_workers:
+        revocation_worker_thread.start()
+    for revocation_worker_thread in revocation_workers:
+        revocation_worker_thread.join()
+    return _finish_bulk_revocation(revocation_results)
+
+
+def _register_issued_token(ip,hx_api_token,refreshed_hx_api_token=None):
+    """Records a HyperFlex API token issued in this process for revocation at
+    exit, if revocation at exit is enabled. For a refreshed token, the token
+    values not returned by the refresh are kept from the previous token.
+    """
+    if _issued_hx_api_tokens is None or not hx_api_token:
+        return
+    if refreshed_hx_api_token is not None:
+        hx_api_token = dict(hx_api_token)
+        hx_api_token.update({key: value for key, value
+                             in refreshed_hx_api_token.items() if value})
+    with _issued_hx_api_tokens_lock:
+        if _issued_hx_api_tokens is not None:
+            _issued_hx_api_tokens[(ip, hx_api_token.get("access_token"))] = (
+                dict(hx_api_token))
+
+
+def _unregister_issued_token(ip,hx_api_token):
+    """Removes a revoked HyperFlex API token from the tokens to be revoked at
+    exit.
+    """
+    if _issued_hx_api_tokens is None:
+        return
+    with _issued_hx_api_tokens_lock:
+        if _issued_hx_api_tokens is not None:
+            _issued_hx_api_tokens.pop((ip, hx_api_token.get("access_token")),
+                                      None)
+
+
+def enable_revocation_at_exit(max_workers=DEFAULT_FLEET_WORKERS,
+                              deadline=DEFAULT_EXIT_REVOCATION_DEADLINE):
+    """This is a function that turns on the registry of HyperFlex API tokens
+    issued in this process. Every token obtained or refreshed after the call
+    is recorded, and all recorded tokens that have not been revoked are
+    revoked concurrently when the Python interpreter exits. This is meant for
+    short-lived lab and test environments. Do not use it in a process whose
+    token files are shared with other processes, because the tokens in those
+    files will stop working.
+
+    Args:
+        max_workers: (Optional) The maximum number of tokens that are revoked
+            at the same time at exit. Providing this argument is optional.
+            The default value is 16.
+        deadline: (Optional) The maximum number of seconds each revocation
+            may take at exit, so an unreachable HyperFlex cluster does not
+            hold up the exit. Providing this argument is optional. The
+            default value is 10.
+    """
+
+    global _issued_hx_api_tokens, _exit_revocation_registered
+    with _issued_hx_api_tokens_lock:
+        if _issued_hx_api_tokens is None:
+            _issued_hx_api_tokens = {}
+        if _exit_revocation_registered:
+            atexit.unregister(revoke_issued_tokens)
+        atexit.register(revoke_issued_tokens,max_workers=max_workers,
+                        deadline=deadline)
+        _exit_revocation_registered = True
+
+
+def disable_revocation_at_exit():
+    """This is a function that turns off the registry of HyperFlex API tokens
+    issued in this process. The recorded tokens are forgotten and will not
+    be revoked at exit.
+
+    Returns:
+        The number of recorded tokens that were forgotten as an integer.
+    """
+
+    global _issued_hx_api_tokens, _exit_revocation_registered
+    with _issued_hx_api_tokens_lock:
+        forgotten_tokens = len(_issued_hx_api_tokens or ())
+        _issued_hx_api_tokens = None
+        if _exit_revocation_registered:
+            atexit.unregister(revoke_issued_tokens)
+            _exit_revocation_registered = False
+    return forgotten_tokens
+
+
+def revoke_issued_tokens(max_workers=DEFAULT_FLEET_WORKERS,**revoke_token_options):
+    """This is a function that revokes all HyperFlex API tokens recorded since
+    enable_revocation_at_exit() was called that have not been revoked yet. It
+    runs automatically at exit, and can also be called directly.
+
+    Args:
+        max_workers: (Optional) The maximum number of tokens that are revoked
+            at the same time. Providing this argument is optional. The default
+            value is 16.
+        revoke_token_options: (Optional) Any additional keyword arguments are
+            passed to the revoke_token() function for every token.
+
+    Returns:
+        A list with the result of each token. Run 'help(revoke_tokens)' for
+        the contents of each result.
+    """
+
+    with _issued_hx_api_tokens_lock:
+        issued_hx_api_tokens = list((_issued_hx_api_tokens or {}).items())
+    return revoke_tokens(
+        [{"ip": ip, "hx_api_token": hx_api_token}
+         for (ip, access_token), hx_api_token in issued_hx_api_tokens],
+        max_workers,**revoke_token_options)
+
+
+class TokenRenewalScheduler:
+    r"""This is a class that renews HyperFlex API token files in the
+    background ahead of their expiry. A background thread tracks the creation
+    time stored in each managed token file and renews the token once it is
+    within the lead time of the 18 day HyperFlex API token lifetime, so
+    consumers calling load_token_file() always find a fresh token.
+
+    Args:
+        lead_time: (Optional) The number of seconds before the end of the
+            HyperFlex API token lifetime at which a token file is renewed.
+            Providing this argument is optional. The value must be an
+            integer. The default value is 86400 (1 day).
+        check_interval: (Optional) The maximum number of seconds between
+            checks of the managed token files. Providing this argument is
+            optional. The value must be a positive integer. The default value
+            is 60.
+        renewal_strategy: (Optional) The strategy used to renew the HyperFlex
+            API tokens. Providing this argument is optional. The options are
+            "refresh" or "login". Run 'help(renew_token_file)' for details.
+            The default value is "refresh".
+
+    Raises:
+        ValueError: There was an invalid argument provided for the lead time,
+            check interval or renewal strategy settings. A recommendation on
+            how to resolve the error will be displayed.
+
+    Example:
+        scheduler = TokenRenewalScheduler(lead_time=6 * 60 * 60)
+        scheduler.add_token_file(ip,username,password,"c:\\folder\\file.xml")
+        scheduler.start()
+    """
+
+    def __init__(self,lead_time=DEFAULT_RENEWAL_LEAD_TIME,
+                 check_interval=DEFAULT_RENEWAL_CHECK_INTERVAL,
+                 renewal_strategy="refresh"):
+        # Verify the lead_time argument
+        if (not isinstance(lead_time, int) or isinstance(lead_time, bool)
+                or not 0 <= lead_time < HX_API_TOKEN_LIFETIME):
+            raise ValueError("The lead time setting is not valid. Please "
+                             "provide a non-negative integer smaller than the "
+                             "HyperFlex API token lifetime for the "
+                             "'lead_time' argument.")
+
+        # Verify the check_interval argument
+        if (not isinstance(check_interval, int)
+                or isinstance(check_interval, bool) or check_interval < 1):
+            raise ValueError("The check interval setting is not valid. Please "
+                             "provide a positive integer for the "
+                             "'check_interval' argument.")
+
+        # Verify the renewal_strategy argument
+        if renewal_strategy not in ("refresh", "login"):
+            raise ValueError("The renewal strategy setting is not valid. "
+                             "Please provide either the value 'refresh' or "
+                             "'login' in string format for the "
+                             "'renewal_strategy' argument.")
+
+        self.lead_time = lead_time
+        self.check_interval = check_interval
+        self.renewal_strategy = renewal_strategy
+        self._token_files = {}
+        self._token_files_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._thread = None
+
+    def add_token_file(self,ip,username,password,file_path):
+        """Adds a HyperFlex API token file to be renewed by the scheduler. A
+        token file that does not exist yet is created on the next check.
+
+        Args:
+            ip: The targeted HyperFlex Connect or Cluster Management IP
+                address. The value must be a string.
+            username: The username credentials that will be used to log into
+                HyperFlex. The value must be a string.
+            password: The password credentials that will be used to log into
+                HyperFlex. The value must be a string.
+            file_path: The file name and storage location of the HyperFlex
+                API token file. The value must be a string. A
+                SQLiteTokenStore object can also be provided to renew the
+                entry for the IP address and username.
+        """
+        file_path = _resolve_token_location(ip,username,file_path)
+        with self._token_files_lock:
+            self._token_files[file_path] = (ip, username, password)
+        self._wake_event.set()
+
+    def remove_token_file(self,file_path,ip=None,username=None):
+        """Stops renewing a HyperFlex API token file. The token file itself is
+        not changed.
+
+        Args:
+            file_path: The file name and storage location of the HyperFlex
+                API token file. The value must be a string. A
+                SQLiteTokenStore object or one of its entries can also be
+                provided.
+            ip: (Optional) The HyperFlex Connect or Cluster Management IP
+                address the token file was added with. The value is required
+                if a SQLiteTokenStore object is provided.
+            username: (Optional) The username the token file was added with.
+                The value is required if a SQLiteTokenStore object is
+                provided.
+
+        Raises:
+            ValueError: A SQLiteTokenStore object was provided without the IP
+                address and username of the entry. A recommendation on how
+                to resolve the error will be displayed.
+        """
+        if isinstance(file_path, SQLiteTokenStore) and (ip is None
+                                                        or username is None):
+            raise ValueError("The IP address and username of the token store "
+                             "entry are not known. Please provide the values "
+                             "used with add_token_file() for the 'ip' and "
+                             "'username' arguments.")
+        file_path = _resolve_token_location(ip,username,file_path)
+        with self._token_files_lock:
+            self._token_files.pop(file_path, None)
+
+    def _next_renewal_time(self,file_path):
+        """Returns the Unix timestamp at which a token file is due for
+        renewal. A missing or unreadable token file is due immediately.
+        """
+        if not _token_file_exists(file_path):
+            return 0
+        try:
+            creation_time = int(load_token_file(file_path,"unix_timestamp_time"))
+        except (TypeError, ValueError):
+            return 0
+        return creation_time + HX_API_TOKEN_LIFETIME - self.lead_time
+
+    def renew_due_token_files(self):
+        """Renews every managed HyperFlex API token file that is within the
+        lead time of the HyperFlex API token lifetime. This is called by the
+        background thread on each check and can also be called directly.
+
+        Returns:
+            A dictionary keyed by file path with the file path returned by the
+            renewal for each token file that was due. The value None marks a
+            failed renewal, which is retried on the next check.
+        """
+        with self._token_files_lock:
+            token_files = dict(self._token_files)
+        renewal_results = {}
+        current_time = _current_unix_timestamp()
+        for file_path, (ip, username, password) in token_files.items():
+            if self._next_renewal_time(file_path) > current_time:
+                continue
+            logger.info("The HyperFlex API token file at %s is due for "
+                        "renewal.", file_path)
+            try:
+                if _token_file_exists(file_path):
+                    # An unreadable token file is renewed as well
+                    stale_access_token = load_token_file(
+                        file_path,"access_token") or ""
+                else:
+                    stale_access_token = None
+                renewal_results[file_path] = _coalesce_token_renewal(
+                    (ip, username, file_path),_renew_token_file_once,
+                    ip,username,password,file_path,stale_access_token,
+                    self.renewal_strategy,None)
+            except Exception as exception_message:
+                logger.error("There was an error renewing the HyperFlex API "
+                             "token file at %s: %s",
+                             file_path, exception_message)
+                renewal_results[file_path] = None
+        return renewal_results
+
+    def _seconds_until_next_check(self):
+        """Returns the number of seconds to wait before the next check."""
+        with self._token_files_lock:
+            file_paths = list(self._token_files)
+        current_time = _current_unix_timestamp()
+        seconds_until_next_check = self.check_interval
+        for file_path in file_paths:
+            seconds_until_renewal = self._next_renewal_time(file_path) - current_time
+            # Token files that are already due are retried at the regular
+            # check interval
+            if seconds_until_renewal > 0:
+                seconds_until_next_check = min(seconds_until_next_check,
+                                               seconds_until_renewal)
+        return seconds_until_next_check
+
+    def _run(self):
+        """Runs the renewal checks until the scheduler is stopped."""
+        while not self._stop_event.is_set():
+            self._wake_event.clear()
+            try:
+                self.renew_due_token_files()
+            except Exception as exception_message:
+                logger.error("There was an error in the HyperFlex API token "
+                             "renewal scheduler: %s", exception_message)
+            self._wake_event.wait(self._seconds_until_next_check())
+
+    def start(self):
+        """Starts the background renewal thread. The thread is a daemon
+        thread, so it does not keep the Python process running on its own.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run,
+                                        name="hx-api-token-renewal",
+                                        daemon=True)
+        self._thread.start()
+        logger.info("The HyperFlex API token renewal scheduler has started.")
+
+    def stop(self,timeout=None):
+        """Stops the background renewal thread and waits for it to finish.
+
+        Args:
+            timeout: (Optional) The maximum number of seconds to wait for the
+                background thread to finish. The default value of None waits
+                until the thread has finished.
+        """
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        logger.info("The HyperFlex API token renewal scheduler has stopped.")
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self,exc_type,exc_value,traceback):
+        self.stop()
+
+
+class TokenPool:
+    r"""This is a class that keeps several valid HyperFlex API tokens for one
+    HyperFlex cluster and hands them out in turn, so parallel API traffic is
+    spread over several bearer tokens instead of sharing one. The tokens are
+    obtained one at a time as the pool is first used, and their renewals are
+    staggered evenly over the HyperFlex API token lifetime, so the pool never
+    renews all of its tokens at once. A due token is no longer handed out
+    while the pool holds another usable token, and is renewed by a background
+    thread, using the refresh token and falling back to a username and
+    password login, so callers of get_token() do not wait for the renewal. A
+    token
+    rejected by the HyperFlex cluster can be reported with the invalidate()
+    method to have it replaced without stalling the other callers.
+
+    Args:
+        ip: The targeted HyperFlex Connect or Cluster Management IP address.
+            The value must be a string.
+        username: The username credentials that will be used to log into
+            HyperFlex. The value must be a string.
+        password: The password credentials that will be used to log into
+            HyperFlex. The value must be a string.
+        size: (Optional) The number of HyperFlex API tokens kept in the pool.
+            Providing this argument is optional. The value must be a positive
+            integer. The default value is 4.
+        handout: (Optional) The order in which the HyperFlex API tokens are
+            handed out. Providing this argument is optional. The options are
+            "round_robin", which cycles through the tokens, or
+            "least_recently_used", which hands out the token that has been
+            idle the longest. The default value is "round_robin".
+        lead_time: (Optional) The number of seconds before the end of the
+            HyperFlex API token lifetime by which every token has been
+            renewed. Providing this argument is optional. The value must be an
+            integer. The default value is 86400 (1 day).
+        session: (Optional) A requests.Session object used to send the
+            requests to the HyperFlex AAA service. Providing this argument is
+            optional. If no session is provided, the shared keep-alive session
+            for the IP address from get_hx_api_session() is used.
+        timeout: (Optional) The timeout of each request to the HyperFlex AAA
+            service. Run 'help(obtain_token)' for details. The default value
+            of None uses the module default timeouts.
+
+    Raises:
+        ValueError: There was an invalid argument provided for the size,
+            handout or lead time settings. A recommendation on how to resolve
+            the error will be displayed.
+
+    Example:
+        pool = TokenPool(ip,username,password,size=8)
+        hx_api_token = pool.get_token()
+        pool.invalidate(hx_api_token)
+    """
+
+    def __init__(self,ip,username,password,size=DEFAULT_TOKEN_POOL_SIZE,
+                 handout="round_robin",lead_time=DEFAULT_RENEWAL_LEAD_TIME,
+                 session=None,timeout=None):
+        # Verify the size argument
+        if not isinstance(size, int) or isinstance(size, bool) or size < 1:
+            raise ValueError("The token pool size setting is not valid. "
+                             "Please provide a positive integer for the "
+                             "'size' argument.")
+
+        # Verify the handout argument
+        if handout not in ("round_robin", "least_recently_used"):
+            raise ValueError("The handout setting is not valid. Please "
+                             "provide either the value 'round_robin' or "
+                             "'least_recently_used' in string format for the "
+                             "'handout' argument.")
+
+        # Verify the lead_time argument
+        if (not isinstance(lead_time, int) or isinstance(lead_time, bool)
+                or not 0 <= lead_time < HX_API_TOKEN_LIFETIME):
+            raise ValueError("The lead time setting is not valid. Please "
+                             "provide a non-negative integer smaller than the "
+                             "HyperFlex API token lifetime for the "
+                             "'lead_time' argument.")
+
+        # Verify the timeout argument
+        _verify_timeout_arguments(timeout,None)
+
+        self.ip = ip
+        self.username = username
+        self.password = password
+        self.size = size
+        self.handout = handout
+        self.lead_time = lead_time
+        self.session = session
+        self.timeout = timeout
+        self._renewal_interval = HX_API_TOKEN_LIFETIME - lead_time
+        self._token_slots = [{"hx_api_token": None,
+                              "renewal_time": 0,
+                              "last_handout_time": 0,
+                              "renewing": False,
+                              "rejected": False
+                              }
+                             for _ in range(size)]
+        self._next_slot_index = 0
+        self._token_slots_lock = threading.Lock()
+        self._renewal_threads = []
+
+    def __repr__(self):
+        return "TokenPool({!r}, size={})".format(self.ip,self.size)
+
+    def _claim_renewal(self,current_time):
+        """Claims the token slot most in need of a token for the calling
+        thread. An empty slot is only claimed if no other empty slot is being
+        filled, so the pool is filled one token at a time.
+
+        Returns:
+            The index of the claimed token slot. The value None is returned if
+            no token slot needs a token.
+        """
+        claimable_slots = [
+            (token_slot["hx_api_token"] is not None,
+             token_slot["renewal_time"],
+             slot_index)
+            for slot_index, token_slot in enumerate(self._token_slots)
+            if not token_slot["renewing"]
+            and token_slot["renewal_time"] <= current_time]
+        if any(token_slot["renewing"] and token_slot["hx_api_token"] is None
+               for token_slot in self._token_slots):
+            claimable_slots = [claimable_slot
+                               for claimable_slot in claimable_slots
+                               if claimable_slot[0]]
+        if not claimable_slots:
+            return
+        slot_index = min(claimable_slots)[2]
+        self._token_slots[slot_index]["renewing"] = True
+        return slot_index
+
+    def _renew_slot(self,slot_index):
+        """Obtains or renews the HyperFlex API token of a claimed token slot.
+        The token is refreshed if possible, otherwise a new token is obtained
+        with a username and password login. No login is attempted if the
+        refresh could not be sent to the HyperFlex AAA service.
+        """
+        with self._token_slots_lock:
+            previous_hx_api_token = self._token_slots[slot_index][
+                "hx_api_token"]
+            filled_slots = sum(token_slot["hx_api_token"] is not None
+                               for token_slot in self._token_slots)
+        renewed_hx_api_token = None
+        renewal_method = "login"
+        try:
+            if previous_hx_api_token and previous_hx_api_token.get(
+                    "refresh_token"):
+                # An unavailable HyperFlex AAA service is raised, so no
+                # login is attempted and the renewal is retried later
+                refreshed_hx_api_token = _refresh_token(
+                    self.ip,previous_hx_api_token,self.session,None,
+                    _verify_timeout_arguments(self.timeout,None),None)
+                if refreshed_hx_api_token:
+                    # Keep any token values not returned by the refresh
+                    renewed_hx_api_token = dict(previous_hx_api_token)
+                    renewed_hx_api_token.update(
+                        {key: value for key, value
+                         in refreshed_hx_api_token.items() if value})
+                    renewal_method = "refresh"
+            if renewed_hx_api_token is None:
+                renewed_hx_api_token = obtain_token(
+                    self.ip,self.username,self.password,session=self.session,
+                    timeout=self.timeout)
+        except Exception as exception_message:
+            logger.error("There was an error renewing a HyperFlex API token "
+                         "of the token pool for %s: %s",
+                         self.ip, exception_message)
+        current_time = time.time()
+        with self._token_slots_lock:
+            token_slot = self._token_slots[slot_index]
+            token_slot["renewing"] = False
+            if not renewed_hx_api_token:
+                # Retry the renewal after the regular check interval
+                token_slot["renewal_time"] = (current_time
+                                              + DEFAULT_RENEWAL_CHECK_INTERVAL)
+                return
+            token_slot["hx_api_token"] = renewed_hx_api_token
+            token_slot["rejected"] = False
+            if previous_hx_api_token is None:
+                # Stagger the first renewal of each token evenly over the
+                # renewal interval
+                token_slot["renewal_time"] = (
+                    current_time
+                    + self._renewal_interval * (filled_slots + 1) / self.size)
+            else:
+                token_slot["renewal_time"] = (current_time
+                                              + self._renewal_interval)
+        _record_metric("hx_api_token_renewals_total",
+                       {"ip": self.ip, "method": renewal_method})
+        logger.info("A HyperFlex API token of the token pool for %s was "
+                    "renewed using a %s.", self.ip,
+                    "refresh token" if renewal_method == "refresh"
+                    else "username and password login")
+
+    def _start_background_renewal(self,slot_index):
+        """Renews a claimed token slot in a background daemon thread."""
+        renewal_thread = threading.Thread(target=self._renew_slot,
+                                          args=(slot_index,),
+                                          name="hx-api-token-pool-renewal",
+                                          daemon=True)
+        with self._token_slots_lock:
+            self._renewal_threads = [
+                running_thread for running_thread in self._renewal_threads
+                if running_thread.is_alive()]
+            self._renewal_threads.append(renewal_thread)
+        renewal_thread.start()
+
+    def _hand_out_slot(self,current_time):
+        """Returns the HyperFlex API token of the next token slot to hand out,
+        or None if no token slot holds a usable token. Token slots that are
+        due for renewal are skipped while another usable token slot is not.
+        """
+        usable_slots = [slot_index
+                        for slot_index, token_slot
+                        in enumerate(self._token_slots)
+                        if token_slot["hx_api_token"] is not None
+                        and not token_slot["rejected"]]
+        if not usable_slots:
+            return
+        current_slots = [usable_slot for usable_slot in usable_slots
+                         if not self._token_slots[usable_slot]["renewing"]
+                         and self._token_slots[usable_slot]["renewal_time"]
+                         > current_time]
+        if current_slots:
+            usable_slots = current_slots
+        if self.handout == "least_recently_used":
+            slot_index = min(usable_slots,
+                             key=lambda usable_slot: self._token_slots[
+                                 usable_slot]["last_handout_time"])
+        else:
+            slot_index = next(
+                (usable_slot for usable_slot in usable_slots
+                 if usable_slot >= self._next_slot_index),
+                usable_slots[0])
+            self._next_slot_index = slot_index + 1
+        token_slot = self._token_slots[slot_index]
+        token_slot["last_handout_time"] = current_time
+        return dict(token_slot["hx_api_token"])
+
+    def get_token(self):
+        """Returns a HyperFlex API token from the pool. Tokens that are due
+        for renewal are skipped in favor of the next usable token. If a token
+        of the pool is due for renewal, or the pool is not yet full, one token
+        is renewed or obtained by a background thread. The calling thread only
+        renews or obtains a token itself, or waits for one, if the pool holds
+        no usable token at all.
+
+        Returns:
+            A HyperFlex API access token, refresh token and token type as
+            key-value pairs in a dictionary. The value None is returned if no
+            HyperFlex API token could be obtained.
+        """
+        with self._token_slots_lock:
+            current_time = time.time()
+            slot_index = self._claim_renewal(current_time)
+            hx_api_token = self._hand_out_slot(current_time)
+        if hx_api_token is not None:
+            if slot_index is not None:
+                # Keep the renewal off the calling thread
+                self._start_background_renewal(slot_index)
+            return hx_api_token
+        if slot_index is not None:
+            self._renew_slot(slot_index)
+        while True:
+            with self._token_slots_lock:
+                current_time = time.time()
+                hx_api_token = self._hand_out_slot(current_time)
+                if hx_api_token is not None:
+                    return hx_api_token
+                renewal_in_progress = any(token_slot["renewing"]
+                                          for token_slot in self._token_slots)
+                slot_index = self._claim_renewal(current_time)
+            if slot_index is not None:
+                self._renew_slot(slot_index)
+            elif renewal_in_progress:
+                time.sleep(0.01)
+            else:
+                logger.error("No HyperFlex API token of the token pool for %s "
+                             "is available.", self.ip)
+                return
+
+    def invalidate(self,hx_api_token):
+        """Reports a HyperFlex API token of the pool that was rejected by the
+        HyperFlex cluster. The token is no longer handed out and is replaced
+        by the next call to get_token(), while the other tokens of the pool
+        remain in use.
+
+        Args:
+            hx_api_token: The rejected HyperFlex API token dictionary, or its
+                access token as a string.
+
+        Returns:
+            The Boolean value True is returned if the token belonged to the
+            pool. Otherwise the Boolean value False is returned.
+        """
+        if isinstance(hx_api_token, collections.abc.Mapping):
+            hx_api_token = hx_api_token.get("access_token")
+        with self._token_slots_lock:
+            for token_slot in self._token_slots:
+                if (token_slot["hx_api_token"] is not None
+                        and token_slot["hx_api_token"]["access_token"]
+                        == hx_api_token):
+                    token_slot["rejected"] = True
+                    if not token_slot["renewing"]:
+                        token_slot["renewal_time"] = 0
+                    return True
+        return False
+
+    def renew_due_tokens(self):
+        """Renews every HyperFlex API token of the pool that is due for
+        renewal and fills any empty token slots in the calling thread. This can
+        be called periodically by a background job or scheduler, so that
+        get_token() rarely finds a due token and no background renewal
+        threads are started.
+
+        Returns:
+            The number of token slots that were renewed or filled as an
+            integer.
+        """
+        renewed_slots = 0
+        while True:
+            with self._token_slots_lock:
+                slot_index = self._claim_renewal(time.time())
+            if slot_index is None:
+                return renewed_slots
+            self._renew_slot(slot_index)
+            renewed_slots += 1
+
+    def close(self,revoke=True):
+        """Empties the pool.
+
+        Args:
+            revoke: (Optional) Set to False to keep the HyperFlex API tokens of
+                the pool valid. By default, the tokens are revoked
+                concurrently with the revoke_tokens() function.
+
+        Returns:
+            A list with the revocation result of each token. Run
+            'help(revoke_tokens)' for the contents of each result. An empty
+            list is returned if the tokens were not revoked.
+        """
+        # Wait for background renewals, so they cannot refill the pool
+        with self._token_slots_lock:
+            renewal_threads = self._renewal_threads
+            self._renewal_threads = []
+        for renewal_thread in renewal_threads:
+            renewal_thread.join()
+        with self._token_slots_lock:
+            hx_api_tokens = [token_slot["hx_api_token"]
+                             for token_slot in self._token_slots
+                             if token_slot["hx_api_token"] is not None]
+            for token_slot in self._token_slots:
+                token_slot.update(hx_api_token=None,renewal_time=0,
+                                  rejected=False)
+        if not revoke or not hx_api_tokens:
+            return []
+        return revoke_tokens([{"ip": self.ip, "hx_api_token": hx_api_token}
+                              for hx_api_token in hx_api_tokens],
+                             session=self.session,timeout=self.timeout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self,exc_type,exc_value,traceback):
+        self.close()
+
+
+class TokenFileAuth:
+    r"""This is a class that authenticates HyperFlex REST API requests sent
+    with the requests module using the HyperFlex API token held in a token
+    file. The bearer token is loaded from the token file, without a
+    validation request, and added to each request. If the HyperFlex cluster
+    rejects the token with an HTTP 401 response, the token file is renewed
+    once, coalescing concurrent callers, and the request is replayed with
+    the new token. This replaces calling manage_token_file() before every
+    HyperFlex API operation, halving the number of requests.
+
+    Args:
+        ip: The targeted HyperFlex Connect or Cluster Management IP address.
+            The value must be a string.
+        username: The username credentials that will be used to log into
+            HyperFlex if the token file must be created or a refresh is not
+            possible. The value must be a string.
+        password: The password credentials that will be used to log into
+            HyperFlex if the token file must be created or a refresh is not
+            possible. The value must be a string.
+        file_path: The file name and storage location of the HyperFlex API
+            token file. The value must be a string. A SQLiteTokenStore object
+            can also be provided. A token file that does not exist yet is
+            created on the first request.
+        renewal_strategy: (Optional) The strategy used to renew the HyperFlex
+            API token after a 401 response. Providing this argument is
+            optional. The options are "refresh" or "login". Run
+            'help(renew_token_file)' for details. The default value is
+            "refresh".
+        session: (Optional) A requests.Session object used to send the
+            renewal requests to the HyperFlex AAA service. Providing this
+            argument is optional. If no session is provided, the shared
+            keep-alive session for the IP address from get_hx_api_session()
+            is used.
+
+    Raises:
+        ValueError: There was an invalid argument provided for the renewal
+            strategy setting. A recommendation on how to resolve the error
+            will be displayed.
+
+    Example:
+        hx_api_session = get_hx_api_session(ip)
+        hx_api_session.auth = TokenFileAuth(ip,username,password,
+                                            "c:\\folder\\file.xml")
+        hx_api_session.get("https://{}/coreapi/v1/clusters".format(ip))
+    """
+
+    # The requests module accepts any callable as an authentication handler,
+    # so the class does not subclass requests.auth.AuthBase, which would
+    # import requests together with the HyperFlex API Token Manager
+
+    def __init__(self,ip,username,password,file_path,renewal_strategy="refresh",
+                 session=None):
+        # Verify the renewal_strategy argument
+        if renewal_strategy not in ("refresh", "login"):
+            raise ValueError("The renewal strategy setting is not valid. "
+                             "Please provide either the value 'refresh' or "
+                             "'login' in string format for the "
+                             "'renewal_strategy' argument.")
+
+        self.ip = ip
+        self.username = username
+        self.password = password
+        self.file_path = _resolve_token_location(ip,username,file_path)
+        self.renewal_strategy = renewal_strategy
+        self.session = session
+
+    def __repr__(self):
+        return "TokenFileAuth(ip={!r}, username={!r}, file_path={!r})".format(
+            self.ip, self.username, str(self.file_path))
+
+    def _renew(self,stale_access_token):
+        """Creates or renews the token file once for all concurrent callers
+        and returns the new HyperFlex API token, or None if renewal failed.
+        """
+        renewed_hx_api_token_file = _coalesce_token_renewal(
+            (self.ip, self.username, self.file_path),_renew_token_file_once,
+            self.ip,self.username,self.password,self.file_path,
+            stale_access_token,self.renewal_strategy,self.session)
+        if renewed_hx_api_token_file is None:
+            return
+        hx_api_token = load_token_file(renewed_hx_api_token_file)
+        _record_token_validation(self.ip,hx_api_token["access_token"])
+        return hx_api_token
+
+    def _current_token(self):
+        """Returns the HyperFlex API token held in the token file, creating
+        the token file if it does not exist yet.
+        """
+        if _token_file_exists(self.file_path):
+            return load_token_file(self.file_path)
+        logger.info("A HyperFlex API token file was not found.")
+        return self._renew(None)
+
+    @staticmethod
+    def _set_authorization(request,hx_api_token):
+        request.headers["Authorization"] = "{} {}".format(
+            hx_api_token["token_type"], hx_api_token["access_token"])
+
+    def __call__(self,request):
+        hx_api_token = self._current_token()
+        if hx_api_token:
+            self._set_authorization(request,hx_api_token)
+            request.register_hook("response",self._handle_401)
+        # Remember the body position so the request can be replayed
+        request.hx_api_body_position = None
+        if hasattr(request.body, "tell"):
+            try:
+                request.hx_api_body_position = request.body.tell()
+            except OSError:
+                pass
+        return request
+
+    def _handle_401(self,response,**kwargs):
+        """Renews the token file after an HTTP 401 response and replays the
+        request once with the new HyperFlex API token.
+        """
+        if response.status_code != 401 or getattr(
+                response.request, "hx_api_token_replayed", False):
+            return response
+        stale_authorization = response.request.headers.get("Authorization","")
+        stale_access_token = stale_authorization.partition(" ")[2] or None
+        # Rewind the request body if it is a stream, or give up if it can't be
+        body_position = getattr(response.request, "hx_api_body_position", None)
+        if hasattr(response.request.body, "read"):
+            if body_position is None:
+                return response
+            response.request.body.seek(body_position)
+        logger.info("The HyperFlex API token was rejected with status 401, "
+                    "renewing the HyperFlex API token file...")
+        hx_api_token = self._renew(stale_access_token)
+        if not hx_api_token:
+            return response
+        # Release the connection of the rejected response and replay
+        response.content
+        response.close()
+        replayed_request = response.request.copy()
+        replayed_request.hx_api_token_replayed = True
+        self._set_authorization(replayed_request,hx_api_token)
+        replayed_response = response.connection.send(replayed_request,**kwargs)
+        replayed_response.history.append(response)
+        replayed_response.request = replayed_request
+        return replayed_response
+
+
+# Establish asynchronous HyperFlex API Token Manager Functions
+
+def get_async_hx_api_session(ip,pool_size=DEFAULT_POOL_SIZE):
+    """This is a function that returns a shared asynchronous HTTP session for
+    a HyperFlex cluster. The session keeps connections to the HyperFlex AAA
+    service alive for reuse, and is used by the asynchronous API token
+    functions when no 'session' argument is provided. The function must be
+    called from a running asyncio event loop, and each event loop is given
+    its own session for the cluster. The shared sessions of an event loop
+    are closed when the event loop shuts down its asynchronous generators,
+    which asyncio.run() does before closing the event loop. Event loops that
+    are managed by hand can call async_close_hx_api_sessions() or
+    loop.shutdown_asyncgens() before closing. The aiohttp module must be
+    installed to use asynchronous sessions.
+
+    Args:
+        ip: The targeted HyperFlex Connect or Cluster Management IP address.
+            The value must be a string.
+        pool_size: (Optional) The maximum number of keep-alive connections
+            held open to the HyperFlex cluster. Providing this argument is
+            optional. The value must be an integer. The setting only applies
+            when the session for the cluster is first created. The default
+            value is 10.
 
     Returns:
-        The file path of the new HyperFlex API token file in XML format is
-        returned if creation was successful. The value None is returned if
-        creating a HyperFlex API token file failed.
+        An aiohttp.ClientSession object for the HyperFlex cluster. The same
+        session object is returned on every call with the same IP address
+        from the same event loop.
 
     Raises:
-        Exception: An exception occurred while creating a HyperFlex API token
-            file. The exact error will be specified.
-        ValueError: There was an invalid argument provided for the overwrite
+        ImportError: The aiohttp module is not installed.
+        RuntimeError: The function was not called from a running asyncio
+            event loop.
+        ValueError: There was an invalid argument provided for the pool size
             setting. A recommendation on how to resolve the error will be
             displayed.
     """
 
-    # Verify the overwrite argument
-    if not isinstance(overwrite, bool):
-        raise ValueError("The overwrite setting is not valid. Please provide "
-                         "a Boolean value of True or False for the "
-                         "'overwrite' argument.")
-    
-    # Start the HyperFlex API token file creation process
-    print("Starting the HyperFlex API token file creation process...")
-    # Check the overwrite argument setting
-    if not overwrite:
-        # Check for the presence of a pre-existing HyperFlex API token file
-        if os.path.isfile(file_path):
-            print("A HyperFlex API token file already exists at the given "
-                  "file path location. No changes have been made.")
-            print("To overwrite the pre-existing file, set the 'overwrite' "
-                  "argument to the Boolean value True.")
-            return
-    # Obtain a new HyperFlex API token
-    hx_api_token = obtain_token(ip,username,password)
+    # Verify the pool_size argument
+    if not isinstance(pool_size, int) or isinstance(pool_size, bool) or pool_size < 1:
+        raise ValueError("The pool size setting is not valid. Please provide "
+                         "a positive integer for the 'pool_size' argument.")
+
+    import aiohttp
+
+    event_loop = asyncio.get_running_loop()
+    with _hx_api_sessions_lock:
+        # Drop the sessions of event loops that were closed without
+        # shutting down, so the loops can be released
+        for hx_api_async_session_key in [key for key in _hx_api_async_sessions
+                                         if key[0].is_closed()]:
+            del _hx_api_async_sessions[hx_api_async_session_key]
+        for closed_event_loop in [key for key
+                                  in _hx_api_async_session_finalizers
+                                  if key.is_closed()]:
+            del _hx_api_async_session_finalizers[closed_event_loop]
+        if event_loop not in _hx_api_async_session_finalizers:
+            # Start a generator that the event loop finalizes on shutdown,
+            # closing the shared sessions of the event loop
+            session_finalizer = _async_close_hx_api_sessions_at_shutdown()
+            _hx_api_async_session_finalizers[event_loop] = session_finalizer
+            try:
+                session_finalizer.asend(None).send(None)
+            except StopIteration:
+                pass
+        hx_api_async_session = _hx_api_async_sessions.get((event_loop, ip))
+        if hx_api_async_session is None or hx_api_async_session.closed:
+            # Establish a new keep-alive session for the HyperFlex cluster
+            hx_api_async_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=pool_size,
+                                               ssl=False)
+                )
+            _hx_api_async_sessions[(event_loop, ip)] = hx_api_async_session
+        return hx_api_async_session
+
+
+async def _async_close_hx_api_sessions_at_shutdown():
+    """An asynchronous generator started once for each event loop by the
+    get_async_hx_api_session() function and never resumed. An event loop
+    finalizes its unfinished asynchronous generators when it shuts down, for
+    example at the end of asyncio.run(), which closes the shared sessions of
+    the event loop.
+    """
     try:
-        # Establish XML file tree nodes
-        hx_api_token_xml_data = et.Element("hx_api_token")
-        token_xml_data = et.SubElement(hx_api_token_xml_data, "token")
-        access_token_xml_data = et.SubElement(token_xml_data, "access_token")
-        refresh_token_xml_data = et.SubElement(token_xml_data, "refresh_token")
-        token_type_xml_data = et.SubElement(token_xml_data, "token_type")
-        creation_time_format_xml_data = et.SubElement(hx_api_token_xml_data,
-                                                      "creation_time_format"
-                                                      )
-        human_readable_time_xml_data = et.SubElement(creation_time_format_xml_data,
-                                                     "human_readable_time"
-                                                     )
-        unix_timestamp_time_xml_data = et.SubElement(creation_time_format_xml_data,
-                                                     "unix_timestamp_time"
-                                                     )
-        source_module_xml_data = et.SubElement(hx_api_token_xml_data,
-                                               "source_module"
-                                               )
-        # Map HyperFlex API token data to XML entries
-        access_token_xml_data.text = hx_api_token["access_token"]
-        refresh_token_xml_data.text = hx_api_token["refresh_token"]
-        token_type_xml_data.text = hx_api_token["token_type"]
-        human_readable_time_xml_data.text = datetime.datetime.utcnow().strftime(
-            "%A, %B %d, %Y at %I:%M:%S %p UTC")
-        unix_timestamp_time_xml_data.text = str(int(datetime.datetime.utcnow(
-            ).timestamp()))
-        if __file__:
-            source_module_xml_data.text = __file__
-        else:
-            source_module_xml_data.text = "N/A"
-        # Establish XML file tree
-        hx_api_token_xml = et.ElementTree(hx_api_token_xml_data)
-        # Write XML file
-        hx_api_token_xml.write(file_path)
-        print("A HyperFlex API token file has been created at {}.".format(
-            file_path)
-              )
-        return file_path
+        yield
+    finally:
+        with _hx_api_sessions_lock:
+            _hx_api_async_session_finalizers.pop(asyncio.get_running_loop(),
+                                                 None)
+        await async_close_hx_api_sessions()
+
+
+async def async_close_hx_api_sessions():
+    """This is a function that closes all shared asynchronous HTTP sessions
+    created by the get_async_hx_api_session() function in the running asyncio
+    event loop and releases their pooled connections.
+
+    Returns:
+        The number of sessions that were closed as an integer.
+    """
+
+    event_loop = asyncio.get_running_loop()
+    with _hx_api_sessions_lock:
+        hx_api_async_session_keys = [key for key in _hx_api_async_sessions
+                                     if key[0] is event_loop]
+        hx_api_async_sessions = [_hx_api_async_sessions.pop(key)
+                                 for key in hx_api_async_session_keys]
+    for hx_api_async_session in hx_api_async_sessions:
+        await hx_api_async_session.close()
+    return len(hx_api_async_sessions)
+
+
+async def async_prewarm_hx_api_sessions(ips,connections=1,
+                                        timeout=DEFAULT_ENDPOINT_PROBE_TIMEOUT):
+    """This is a function that opens keep-alive connections to the HyperFlex
+    AAA service of one or more HyperFlex clusters ahead of time in the shared
+    asynchronous HTTP sessions of the running event loop. It is the awaitable
+    counterpart of the prewarm_hx_api_sessions() function and returns the
+    same results.
+
+    Args:
+        ips: The HyperFlex Connect or Cluster Management IP addresses, or
+            cluster names, to pre-warm. The value must be a string or a list
+            of strings.
+        connections: (Optional) The number of connections opened to each
+            address. Providing this argument is optional. The default value
+            is 1.
+        timeout: (Optional) The number of seconds after which opening a
+            connection counts as failed. Providing this argument is optional.
+            The default value is 2.
+
+    Returns:
+        A dictionary keyed by address with the Boolean value True if all
+        connections to the address were opened, otherwise False.
+
+    Raises:
+        ValueError: There was an invalid argument provided for the
+            connections or timeout settings. A recommendation on how to
+            resolve the error will be displayed.
+    """
+
+    import aiohttp
+
+    # Verify the connections and timeout arguments
+    _verify_prewarm_arguments(connections,timeout)
+
+    prewarm_addresses = _prewarm_addresses(ips)
+    prewarm_results = dict.fromkeys(prewarm_addresses, True)
+
+    async def prewarm_connection(prewarm_address):
+        try:
+            async with get_async_hx_api_session(prewarm_address).post(
+                    "https://{}/aaa/v1/validate".format(prewarm_address),
+                    headers={"Content-Type": "application/json"},
+                    data="{}",
+                    ssl=False,
+                    timeout=aiohttp.ClientTimeout(total=timeout)
+                    ) as probe_response:
+                await probe_response.read()
+                if probe_response.status >= 500:
+                    prewarm_results[prewarm_address] = False
+        except (aiohttp.ClientError, asyncio.TimeoutError) as exception_message:
+            logger.debug("The probe of the HyperFlex AAA service at %s "
+                         "failed: %s", prewarm_address, exception_message)
+            prewarm_results[prewarm_address] = False
+
+    await asyncio.gather(*(prewarm_connection(prewarm_address)
+                           for prewarm_address in prewarm_addresses
+                           for _ in range(connections)))
+    logger.info("Pre-warmed connections to %s of %s HyperFlex AAA "
+                "addresses.", sum(prewarm_results.values()),
+                len(prewarm_results))
+    return prewarm_results
+
+
+async def async_obtain_token(ip,username,password,session=None,
+                             retry_policy=None,timeout=None,
+                             deadline=None):
+    """This is a function that asynchronously obtains a HyperFlex API access
+    token. It is the awaitable counterpart of the obtain_token() function.
+
+    Args:
+        ip: The targeted HyperFlex Connect or Cluster Management IP address.
+            The value must be a string.
+        username: The username credentials that will be used to log into
+            HyperFlex. The value must be a string.
+        password: The password credentials that will be used to log into
+            HyperFlex. The value must be a string.
+        session: (Optional) An aiohttp.ClientSession object used to send the
+            request to the HyperFlex AAA service. Providing this argument is
+            optional. If no session is provided, the shared keep-alive
+            session for the IP address and running event loop from
+            get_async_hx_api_session() is used.
+        retry_policy: (Optional) A RetryPolicy object that sets how
+            transient failures are retried. Providing this argument is
+            optional. If no retry policy is provided, the policy from
+            get_retry_policy() is used.
+        timeout: (Optional) The connect and read timeouts in seconds of
+            each request. Providing this argument is optional. The value
+            must be a number or a tuple of two numbers. If no timeout is
+            provided, the module settings DEFAULT_CONNECT_TIMEOUT and
+            DEFAULT_READ_TIMEOUT are used, which have default values of 5
+            and 30.
+        deadline: (Optional) The maximum number of seconds the function
+            may take, including retries. Providing this argument is
+            optional. The value must be a positive number. The timeouts
+            of each request are shortened to the time left, and no retry
+            is started that could not finish in time. The default value
+            of None sets no deadline.
+
+    Returns:
+        A HyperFlex API access token, refresh token and token type that have
+        been granted as key-value pairs in a dictionary.
+
+    Raises:
+        Exception: There was an error obtaining a HyperFlex API access token.
+            The status code or error message will be specified.
+        ValueError: There was an invalid argument provided for the timeout
+            or deadline settings. A recommendation on how to resolve the
+            error will be displayed.
+    """
+
+    # Verify the timeout and deadline arguments
+    timeout = _verify_timeout_arguments(timeout,deadline)
+    deadline_time = _deadline_time(deadline)
+
+    # Set the HTTP session
+    if session is None:
+        session = get_async_hx_api_session(ip)
+    # Set the Request URL
+    request_url = "https://{}/aaa/v1/auth?grant_type=password".format(ip)
+    # Set the POST body
+    post_body = {
+        "username": username,
+        "password": password,
+        "client_id": "HxGuiClient",
+        "client_secret": "Sunnyvale",
+        "redirect_uri": "http://localhost:8080/aaa/redirect"
+        }
+
+    try:
+        logger.debug("Attempting to obtain a HyperFlex API access token...")
+        # Send the POST request, retrying transient failures
+        async with await _async_send_aaa_request(
+                "obtain_token",ip,session,request_url,post_body,retry_policy,
+                timeout,deadline_time) as obtain_hx_api_token:
+            # Handle POST request response
+            if obtain_hx_api_token.status == 201:
+                hx_api_token = await obtain_hx_api_token.json(content_type=None)
+                _register_issued_token(ip,hx_api_token)
+                logger.info("A HyperFlex API access token was successfully "
+                            "obtained.")
+                return hx_api_token
+            else:
+                logger.error("There was an error obtaining a HyperFlex API "
+                             "access token: Status Code: %s, %s",
+                             obtain_hx_api_token.status,
+                             await obtain_hx_api_token.text())
+                return
+    except Exception as exception_message:
+        logger.error("There was an error obtaining a HyperFlex API access "
+                     "token: %s", exception_message)
+        return
+
+
+async def async_refresh_token(ip,hx_api_token,session=None,retry_policy=None,timeout=None,
+                              deadline=None):
+    """This is a function that asynchronously refreshes or renews a HyperFlex
+    API access token. It is the awaitable counterpart of the refresh_token()
+    function.
+
+    Args:
+        ip: The targeted HyperFlex Connect or Cluster Management IP address.
+            The value must be a string.
+        hx_api_token: A dictionary value for a granted HyperFlex AAA token
+            containing the "access_token", "refresh_token" and "token_type"
+            keys. See help(refresh_token) for details.
+        session: (Optional) An aiohttp.ClientSession object used to send the
+            request to the HyperFlex AAA service. Providing this argument is
+            optional. If no session is provided, the shared keep-alive
+            session for the IP address and running event loop from
+            get_async_hx_api_session() is used.
+        retry_policy: (Optional) A RetryPolicy object that sets how
+            transient failures are retried. Providing this argument is
+            optional. If no retry policy is provided, the policy from
+            get_retry_policy() is used.
+        timeout: (Optional) The connect and read timeouts in seconds of
+            each request. Providing this argument is optional. The value
+            must be a number or a tuple of two numbers. If no timeout is
+            provided, the module settings DEFAULT_CONNECT_TIMEOUT and
+            DEFAULT_READ_TIMEOUT are used, which have default values of 5
+            and 30.
+        deadline: (Optional) The maximum number of seconds the function
+            may take, including retries. Providing this argument is
+            optional. The value must be a positive number. The timeouts
+            of each request are shortened to the time left, and no retry
+            is started that could not finish in time. The default value
+            of None sets no deadline.
+
+    Returns:
+        A HyperFlex API access token, refresh token and token type that have
+        been granted as key-value pairs in a dictionary.
+
+    Raises:
+        Exception: There was an error refreshing the HyperFlex API access
+            token. The status code or error message will be specified.
+        ValueError: There was an invalid argument provided for the HyperFlex
+            API token, timeout or deadline settings. A recommendation on how
+            to resolve the error will be displayed.
+    """
+
+    # Verify the hx_api_token argument
+    if not isinstance(hx_api_token, collections.abc.Mapping):
+        raise ValueError("The argument provided for the HyperFlex API token "
+                         "is not valid. Please provide a valid dictionary "
+                         "for the 'hx_api_token' argument.")
+
+    # Verify the timeout and deadline arguments
+    timeout = _verify_timeout_arguments(timeout,deadline)
+    deadline_time = _deadline_time(deadline)
+
+    try:
+        return await _async_refresh_token(ip,hx_api_token,session,
+                                          retry_policy,timeout,deadline_time)
     except Exception as exception_message:
-        print("There was an error creating a HyperFlex API token file: ")
-        print("{}".format(str(exception_message)))
+        logger.error("There was an error refreshing the HyperFlex API access "
+                     "token: %s", exception_message)
+        return
+
+
+async def _async_refresh_token(ip,hx_api_token,session,retry_policy,timeout,
+                               deadline_time):
+    """Sends a refresh request for a HyperFlex API token to the HyperFlex
+    AAA service with an aiohttp session. It is the awaitable counterpart of
+    the _refresh_token() function and raises the exceptions listed by the
+    _async_aaa_outage_errors() function if the HyperFlex AAA service is
+    unavailable.
+    """
+
+    # Set the HTTP session
+    if session is None:
+        session = get_async_hx_api_session(ip)
+    # Set the Request URL
+    request_url = "https://{}/aaa/v1/token?grant_type=refresh".format(ip)
+    # Set the POST body
+    post_body = {
+        "access_token": hx_api_token["access_token"],
+        "refresh_token": hx_api_token["refresh_token"],
+        "token_type": hx_api_token["token_type"]
+        }
+
+    logger.debug("Attempting to refresh the HyperFlex API access token...")
+    # Send the POST request, retrying transient failures
+    async with await _async_send_aaa_request(
+            "refresh_token",ip,session,request_url,post_body,retry_policy,
+            timeout,deadline_time) as refresh_hx_api_token:
+        # Handle POST request response
+        if refresh_hx_api_token.status == 201:
+            refreshed_hx_api_token = await refresh_hx_api_token.json(
+                content_type=None)
+            _register_issued_token(ip,hx_api_token,refreshed_hx_api_token)
+            logger.info("The HyperFlex API access token was successfully "
+                        "refreshed.")
+            return refreshed_hx_api_token
+        if _is_aaa_outage_status(refresh_hx_api_token.status):
+            refresh_hx_api_token.raise_for_status()
+        logger.error("There was an error refreshing the HyperFlex API access "
+                     "token: Status Code: %s, %s",
+                     refresh_hx_api_token.status,
+                     await refresh_hx_api_token.text())
         return
 
 
-def load_token_file(file_path,data="token"):
-    r"""This is a function that loads data from an XML file containing a
-    HyperFlex API token.
+async def async_validate_token(ip,hx_api_token,scope="READ",session=None,
+                               retry_policy=None,timeout=None,deadline=None,
+                               offline_validation=False):
+    """This is a function that asynchronously validates a HyperFlex API
+    access token. It is the awaitable counterpart of the validate_token()
+    function.
+
+    Args:
+        ip: The targeted HyperFlex Connect or Cluster Management IP address.
+            The value must be a string.
+        hx_api_token: A dictionary value for a granted HyperFlex AAA token
+            containing the "access_token", "refresh_token" and "token_type"
+            keys. See help(validate_token) for details.
+        scope: (Optional) The scope of the validate access token operation.
+            Providing this argument is optional. The value must be a string.
+            The options are "READ" or "MODIFY". The default value is "READ".
+        session: (Optional) An aiohttp.ClientSession object used to send the
+            request to the HyperFlex AAA service. Providing this argument is
+            optional. If no session is provided, the shared keep-alive
+            session for the IP address and running event loop from
+            get_async_hx_api_session() is used.
+        retry_policy: (Optional) A RetryPolicy object that sets how
+            transient failures are retried. Providing this argument is
+            optional. If no retry policy is provided, the policy from
+            get_retry_policy() is used.
+        timeout: (Optional) The connect and read timeouts in seconds of
+            each request. Providing this argument is optional. The value
+            must be a number or a tuple of two numbers. If no timeout is
+            provided, the module settings DEFAULT_CONNECT_TIMEOUT and
+            DEFAULT_READ_TIMEOUT are used, which have default values of 5
+            and 30.
+        deadline: (Optional) The maximum number of seconds the function
+            may take, including retries. Providing this argument is
+            optional. The value must be a positive number. The timeouts
+            of each request are shortened to the time left, and no retry
+            is started that could not finish in time. The default value
+            of None sets no deadline.
+        offline_validation: (Optional) The option to validate an access
+            token issued as a JSON Web Token from its expiry claims,
+            without a request to the HyperFlex AAA service. Providing
+            this argument is optional. A "READ" scope token whose "exp"
+            claim is more than DEFAULT_TOKEN_EXPIRY_MARGIN seconds (300
+            by default) in the future is reported as valid. Tokens
+            without expiry claims, near their expiry or validated for the
+            "MODIFY" scope are validated by the HyperFlex AAA service. A
+            revoked token is not detected offline. The default value is
+            False.
+
+    Returns:
+        The Boolean value True is returned for a successful validation. The
+        Boolean value False is returned if the HyperFlex AAA service rejects
+        the access token, or if the access token could not be validated
+        because the HyperFlex AAA service is unavailable or the deadline
+        passed.
+
+    Raises:
+        ValueError: There was an invalid argument provided for the HyperFlex
+            API token, desired scope operation, timeout or deadline settings.
+            A recommendation on how to resolve the error will be displayed.
+    """
+
+    # Verify the hx_api_token argument
+    if not isinstance(hx_api_token, collections.abc.Mapping):
+        raise ValueError("The argument provided for the HyperFlex API token "
+                         "is not valid. Please provide a valid dictionary "
+                         "for the 'hx_api_token' argument.")
+
+    # Verify the scope argument
+    if scope not in ("READ", "MODIFY"):
+        raise ValueError("The argument provided for the scope operation is "
+                         "not valid. Please provide either the value 'READ' "
+                         "or 'MODIFY' in string format for the 'scope' "
+                         "argument.")
+
+    # Verify the timeout and deadline arguments
+    timeout = _verify_timeout_arguments(timeout,deadline)
+    deadline_time = _deadline_time(deadline)
+
+    try:
+        return await _async_validate_token(ip,hx_api_token,scope,session,
+                                           retry_policy,timeout,deadline_time,
+                                           offline_validation)
+    except (DeadlineExceededError,) + _async_aaa_outage_errors():
+        # The error has been logged. An unavailable HyperFlex AAA service is
+        # only raised to the async_manage_token_file() function
+        return False
+
+
+async def _async_validate_token(ip,hx_api_token,scope,session,retry_policy,
+                                timeout,deadline_time,offline_validation):
+    """Validates a HyperFlex API access token. It is the awaitable
+    counterpart of the _validate_token() function.
+
+    Raises:
+        DeadlineExceededError: The deadline passed before the access token
+            could be validated.
+        The exceptions listed by the _async_aaa_outage_errors() function if
+        the HyperFlex AAA service is unavailable.
+    """
+
+    # Validate the access token offline from its expiry claims
+    if offline_validation and scope == "READ":
+        if _check_token_claims(hx_api_token["access_token"]):
+            _record_metric("hx_api_token_offline_validations_total",
+                           {"ip": ip, "result": "valid"})
+            logger.debug("The HyperFlex API access token was validated "
+                         "offline from its expiry claims.")
+            return True
+        _record_metric("hx_api_token_offline_validations_total",
+                       {"ip": ip, "result": "fallback"})
+
+    # Set the HTTP session
+    if session is None:
+        session = get_async_hx_api_session(ip)
+    # Set the Request URL
+    request_url = "https://{}/aaa/v1/validate".format(ip)
+    # Set the POST body
+    post_body = {
+        "access_token": hx_api_token["access_token"],
+        "scope": scope,
+        "token_type": hx_api_token["token_type"]
+        }
+
+    try:
+        logger.debug("Attempting to validate the HyperFlex API access "
+                     "token...")
+        # Send the POST request, retrying transient failures
+        async with await _async_send_aaa_request(
+                "validate_token",ip,session,request_url,post_body,retry_policy,
+                timeout,deadline_time) as validate_hx_api_token:
+            # Handle POST request response
+            if validate_hx_api_token.status == 200:
+                logger.debug("The HyperFlex API access token was "
+                             "successfully validated.")
+                return True
+            elif _is_aaa_outage_status(validate_hx_api_token.status):
+                validate_hx_api_token.raise_for_status()
+            else:
+                logger.error("There was an error validating the HyperFlex "
+                             "API access token: Status Code: %s, %s",
+                             validate_hx_api_token.status,
+                             await validate_hx_api_token.text())
+                return False
+    except DeadlineExceededError:
+        logger.error("The HyperFlex API access token could not be validated "
+                     "before the deadline passed.")
+        raise
+    except _async_aaa_outage_errors() as exception_message:
+        # An unavailable HyperFlex AAA service says nothing about the token
+        logger.error("The HyperFlex API access token could not be validated "
+                     "because the HyperFlex AAA service is unavailable: %s",
+                     exception_message)
+        raise
+    except Exception as exception_message:
+        logger.error("There was an error validating the HyperFlex API access "
+                     "token: %s", exception_message)
+        return False
+
+
+async def async_revoke_token(ip,hx_api_token,session=None,retry_policy=None,timeout=None,
+                             deadline=None):
+    """This is a function that asynchronously revokes a HyperFlex API access
+    token. It is the awaitable counterpart of the revoke_token() function.
+
+    Args:
+        ip: The targeted HyperFlex Connect or Cluster Management IP address.
+            The value must be a string.
+        hx_api_token: A dictionary value for a granted HyperFlex AAA token
+            containing the "access_token", "refresh_token" and "token_type"
+            keys. See help(revoke_token) for details.
+        session: (Optional) An aiohttp.ClientSession object used to send the
+            request to the HyperFlex AAA service. Providing this argument is
+            optional. If no session is provided, the shared keep-alive
+            session for the IP address and running event loop from
+            get_async_hx_api_session() is used.
+        retry_policy: (Optional) A RetryPolicy object that sets how
+            transient failures are retried. Providing this argument is
+            optional. If no retry policy is provided, the policy from
+            get_retry_policy() is used.
+        timeout: (Optional) The connect and read timeouts in seconds of
+            each request. Providing this argument is optional. The value
+            must be a number or a tuple of two numbers. If no timeout is
+            provided, the module settings DEFAULT_CONNECT_TIMEOUT and
+            DEFAULT_READ_TIMEOUT are used, which have default values of 5
+            and 30.
+        deadline: (Optional) The maximum number of seconds the function
+            may take, including retries. Providing this argument is
+            optional. The value must be a positive number. The timeouts
+            of each request are shortened to the time left, and no retry
+            is started that could not finish in time. The default value
+            of None sets no deadline.
+
+    Returns:
+        The Boolean value True is returned for a successful revocation. The
+        Boolean value False is returned if the revocation fails.
+
+    Raises:
+        Exception: There was an error performing the revocation of the
+            HyperFlex API access token. The status code or error message will
+            be specified.
+        ValueError: There was an invalid argument provided for the HyperFlex
+            API token, timeout or deadline settings. A recommendation on how
+            to resolve the error will be displayed.
+    """
+
+    # Verify the hx_api_token argument
+    if not isinstance(hx_api_token, collections.abc.Mapping):
+        raise ValueError("The argument provided for the HyperFlex API token "
+                         "is not valid. Please provide a valid dictionary "
+                         "for the 'hx_api_token' argument.")
+
+    # Verify the timeout and deadline arguments
+    timeout = _verify_timeout_arguments(timeout,deadline)
+    deadline_time = _deadline_time(deadline)
+
+    # Set the HTTP session
+    if session is None:
+        session = get_async_hx_api_session(ip)
+    # Set the Request URL
+    request_url = "https://{}/aaa/v1/revoke".format(ip)
+    # Set the POST body
+    post_body = {
+        "access_token": hx_api_token["access_token"],
+        "refresh_token": hx_api_token["refresh_token"],
+        "token_type": hx_api_token["token_type"]
+        }
+
+    try:
+        logger.debug("Attempting to revoke the HyperFlex API access token...")
+        # Send the POST request, retrying transient failures
+        async with await _async_send_aaa_request(
+                "revoke_token",ip,session,request_url,post_body,retry_policy,
+                timeout,deadline_time) as revoke_hx_api_token:
+            # Handle POST request response
+            if revoke_hx_api_token.status == 200:
+                _unregister_issued_token(ip,hx_api_token)
+                logger.info("The HyperFlex API access token was successfully "
+                            "revoked.")
+                return True
+            else:
+                logger.error("There was an error revoking the HyperFlex API "
+                             "access token: Status Code: %s, %s",
+                             revoke_hx_api_token.status,
+                             await revoke_hx_api_token.text())
+                return False
+    except Exception as exception_message:
+        logger.error("There was an error revoking the HyperFlex API access "
+                     "token: %s", exception_message)
+        return False
+
+
+async def async_create_token_file(ip,username,password,file_path,overwrite=True,
+                                  session=None,file_format=None,timeout=None,
+                                  deadline=None):
+    r"""This is a function that asynchronously creates a token file
+    containing a newly issued HyperFlex API token. It is the awaitable counterpart of the
+    create_token_file() function.
+
+    Args:
+        ip: The targeted HyperFlex Connect or Cluster Management IP address.
+            The value must be a string.
+        username: The username credentials that will be used to log into
+            HyperFlex. The value must be a string.
+        password: The password credentials that will be used to log into
+            HyperFlex. The value must be a string.
+        file_path: The file name and storage location to write a HyperFlex API
+            token file. The value must be a string. An example value is
+            "c:\\folder\\file.xml". A SQLiteTokenStore object can also be
+            provided to keep the token in a SQLite token store instead.
+        overwrite: (Optional) The option to overwrite any pre-existing file at
+            the provided file path value given to the 'file_path' argument.
+            Providing this argument is optional. The default value is True.
+        session: (Optional) An aiohttp.ClientSession object used to send the
+            request to the HyperFlex AAA service. Providing this argument is
+            optional. If no session is provided, the shared keep-alive
+            session for the IP address and running event loop from
+            get_async_hx_api_session() is used.
+        file_format: (Optional) The format of the HyperFlex API token file.
+            Providing this argument is optional. The value must be a string.
+            The options are "xml" or "json". The "json" option writes a
+            compact JSON token file that loads faster than XML. The
+            load_token_file() function detects the format automatically. The
+            default value of None keeps the format of a pre-existing token
+            file, and otherwise uses JSON if the file name ends with ".json"
+            and XML for any other file name.
+        timeout: (Optional) The connect and read timeouts in seconds of
+            each request to the HyperFlex AAA service. Providing this
+            argument is optional. Run 'help(obtain_token)' for details.
+        deadline: (Optional) The maximum number of seconds the function
+            may take. Providing this argument is optional. The value must
+            be a positive number. The default value of None sets no
+            deadline.
+
+    Returns:
+        The file path of the new HyperFlex API token file is returned if
+        creation was successful. The token file is written in XML or JSON
+        format, as chosen by the 'file_format' argument. If a SQLiteTokenStore
+        object was provided, the SQLiteTokenStoreEntry of the stored token
+        is returned instead. The value None is returned if creating a
+        HyperFlex API token file failed.
+
+    Raises:
+        Exception: An exception occurred while creating a HyperFlex API token
+            file. The exact error will be specified.
+        ValueError: There was an invalid argument provided for the overwrite,
+            file format, timeout or deadline settings. A recommendation on how
+            to resolve the error will be displayed.
+    """
+
+    # Verify the overwrite argument
+    if not isinstance(overwrite, bool):
+        raise ValueError("The overwrite setting is not valid. Please provide "
+                         "a Boolean value of True or False for the "
+                         "'overwrite' argument.")
+
+    # Verify the file_format argument
+    _verify_token_file_format(file_format)
+
+    # Resolve a token store to the entry for the IP address and username
+    file_path = _resolve_token_location(ip,username,file_path)
+    # Start the HyperFlex API token file creation process
+    logger.debug("Starting the HyperFlex API token file creation process...")
+    # Check the overwrite argument setting
+    if not overwrite:
+        # Check for the presence of a pre-existing HyperFlex API token file
+        if await asyncio.to_thread(_token_file_exists,file_path):
+            logger.info("A HyperFlex API token file already exists at the "
+                        "given file path location. No changes have been "
+                        "made. To overwrite the pre-existing file, set the "
+                        "'overwrite' argument to the Boolean value True.")
+            return
+    # Obtain a new HyperFlex API token
+    hx_api_token = await async_obtain_token(ip,username,password,
+                                            session=session,timeout=timeout,
+                                            deadline=deadline)
+    # Write the new HyperFlex API token file in a worker thread, as the
+    # write is flushed to disk
+    return await asyncio.to_thread(_write_token_file,hx_api_token,file_path,
+                                   "login",file_format)
+
+
+async def async_renew_token_file(ip,username,password,file_path,
+                                 renewal_strategy="refresh",session=None,
+                                 timeout=None,deadline=None):
+    r"""This is a function that asynchronously renews the HyperFlex API token
+    held in a token file. It is the awaitable counterpart of the
+    renew_token_file() function.
 
     Args:
-        file_path: The file name and storage location from which to load a
-            HyperFlex API token file. The value must be a string. An example
-            value is "c:\\folder\\file.xml".
-        data: (Optional) The data from a HyperFlex API token file that is
-            returned by the load_token_file() function. Providing this
-            argument is optional. The default value of "token" is set, which
-            returns the access token, refresh token, and token type as a
-            dictionary. The user provided value must be a string. See the
-            following list for the options available for the 'data' argument and
-            the returned value:
-            1. "token": Returns a dictionary with the access token, refresh
-                token, and token type.
-            2. "access_token": Returns a string value of only the access
-                token.
-            3. "refresh_token": Returns a string value of only the refresh
-                token.
-            4. "token_type": Returns a string value of only the token type.
-            5. "human_readable_time": Returns a string value of the HyperFlex API
-                token file creation time in a human-readable format.
-            6. "unix_timestamp_time": Returns a string value of the HyperFlex API
-                token file creation time in Unix timestamp format.
-            7. "source_module": Returns a string value of the source module
-                used to create the HyperFlex API token file.
-    
+        ip: The targeted HyperFlex Connect or Cluster Management IP address.
+            The value must be a string.
+        username: The username credentials that will be used to log into
+            HyperFlex if a refresh is not possible. The value must be a
+            string.
+        password: The password credentials that will be used to log into
+            HyperFlex if a refresh is not possible. The value must be a
+            string.
+        file_path: The file name and storage location of the HyperFlex API
+            token file. The value must be a string. An example value is
+            "c:\\folder\\file.xml". A SQLiteTokenStore object can also be
+            provided to keep the token in a SQLite token store instead.
+        renewal_strategy: (Optional) The strategy used to renew the HyperFlex
+            API token. Providing this argument is optional. The value must be
+            a string. The options are "refresh" or "login". The default value
+            is "refresh".
+        session: (Optional) An aiohttp.ClientSession object used to send the
+            request to the HyperFlex AAA service. Providing this argument is
+            optional. If no session is provided, the shared keep-alive
+            session for the IP address and running event loop from
+            get_async_hx_api_session() is used.
+        timeout: (Optional) The connect and read timeouts in seconds of
+            each request to the HyperFlex AAA service. Providing this
+            argument is optional. Run 'help(obtain_token)' for details.
+        deadline: (Optional) The maximum number of seconds the function
+            may take. Providing this argument is optional. The value must
+            be a positive number. The default value of None sets no
+            deadline.
+
     Returns:
-        The return is based on the value of the 'data' argument. If the default
-        value of "token" is set, the access token, refresh token, and token
-        type will be returned as a dictionary. See the following list to see
-        the options available for the 'data' argument and the returned value:
-            1. "token": Returns a dictionary with the access token, refresh
-                token, and token type.
-            2. "access_token": Returns a string value of only the access token.
-            3. "refresh_token": Returns a string value of only the refresh token.
-            4. "token_type": Returns a string value of only the token type.
-            5. "human_readable_time": Returns a string value of the HyperFlex
-                API token file creation time in a human-readable format.
-            6. "unix_timestamp_time": Returns a string value of the HyperFlex
-                API token file creation time in Unix timestamp format.
-            7. "source_module": Returns a string value of the source module
-                used to create the HyperFlex API token file.
+        The file path of the renewed HyperFlex API token file is returned if
+        renewal was successful. The token file keeps its XML or JSON format.
+        If a SQLiteTokenStore object was provided, the SQLiteTokenStoreEntry
+        of the stored token is returned instead. The value None is returned
+        if renewing the HyperFlex API token file failed.
 
     Raises:
-        Exception: An exception occurred while loading the HyperFlex API token
-            file. The exact error will be specified.
-        ValueError: There was an invalid argument provided for the file path
-            or data setting. A recommendation on how to resolve the error will
-            be displayed.
+        Exception: An exception occurred while renewing the HyperFlex API
+            token file. The exact error will be specified.
+        ValueError: There was an invalid argument provided for the renewal
+            strategy, timeout or deadline settings. A recommendation on how to
+            resolve the error will be displayed.
     """
 
-    # Verify the file_path argument
-    if not os.path.isfile(file_path):
-        raise ValueError(r"The file at the provided file path does not exist. "
-                         "Please provide the file path to a valid file in "
-                         "string format for the 'file_path' argument. An "
-                         "example value is 'c:\\folder\\file.xml'.")
+    # Verify the renewal_strategy argument
+    if renewal_strategy not in ("refresh", "login"):
+        raise ValueError("The renewal strategy setting is not valid. Please "
+                         "provide either the value 'refresh' or 'login' in "
+                         "string format for the 'renewal_strategy' "
+                         "argument.")
 
-    # Verify the data argument
-    if data not in ("token",
-                    "access_token",
-                    "refresh_token",
-                    "token_type",
-                    "human_readable_time",
-                    "unix_timestamp_time",
-                    "source_module"
-                    ):
-        raise ValueError("The argument provided for the requested data type "
-                         "is not valid. Run 'help(load_token_file)' for "
-                         "available options.")
+    # Verify the timeout and deadline arguments
+    timeout = _verify_timeout_arguments(timeout,deadline)
+    deadline_time = _deadline_time(deadline)
 
-    # Start the HyperFlex API token file loading process
-    print("Starting the HyperFlex API token file loading process...")
-    # Verify the presence of the HyperFlex API token file and load data
-    print("Verifying the presence of the HyperFlex API token file...")
+    # Resolve a token store to the entry for the IP address and username
+    file_path = _resolve_token_location(ip,username,file_path)
+    # Start the HyperFlex API token file renewal process
+    logger.debug("Starting the HyperFlex API token file renewal process...")
+    if (renewal_strategy == "refresh"
+            and await asyncio.to_thread(_token_file_exists,file_path)):
+        # Refresh the pre-existing HyperFlex API token
+        existing_hx_api_token = await asyncio.to_thread(load_token_file,
+                                                        file_path)
+        if existing_hx_api_token and existing_hx_api_token["refresh_token"]:
+            try:
+                refreshed_hx_api_token = await _async_refresh_token(
+                    ip,existing_hx_api_token,session,None,timeout,
+                    deadline_time)
+            except DeadlineExceededError:
+                # asyncio.TimeoutError also matches an exceeded deadline
+                raise
+            except _async_aaa_outage_errors() as exception_message:
+                # A login would fail in the same way and only adds load
+                logger.error("The HyperFlex API token could not be refreshed "
+                             "because the HyperFlex AAA service is "
+                             "unavailable, so no username and password login "
+                             "is attempted: %s", exception_message)
+                return
+            except Exception as exception_message:
+                logger.error("There was an error refreshing the HyperFlex "
+                             "API access token: %s", exception_message)
+                refreshed_hx_api_token = None
+            if refreshed_hx_api_token:
+                # Keep any token values not returned by the refresh
+                renewed_hx_api_token = dict(existing_hx_api_token)
+                renewed_hx_api_token.update(
+                    {key: value for key, value in refreshed_hx_api_token.items()
+                     if value})
+                renewed_hx_api_token_file = await asyncio.to_thread(
+                    _write_token_file,renewed_hx_api_token,file_path,
+                    "refresh")
+                if renewed_hx_api_token_file:
+                    _record_metric("hx_api_token_renewals_total",
+                                   {"ip": ip, "method": "refresh"})
+                    logger.info("The HyperFlex API token file was renewed "
+                                "using the refresh token.")
+                    return renewed_hx_api_token_file
+        logger.warning("The HyperFlex API token could not be refreshed, "
+                       "falling back to a username and password login...")
+    # Obtain a new HyperFlex API token
+    hx_api_token = await async_obtain_token(
+        ip,username,password,session=session,timeout=timeout,
+        deadline=_remaining_time(deadline_time))
+    renewed_hx_api_token_file = await asyncio.to_thread(
+        _write_token_file,hx_api_token,file_path,"login")
+    if renewed_hx_api_token_file:
+        _record_metric("hx_api_token_renewals_total",
+                       {"ip": ip, "method": "login"})
+        logger.info("The HyperFlex API token file was renewed using a "
+                    "username and password login.")
+    return renewed_hx_api_token_file
+
+
+def _release_abandoned_token_file_lock(lock_acquisition):
+    """Releases a token file lock acquired by a worker thread for a task that
+    was cancelled while waiting for it.
+    """
+    if (not lock_acquisition.cancelled()
+            and lock_acquisition.exception() is None
+            and lock_acquisition.result() is not None):
+        _release_token_file_lock(lock_acquisition.result())
+
+
+async def _async_renew_token_file_once(ip,username,password,file_path,
+                                      stale_access_token,renewal_strategy,
+                                      session,timeout=None,
+                                      deadline_time=None):
+    """Creates or renews a HyperFlex API token file unless another caller
+    has already replaced the stale token. It is the awaitable counterpart of
+    the _renew_token_file_once() function. The token file lock is polled
+    without blocking from a worker thread, so the event loop keeps running
+    while another process holds the lock.
+    """
+    while True:
+        lock_acquisition = asyncio.ensure_future(asyncio.to_thread(
+            _acquire_token_file_lock,file_path,False))
+        try:
+            lock_file = await asyncio.shield(lock_acquisition)
+        except asyncio.CancelledError:
+            # Release the lock if the worker thread acquires it after this
+            # task was cancelled
+            lock_acquisition.add_done_callback(
+                _release_abandoned_token_file_lock)
+            raise
+        if lock_file is not None:
+            break
+        remaining_time = _remaining_time(deadline_time)
+        await asyncio.sleep(0.05 if remaining_time is None
+                            else min(0.05, remaining_time))
     try:
-        if not os.path.isfile(file_path):
-            print("The HyperFlex API token file was not found.")
-            return
-        else:
-            print("The HyperFlex API token file was found, proceeding with "
-                  "loading data from the file...")
-            # Load and parse the XML data in the HyperFlex API token file
-            hx_api_token_xml_data = et.parse(file_path)
-            # Map the XML data to the potential return data values
-            access_token_data = hx_api_token_xml_data.find(
-                "token/access_token").text
-            refresh_token_data = hx_api_token_xml_data.find(
-                "token/refresh_token").text
-            token_type_data = hx_api_token_xml_data.find(
-                "token/token_type").text
-            human_readable_time_data = hx_api_token_xml_data.find(
-                "creation_time_format/human_readable_time").text
-            unix_timestamp_time_data = hx_api_token_xml_data.find(
-                "creation_time_format/unix_timestamp_time").text
-            source_module_data = hx_api_token_xml_data.find(
-                "source_module").text
-            token_data = {"access_token": access_token_data,
-                          "refresh_token": refresh_token_data,
-                          "token_type": token_type_data
-                          }
-        print("The HyperFlex API token file has been loaded.")
-        # Return the value mapped to the data argument setting
-        if data == "token":
-            print("The requested token data has been returned.")
-            return token_data
-        elif data == "access_token":
-            print("The requested access token data has been returned.")
-            return access_token_data
-        elif data == "refresh_token":
-            print("The requested refresh token data has been returned.")
-            return refresh_token_data
-        elif data == "token_type":
-            print("The requested token type data has been returned.")
-            return token_type_data
-        elif data == "human_readable_time":
-            print("The requested human readable time data has been returned.")
-            return human_readable_time_data
-        elif data == "unix_timestamp_time":
-            print("The requested Unix timestamp data has been returned.")
-            return unix_timestamp_time_data
-        elif data == "source_module":
-            print("The requested source module data has been returned.")
-            return source_module_data
-        else:
-            print("No data has been returned, a valid value for the 'data' "
-                  "argument needs to be provided.",
-                  """
-                  Please provide one of the following options in string
-                  format for the 'data' argument:
-                      1. "token": Returns a dictionary with the access
-                          token, refresh token, and token type.
-                      2. "access_token": Returns a string value of
-                          only the access token.
-                      3. "refresh_token": Returns a string value of
-                          only the refresh token.
-                      4. "token_type": Returns a string value of only
-                          the token type.
-                      5. "human_readable_time": Returns a string value
-                          of the HyperFlex API token file creation time
-                          in a human-readable format.
-                      6. "unix_timestamp_time": Returns a string value
-                          of the HyperFlex API token file creation time
-                          in Unix timestamp format.
-                      7. "source_module": Returns a string value of
-                          the source module used to create the
-                          HyperFlex API token file.
-                  """
-                  )
-            return
+        return await _async_renew_locked_token_file(
+            ip,username,password,file_path,stale_access_token,
+            renewal_strategy,session,timeout,deadline_time)
+    finally:
+        await asyncio.to_thread(_release_token_file_lock,lock_file)
+
+
+async def _async_renew_locked_token_file(ip,username,password,file_path,
+                                         stale_access_token,renewal_strategy,
+                                         session,timeout,deadline_time):
+    """Creates or renews a HyperFlex API token file while its lock is held.
+    It is the awaitable counterpart of the _renew_locked_token_file()
+    function. The token file is read in a worker thread.
+    """
+    if await asyncio.to_thread(_token_file_exists,file_path):
+        if stale_access_token is None:
+            logger.debug("The HyperFlex API token file was already created "
+                         "by another caller.")
+            return file_path
+        current_access_token = await asyncio.to_thread(
+            load_token_file,file_path,"access_token")
+        if current_access_token and current_access_token != stale_access_token:
+            logger.debug("The HyperFlex API token file was already renewed "
+                         "by another caller.")
+            return file_path
+        return await async_renew_token_file(
+            ip,username,password,file_path,renewal_strategy=renewal_strategy,
+            session=session,timeout=timeout,
+            deadline=_remaining_time(deadline_time))
+    return await async_create_token_file(
+        ip,username,password,file_path,session=session,timeout=timeout,
+        deadline=_remaining_time(deadline_time))
+
+
+class _RenewalCancelledError(Exception):
+    """Raised to the tasks waiting for a HyperFlex API token renewal when
+    the task performing the renewal was cancelled, so they retry the renewal.
+    """
+
+
+async def _async_coalesce_token_renewal(renewal_key,renewal_function,*args,
+                                        deadline_time=None):
+    """Runs a HyperFlex API token renewal once for all concurrent tasks in
+    the running event loop with the same renewal key. It is the awaitable
+    counterpart of the _coalesce_token_renewal() function. If the task
+    performing the renewal is cancelled, only that task is cancelled and a
+    waiting task retries the renewal instead.
+    """
+    event_loop = asyncio.get_running_loop()
+    while True:
+        hx_api_token_renewal = _hx_api_token_async_renewals.get(
+            (event_loop, renewal_key))
+        if hx_api_token_renewal is None:
+            break
+        logger.debug("Waiting for a HyperFlex API token renewal already in "
+                     "progress...")
+        try:
+            return await asyncio.wait_for(asyncio.shield(hx_api_token_renewal),
+                                          _remaining_time(deadline_time))
+        except _RenewalCancelledError:
+            logger.debug("The HyperFlex API token renewal in progress was "
+                         "cancelled. Retrying the renewal...")
+            continue
+        except DeadlineExceededError:
+            if not hx_api_token_renewal.done():
+                raise
+        except asyncio.TimeoutError:
+            if hx_api_token_renewal.done():
+                raise
+            raise DeadlineExceededError("The deadline of the HyperFlex API "
+                                        "token operation passed while "
+                                        "waiting for a renewal in "
+                                        "progress.") from None
+        # The deadline of the renewal in progress passed, so retry the
+        # renewal under the deadline of this task if any time is left
+        _remaining_time(deadline_time)
+        logger.debug("The HyperFlex API token renewal in progress passed its "
+                     "deadline. Retrying the renewal...")
+    hx_api_token_renewal = event_loop.create_future()
+    _hx_api_token_async_renewals[(event_loop, renewal_key)] = hx_api_token_renewal
+    try:
+        renewal_result = await renewal_function(*args)
+        hx_api_token_renewal.set_result(renewal_result)
+        return renewal_result
+    except asyncio.CancelledError:
+        # Wake the waiting tasks to retry the renewal instead of cancelling
+        # them along with this task
+        hx_api_token_renewal.set_exception(_RenewalCancelledError())
+        hx_api_token_renewal.exception()
+        raise
     except Exception as exception_message:
-        print("There was an error loading a HyperFlex API token file: ")
-        print("{}".format(str(exception_message)))
-        return
-        
+        hx_api_token_renewal.set_exception(exception_message)
+        # Mark the exception as retrieved when no other task is waiting
+        hx_api_token_renewal.exception()
+        raise
+    finally:
+        del _hx_api_token_async_renewals[(event_loop, renewal_key)]
 
-def manage_token_file(ip,username,password,file_path,data="token",overwrite=True):
-    r"""This is a function that creates or loads an XML file containing a
-    HyperFlex API token and then validates the loaded token data. If the
-    loaded HyperFlex API access token is not valid, a new access token will be
-    automatically obtained. If there is a no HyperFlex API token file present
-    in the provided file path, a new token file will be automatically created.
+
+async def _async_renew_managed_token_file(ip,username,password,file_path,
+                                         stale_access_token,renewal_strategy,
+                                         session,timeout,deadline_time):
+    """Creates or renews the HyperFlex API token file of a management
+    process, coalescing concurrent tasks. It is the awaitable counterpart of
+    the _renew_managed_token_file() function.
+    """
+    return await _async_coalesce_token_renewal(
+        (ip, username, file_path),_async_renew_token_file_once,
+        ip,username,password,file_path,stale_access_token,renewal_strategy,
+        session,timeout,deadline_time,deadline_time=deadline_time)
+
+
+# The coroutine functions awaited for the steps of a HyperFlex API token file
+# management process that send requests. The other steps read the token file
+# and are run in a worker thread.
+_ASYNC_MANAGE_TOKEN_FILE_STEPS = {"validate": _async_validate_token,
+                                  "renew": _async_renew_managed_token_file
+                                  }
+
+
+async def _async_run_manage_token_file_steps(manage_steps):
+    """Runs the steps yielded by the _manage_token_file_steps() generator
+    without blocking the running event loop and returns the result of the
+    management process. It is the awaitable counterpart of the
+    _run_manage_token_file_steps() function.
+    """
+    step_result = step_error = None
+    while True:
+        try:
+            if step_error is None:
+                step_name, step_arguments = manage_steps.send(step_result)
+            else:
+                step_name, step_arguments = manage_steps.throw(step_error)
+        except StopIteration as manage_result:
+            return manage_result.value
+        try:
+            if step_name in _ASYNC_MANAGE_TOKEN_FILE_STEPS:
+                step_result = await _ASYNC_MANAGE_TOKEN_FILE_STEPS[step_name](
+                    *step_arguments)
+            else:
+                step_result = await asyncio.to_thread(
+                    _MANAGE_TOKEN_FILE_STEPS[step_name],*step_arguments)
+            step_error = None
+        except Exception as exception_message:
+            step_result, step_error = None, exception_message
+
+
+async def async_manage_token_file(ip,username,password,file_path,data="token",
+                                  overwrite=True,session=None,
+                                  validation_ttl=None,force_validate=False,
+                                  renewal_strategy="refresh",timeout=None,
+                                  deadline=None,offline_validation=False):
+    r"""This is a function that asynchronously creates or loads a HyperFlex
+    API token file in the XML or JSON token file format, or a SQLite token
+    store entry, and then validates the loaded token data.
+    It is the awaitable counterpart of the manage_token_file() function and
+    returns the same values. Many HyperFlex clusters can be managed
+    concurrently from one event loop, for example with asyncio.gather().
 
     Args:
         ip: The targeted HyperFlex Connect or Cluster Management IP address.
@@ -600,145 +6354,187 @@ def manage_token_file(ip,username,password,file_path,data="token",overwrite=True
             HyperFlex. The value must be a string.
         file_path: The file name and storage location to write a HyperFlex API
             token file. The value must be a string. An example value is
-            "c:\\folder\\file.xml".
+            "c:\\folder\\file.xml". A SQLiteTokenStore object can also be
+            provided to keep the token in a SQLite token store instead.
         data: (Optional) The data from a HyperFlex API token file that is
-            returned by the manage_token_file() function. Providing this
-            argument is optional. The default value of "token" is set, which
-            returns the access token, refresh token, and token type as a
-            dictionary. The user provided value must be a string. See the
-            following list for the options available for the 'data' argument
-            and the returned value:
-                1. "token": Returns a dictionary with the access token,
-                    refresh token, and token type.
-                2. "access_token": Returns a string value of only the access
-                    token.
-                3. "refresh_token": Returns a string value of only the
-                    refresh token.
-                4. "token_type": Returns a string value of only the token
-                    type.
-                5. "human_readable_time": Returns a string value of the HyperFlex
-                    API token file creation time in a human-readable format.
-                6. "unix_timestamp_time": Returns a string value of the HyperFlex
-                    API token file creation time in Unix timestamp format.
-                7. "source_module": Returns a string value of the source
-                    module used to create the HyperFlex API token file.
-            NOTE: For automatic validation and renewals of HyperFlex API
-            tokens to occur, the 'data' argument must be set to "token"
-            (default), "access_token", or "refresh_token".
+            returned by the async_manage_token_file() function. Providing this
+            argument is optional. The default value is "token". Run
+            'help(manage_token_file)' for available options.
         overwrite: (Optional) The option to overwrite any pre-existing file at
             the provided file path value given to the 'file_path' argument.
-            Providing this argument is optional. If the argument is set to the
-            Boolean value True, any pre-existing token file will be
-            automatically overwritten. If the argument is set to the Boolean
-            value False, the manage_token_file() function will stop and not
-            proceed with creating a new token file if a pre-existing token
-            file is already in place at the given file path location. The
-            default value is True.
-            NOTE: For automatic validation and renewals of HyperFlex API
-            tokens to occur, the 'overwrite' argument must be set to the
-            Boolean value True (default). Setting the 'overwrite' argument to
-            the Boolean value False will disable the ability to update
-            pre-existing HyperFlex API token files.
-        
+            Providing this argument is optional. The default value is True.
+        session: (Optional) An aiohttp.ClientSession object used to send the
+            request to the HyperFlex AAA service. Providing this argument is
+            optional. If no session is provided, the shared keep-alive
+            session for the IP address and running event loop from
+            get_async_hx_api_session() is used.
+        validation_ttl: (Optional) The trust window in seconds for HyperFlex
+            API access tokens. Providing this argument is optional. Run
+            'help(manage_token_file)' for details.
+        force_validate: (Optional) The option to always validate a
+            pre-existing HyperFlex API access token with the HyperFlex AAA
+            service. Providing this argument is optional. The default value
+            is False.
+        renewal_strategy: (Optional) The strategy used to renew a pre-existing
+            HyperFlex API token that has failed validation. Providing this
+            argument is optional. The options are "refresh" or "login". The
+            default value is "refresh".
+        timeout: (Optional) The connect and read timeouts in seconds of
+            each request to the HyperFlex AAA service. Providing this
+            argument is optional. Run 'help(obtain_token)' for details.
+        deadline: (Optional) The maximum number of seconds the function may
+            take. Providing this argument is optional. Run
+            'help(manage_token_file)' for details.
+        offline_validation: (Optional) The option to validate a pre-existing
+            access token from its expiry claims. Providing this argument is
+            optional. Run 'help(manage_token_file)' for details. The default
+            value is False.
+
     Returns:
-        The return is based on the value of the 'data' argument. If the default
-        value of "token" is set, the access token, refresh token, and token
-        type will be returned as a dictionary. See the following list to see
-        the options available for the 'data' argument and the returned value:    
-            1. "token": Returns a dictionary with the access token, refresh
-                token, and token type.
-            2. "access_token": Returns a string value of only the access
-                token.
-            3. "refresh_token": Returns a string value of only the refresh
-                token.
-            4. "token_type": Returns a string value of only the token type.
-            5. "human_readable_time": Returns a string value of the HyperFlex
-                API token file creation time in a human-readable format.
-            6. "unix_timestamp_time": Returns a string value of the HyperFlex
-                API token file creation time in Unix timestamp format.
-            7. "source_module": Returns a string value of the source module
-                used to create the HyperFlex API token file.
+        The return is based on the value of the 'data' argument. Run
+        'help(manage_token_file)' for the available options and the returned
+        values.
 
     Raises:
         Exception: An exception occurred while managing the HyperFlex API token
             file. The exact error will be specified.
+        CircuitBreakerOpenError: The pre-existing HyperFlex API token could
+            not be validated because the circuit breaker of the HyperFlex
+            cluster is open. The token file is not renewed.
+        aiohttp.ClientError: The pre-existing HyperFlex API token could not
+            be validated because the HyperFlex AAA service could not be
+            reached or answered with a server error. The token file is not
+            renewed. Run 'help(async_validate_token)' for details.
+        asyncio.TimeoutError: The HyperFlex AAA service did not answer in
+            time. The token file is not renewed.
+        DeadlineExceededError: The deadline passed before a valid HyperFlex
+            API token was ready.
         ValueError: There was an invalid argument provided for the file path,
-            data or overwrite settings. A recommendation on how to resolve the
-            error will be displayed.
+            data, overwrite, validation TTL, force validate, renewal strategy,
+            timeout or deadline settings. A recommendation on how to resolve
+            the error will be displayed.
     """
 
-    # Verify the data argument
-    if data not in ("token",
-                    "access_token",
-                    "refresh_token",
-                    "token_type",
-                    "human_readable_time",
-                    "unix_timestamp_time",
-                    "source_module"
-                    ):
-        raise ValueError("The argument provided for the requested data type "
-                         "is not valid. Run 'help(manage_token_file)' for "
-                         "available options.")
-    
-    # Verify the overwrite argument
-    if not isinstance(overwrite, bool):
-        raise ValueError("The overwrite setting is not valid. Please provide "
-                         "a Boolean value of True or False for the "
-                         "'overwrite' argument.")
-    
+    # Verify the data, overwrite, validation_ttl, force_validate and
+    # renewal_strategy arguments
+    validation_ttl = _verify_manage_token_file_arguments(
+        data,overwrite,validation_ttl,force_validate,renewal_strategy,
+        "async_manage_token_file")
+
+    # Verify the timeout and deadline arguments
+    timeout = _verify_timeout_arguments(timeout,deadline)
+
+    # Resolve a token store to the entry for the IP address and username
+    file_path = _resolve_token_location(ip,username,file_path)
     # Start the HyperFlex API token file management process
-    print("Starting the HyperFlex API token file management process...")
-    # Check for the presence of a pre-existing HyperFlex API token file
-    print("Checking for the presence of a pre-existing HyperFlex API token "
-          "file...")
-    if not os.path.isfile(file_path):
-        print("A HyperFlex API token file was not found.")
-        # Create a new HyperFlex API token file
-        new_hx_api_token_file = create_token_file(
-            ip,username,password,file_path)
-        # Load the new HyperFlex API token file
-        loaded_new_hx_api_token_file = load_token_file(
-            new_hx_api_token_file,data)
-        print("A valid HyperFlex API token is ready.")
-        return loaded_new_hx_api_token_file
-    else:
-        # Load the pre-existing HyperFlex API token file
-        loaded_existing_hx_api_token_file = load_token_file(file_path,data)
-        if data in ("token",
-                    "access_token",
-                    "refresh_token"
-                    ):
-            # Validate the pre-existing HyperFlex API token file
-            print("Moving to validation of the requested {} data...".format(data))
-            validate_loaded_existing_hx_api_token_file = validate_token(
-                ip,load_token_file(file_path))
-            if validate_loaded_existing_hx_api_token_file:
-                print("A valid HyperFlex API token is ready.")
-                return loaded_existing_hx_api_token_file
-            else:
-                print("The access token in the pre-existing HyperFlex API "
-                      "token file has failed validation.")
-                if overwrite:
-                    print("The pre-existing HyperFlex API token file will now "
-                          "be updated with a new valid token...")
-                    # Create a new HyperFlex API token file
-                    new_hx_api_token_file = create_token_file(
-                        ip,username,password,file_path)
-                    # Load the new HyperFlex API token file
-                    loaded_new_hx_api_token_file = load_token_file(
-                        new_hx_api_token_file,data)
-                    print("A valid HyperFlex API token is ready.")
-                    return loaded_new_hx_api_token_file
-                else:
-                    print("The 'overwrite' argument is set to False, so the "
-                          "pre-existing HyperFlex API token file will not be "
-                          "updated.")
-                    print("Exiting.")
-                    return
-        else:
-            print("The pre-existing HyperFlex API token file has been loaded. It "
-                  "has not been validated.")
-            print("Set the 'data' argument to 'token', 'access_token' or "
-                  "'refresh_token' to enable automatic validation and "
-                  "renewals of HyperFlex API tokens.")
-            return loaded_existing_hx_api_token_file
+    return await _async_run_manage_token_file_steps(_manage_token_file_steps(
+        ip,username,password,file_path,data,overwrite,session,validation_ttl,
+        force_validate,renewal_strategy,timeout,_deadline_time(deadline),
+        offline_validation,_async_aaa_outage_errors))
+
+
+async def async_manage_token_fleet(inventory,max_workers=DEFAULT_FLEET_WORKERS,
+                                   **manage_token_file_options):
+    r"""This is a function that runs the async_manage_token_file() function
+    for many HyperFlex clusters concurrently from one asyncio event loop. It
+    is the awaitable counterpart of the manage_token_fleet() function.
+
+    Args:
+        inventory: A list of dictionaries, one for each HyperFlex cluster,
+            with the "ip", "username", "password" and "file_path" keys. Run
+            'help(manage_token_fleet)' for details.
+        max_workers: (Optional) The maximum number of HyperFlex clusters that
+            are managed at the same time. Providing this argument is optional.
+            The value must be an integer. The default value is 16.
+        manage_token_file_options: (Optional) Any additional keyword arguments
+            are passed to the async_manage_token_file() function for every
+            HyperFlex cluster.
+
+    Returns:
+        A dictionary with the result of each HyperFlex cluster, keyed by the
+        "name" of the inventory entry or the IP address. Run
+        'help(manage_token_fleet)' for the contents of each result.
+
+    Raises:
+        ValueError: There was an invalid argument provided for the inventory
+            or the maximum number of workers. A recommendation on how to
+            resolve the error will be displayed.
+    """
+
+    # Verify the inventory and max_workers arguments
+    fleet_entries = _start_fleet_run(inventory,max_workers)
+
+    fleet_semaphore = asyncio.Semaphore(max_workers)
+
+    async def manage_fleet_entry(inventory_entry):
+        async with fleet_semaphore:
+            start_time = time.perf_counter()
+            try:
+                result = await async_manage_token_file(
+                    *_fleet_entry_arguments(inventory_entry),
+                    **get_fleet_entry_options(inventory_entry,
+                                              manage_token_file_options))
+                return _fleet_entry_result(inventory_entry,result,None,
+                                           start_time)
+            except Exception as exception_message:
+                return _fleet_entry_result(inventory_entry,None,
+                                           str(exception_message),start_time)
+
+    # Start the HyperFlex API token fleet management process
+    fleet_entry_results = await asyncio.gather(
+        *(manage_fleet_entry(inventory_entry)
+          for fleet_entry_name, inventory_entry in fleet_entries))
+    return _finish_fleet_run(fleet_entries,fleet_entry_results)
+
+
+async def async_revoke_tokens(tokens,max_workers=DEFAULT_FLEET_WORKERS,
+                              **revoke_token_options):
+    r"""This is a function that revokes many HyperFlex API access tokens
+    concurrently from one asyncio event loop. It is the awaitable counterpart
+    of the revoke_tokens() function and returns the same results.
+
+    Args:
+        tokens: A list of dictionaries, one for each HyperFlex API token,
+            with the "ip" key and either the "file_path" or the
+            "hx_api_token" key. Run 'help(revoke_tokens)' for details.
+        max_workers: (Optional) The maximum number of tokens that are revoked
+            at the same time. Providing this argument is optional. The value
+            must be an integer. The default value is 16.
+        revoke_token_options: (Optional) Any additional keyword arguments are
+            passed to the async_revoke_token() function for every token.
+
+    Returns:
+        A list with the result of each token, in the order of the 'tokens'
+        argument. Run 'help(revoke_tokens)' for the contents of each result.
+
+    Raises:
+        ValueError: There was an invalid argument provided for the tokens or
+            the maximum number of workers. A recommendation on how to resolve
+            the error will be displayed.
+    """
+
+    # Verify the tokens and max_workers arguments
+    revocation_entries = _start_bulk_revocation(tokens,max_workers)
+
+    revocation_semaphore = asyncio.Semaphore(max_workers)
+
+    async def revoke_entry(revocation_entry):
+        async with revocation_semaphore:
+            start_time = time.perf_counter()
+            try:
+                revoked = await async_revoke_token(
+                    revocation_entry["ip"],
+                    await asyncio.to_thread(_load_revocation_token,
+                                            revocation_entry),
+                    **revoke_token_options)
+                return _revocation_result(revocation_entry,revoked,None,
+                                          start_time)
+            except Exception as exception_message:
+                return _revocation_result(revocation_entry,False,
+                                          str(exception_message),start_time)
+
+    # Start the HyperFlex API token bulk revocation process
+    revocation_results = list(await asyncio.gather(
+        *(revoke_entry(revocation_entry)
+          for revocation_entry in revocation_entries)))
+    return _finish_bulk_revocation(revocation_results)
@@ -0,0 +1,147 @@
+"""
+Cisco HyperFlex API Token Manager - Token Claims Tests
+Summary: Tests the offline validation of HyperFlex API access tokens issued
+         as JSON Web Tokens from their expiry claims, using unsigned tokens
+         and a stub HTTP session in place of the HyperFlex AAA service.
+Usage: python -m pytest tests
+"""
+
+# Import needed modules
+import os
+import sys
+import json
+import time
+import base64
+import unittest
+from unittest import mock
+
+REPOSITORY_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPOSITORY_DIRECTORY)
+import hx_api_token_manager
+
+# Establish test settings
+TEST_IP = "192.0.2.10"
+
+
+def build_token(claims):
+    """Returns an unsigned JSON Web Token carrying the provided claims."""
+    def encode_segment(segment):
+        return base64.urlsafe_b64encode(
+            json.dumps(segment).encode()).rstrip(b"=").decode()
+    return "{}.{}.".format(encode_segment({"alg": "none", "typ": "JWT"}),
+                           encode_segment(claims))
+
+
+def build_hx_api_token(access_token):
+    """Returns a HyperFlex API token dictionary for an access token."""
+    return {"access_token": access_token,
+            "refresh_token": "refresh",
+            "token_type": "Bearer"
+            }
+
+
+def build_session(status_code=200):
+    """Returns a stub HTTP session whose POST requests are answered with the
+    provided HTTP status code.
+    """
+    session = mock.Mock()
+    session.post.return_value = mock.Mock(status_code=status_code, text="",
+                                          headers={})
+    return session
+
+
+class TokenClaimsTests(unittest.TestCase):
+
+    def setUp(self):
+        self.current_time = int(time.time())
+        self.valid_token = build_token({"exp": self.current_time + 3600,
+                                        "iat": self.current_time})
+        self.expired_token = build_token({"exp": self.current_time - 60})
+        self.near_expiry_token = build_token(
+            {"exp": self.current_time
+             + hx_api_token_manager.DEFAULT_TOKEN_EXPIRY_MARGIN - 10})
+        self.not_yet_valid_token = build_token(
+            {"exp": self.current_time + 3600,
+             "nbf": self.current_time + 600})
+        self.no_expiry_token = build_token({"iat": self.current_time})
+        self.malformed_tokens = ("not-a-jwt", "a.b.c", "a.!!!.c",
+                                 build_token(["exp"]))
+
+    def test_get_token_claims(self):
+        self.assertEqual(hx_api_token_manager.get_token_claims(
+            self.valid_token), {"exp": self.current_time + 3600,
+                                "iat": self.current_time})
+        self.assertEqual(hx_api_token_manager.get_token_claims(
+            self.no_expiry_token), {"iat": self.current_time})
+
+    def test_get_token_claims_returns_a_copy(self):
+        token_claims = hx_api_token_manager.get_token_claims(self.valid_token)
+        token_claims["exp"] = 0
+        self.assertEqual(hx_api_token_manager.get_token_claims(
+            self.valid_token)["exp"], self.current_time + 3600)
+
+    def test_get_token_claims_of_malformed_tokens(self):
+        for malformed_token in self.malformed_tokens + (None, 42):
+            with self.subTest(access_token=malformed_token):
+                self.assertIsNone(
+                    hx_api_token_manager.get_token_claims(malformed_token))
+
+    def test_check_token_claims(self):
+        self.assertTrue(
+            hx_api_token_manager._check_token_claims(self.valid_token))
+        for access_token in (self.expired_token, self.near_expiry_token,
+                             self.not_yet_valid_token, self.no_expiry_token,
+                             *self.malformed_tokens):
+            with self.subTest(access_token=access_token):
+                self.assertFalse(
+                    hx_api_token_manager._check_token_claims(access_token))
+
+    def test_check_token_claims_expiry_margin(self):
+        self.assertTrue(hx_api_token_manager._check_token_claims(
+            self.near_expiry_token, expiry_margin=0))
+        self.assertFalse(hx_api_token_manager._check_token_claims(
+            self.valid_token, expiry_margin=7200))
+
+    def test_offline_validation_of_a_valid_token(self):
+        session = build_session()
+        self.assertTrue(hx_api_token_manager.validate_token(
+            TEST_IP, build_hx_api_token(self.valid_token), session=session,
+            offline_validation=True))
+        session.post.assert_not_called()
+
+    def test_offline_validation_falls_back_to_the_aaa_service(self):
+        for access_token in (self.near_expiry_token, self.no_expiry_token,
+                             self.not_yet_valid_token, *self.malformed_tokens):
+            with self.subTest(access_token=access_token):
+                session = build_session()
+                self.assertTrue(hx_api_token_manager.validate_token(
+                    TEST_IP, build_hx_api_token(access_token),
+                    session=session, offline_validation=True))
+                session.post.assert_called_once()
+                self.assertEqual(
+                    session.post.call_args.args[0],
+                    "https://{}/aaa/v1/validate".format(TEST_IP))
+
+    def test_offline_validation_of_an_expired_token(self):
+        session = build_session(status_code=401)
+        self.assertFalse(hx_api_token_manager.validate_token(
+            TEST_IP, build_hx_api_token(self.expired_token), session=session,
+            offline_validation=True))
+        session.post.assert_called_once()
+
+    def test_offline_validation_is_not_used_for_the_modify_scope(self):
+        session = build_session()
+        self.assertTrue(hx_api_token_manager.validate_token(
+            TEST_IP, build_hx_api_token(self.valid_token), scope="MODIFY",
+            session=session, offline_validation=True))
+        session.post.assert_called_once()
+
+    def test_validation_without_offline_validation(self):
+        session = build_session()
+        self.assertTrue(hx_api_token_manager.validate_token(
+            TEST_IP, build_hx_api_token(self.valid_token), session=session))
+        session.post.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+Cisco HyperFlex API Token Manager - Token Renewal Coalescing Tests
+Summary: Tests that concurrent HyperFlex API token renewals in an asyncio
+         event loop are coalesced into one renewal, and that a cancelled
+         renewal is retried by the waiting tasks instead of cancelling them.
+Usage: python -m pytest tests
+"""
+
+# Import needed modules
+import os
+import sys
+import asyncio
+import unittest
+
+REPOSITORY_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPOSITORY_DIRECTORY)
+import hx_api_token_manager
+
+# Establish test settings
+TEST_RENEWAL_KEY = ("192.0.2.10", "admin", "hx_api_token.json")
+TEST_TIMEOUT = 5
+
+
+class StubRenewal:
+    """A stub renewal function that blocks each call until it is released
+    and counts its calls.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.started = asyncio.Event()
+        self.released = asyncio.Event()
+
+    async def __call__(self, result):
+        self.calls += 1
+        self.started.set()
+        await self.released.wait()
+        return result
+
+
+class AsyncTokenRenewalCoalescingTests(unittest.IsolatedAsyncioTestCase):
+
+    async def coalesce(self, renewal, result="renewed"):
+        return await hx_api_token_manager._async_coalesce_token_renewal(
+            TEST_RENEWAL_KEY, renewal, result)
+
+    async def test_waiting_tasks_share_the_renewal_result(self):
+        renewal = StubRenewal()
+        leader = asyncio.create_task(self.coalesce(renewal))
+        await renewal.started.wait()
+        waiters = [asyncio.create_task(self.coalesce(renewal))
+                   for _ in range(2)]
+        await asyncio.sleep(0)
+        renewal.released.set()
+        self.assertEqual(await asyncio.gather(leader, *waiters),
+                         ["renewed"] * 3)
+        self.assertEqual(renewal.calls, 1)
+
+    async def test_cancelled_leader_is_retried_by_the_waiting_tasks(self):
+        renewal = StubRenewal()
+        leader = asyncio.create_task(self.coalesce(renewal))
+        await renewal.started.wait()
+        waiters = [asyncio.create_task(self.coalesce(renewal))
+                   for _ in range(2)]
+        await asyncio.sleep(0)
+        renewal.started.clear()
+        leader.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await leader
+        # One waiting task takes over the renewal and the other waits for it
+        await asyncio.wait_for(renewal.started.wait(), TEST_TIMEOUT)
+        renewal.released.set()
+        self.assertEqual(await asyncio.wait_for(asyncio.gather(*waiters),
+                                                TEST_TIMEOUT),
+                         ["renewed"] * 2)
+        self.assertEqual(renewal.calls, 2)
+        self.assertEqual(hx_api_token_manager._hx_api_token_async_renewals,
+                         {})
+
+    async def test_renewal_error_is_shared_with_the_waiting_tasks(self):
+        async def failing_renewal():
+            await asyncio.sleep(0.01)
+            raise ConnectionError("The HyperFlex AAA service is unavailable.")
+
+        results = await asyncio.gather(
+            *(hx_api_token_manager._async_coalesce_token_renewal(
+                TEST_RENEWAL_KEY, failing_renewal) for _ in range(3)),
+            return_exceptions=True)
+        self.assertTrue(all(isinstance(result, ConnectionError)
+                            for result in results))
+
+
+if __name__ == "__main__":
+    unittest.main()